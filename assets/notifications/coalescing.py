@@ -0,0 +1,239 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from notifications.events import NormalizedEvent
+from notifications.events.event_type import EventType, Severity
+from notifications.state import StateStore, get_state_store
+from notifications.utils import codec
+
+
+class Coalescer:
+    """
+    Coalesces bursts of CloudWatch alarm transitions into summary messages.
+
+    Time is split into fixed windows. The first transition of an alarm within a
+    window is delivered immediately, later transitions of the same alarm are
+    absorbed. Once more than rollup_threshold distinct alarms have transitioned
+    within a window, the transitions of any further alarms are absorbed too.
+
+    When a window has closed, the next invocation to call flush claims it and
+    produces one summary per absorbed alarm, such as 'alarm X flapped 14 times,
+    now OK', which the handler delivers together as a roll-up. When the roll-up
+    is not delivered, the handler releases the claimed windows, so the absorbed
+    transitions are summarized again by a later flush rather than lost. All
+    the state is held in the state store, so containers sharing a backend
+    coalesce together.
+    """
+
+    def __init__(
+        self,
+        store: StateStore,
+        window: float = 300,
+        rollup_threshold: int = 10,
+        prefix: str = "coalesce",
+        lookback: int = 2,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            store: The store holding the transitions of each window
+            window: The length of a coalescing window in seconds
+            rollup_threshold: The number of distinct alarms delivered within a
+                window before the rest are rolled up, 0 disables the roll-up
+            prefix: The prefix of the keys in the store
+            lookback: The number of closed windows checked by each flush
+            clock: The clock used to determine the current window
+        """
+        self.store = store
+        self.window = window
+        self.rollup_threshold = rollup_threshold
+        self.prefix = prefix
+        self.lookback = lookback
+        self.absorbed = 0
+        self.summaries = 0
+        self.released = 0
+        self._clock = clock
+        self._claimed: List[int] = []
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self) -> float:
+        """The number of seconds the state of a window is kept for, until it is flushed."""
+        return self.window * (self.lookback + 2)
+
+    def identity(self, event: NormalizedEvent) -> str:
+        """
+        Return the key identifying the alarm of an event, by name, account and region.
+        """
+        encoded = codec.dumps([event.title, event.details.get("account_id"), event.region])
+        return hashlib.sha256(encoded).hexdigest()
+
+    def coalesce(self, events: List[NormalizedEvent]) -> List[NormalizedEvent]:
+        """
+        Record the CloudWatch alarm transitions of a record, and return the
+        events to deliver now, in order. Other events are always delivered.
+        """
+        return [event for event in events if not self._absorb(event)]
+
+    def flush(self) -> List[NormalizedEvent]:
+        """
+        Claim the recently closed windows which have not been flushed yet, and
+        return a summary of each alarm absorbed within them.
+        """
+        current = int(self._clock() // self.window)
+        summaries = []
+        claimed = []
+
+        for bucket in range(current - self.lookback, current):
+            # Only a single container may flush each window
+            if not self.store.add(self._key(bucket, "flushed"), {}, self.ttl):
+                continue
+
+            slots = (self.store.get(self._key(bucket, "pending")) or {}).get("count", 0)
+            if slots:
+                claimed.append(bucket)
+            for slot in range(1, slots + 1):
+                entry = self.store.get(self._key(bucket, "slot", str(slot)))
+                if entry is None:
+                    continue
+
+                transitions = self.store.get(self._key(bucket, "alarm", entry["alarm"])) or {}
+                last = self.store.get(self._key(bucket, "last", entry["alarm"]))
+                if last is not None:
+                    summaries.append(self._summarize(last, transitions.get("count", 1)))
+
+        with self._lock:
+            self.summaries += len(summaries)
+            self._claimed = claimed
+
+        return summaries
+
+    def release(self) -> None:
+        """
+        Release the windows claimed by the last flush, after its summaries
+        failed to be delivered, so the next flush summarizes them again.
+        """
+        with self._lock:
+            claimed, self._claimed = self._claimed, []
+            self.released += len(claimed)
+
+        for bucket in claimed:
+            self.store.delete(self._key(bucket, "flushed"))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of transitions absorbed, of summaries produced, and
+        of windows released after their summaries failed to be delivered.
+        """
+        with self._lock:
+            return {"absorbed": self.absorbed, "summaries": self.summaries, "released": self.released}
+
+    def _absorb(self, event: NormalizedEvent) -> bool:
+        """
+        Record a transition, returning whether it was absorbed into a summary.
+        """
+        if event.event_type != EventType.CLOUDWATCH:
+            return False
+
+        bucket = int(self._clock() // self.window)
+        alarm = self.identity(event)
+
+        count = self.store.increment(self._key(bucket, "alarm", alarm), self.ttl)
+        self.store.put(self._key(bucket, "last", alarm), self._snapshot(event), self.ttl)
+
+        if count == 1:
+            alarms = self.store.increment(self._key(bucket, "alarms"), self.ttl)
+            if self.rollup_threshold <= 0 or alarms <= self.rollup_threshold:
+                return False
+
+        # Register the alarm once per window, so the flush can find it
+        if self.store.add(self._key(bucket, "registered", alarm), {}, self.ttl):
+            slot = self.store.increment(self._key(bucket, "pending"), self.ttl)
+            self.store.put(self._key(bucket, "slot", str(slot)), {"alarm": alarm}, self.ttl)
+
+        with self._lock:
+            self.absorbed += 1
+
+        return True
+
+    def _snapshot(self, event: NormalizedEvent) -> Dict[str, Any]:
+        return {
+            "title": event.title,
+            "region": event.region,
+            "description": event.description,
+            "timestamp": event.timestamp.isoformat(),
+            "state": event.details.get("current_state"),
+            "account_id": event.details.get("account_id"),
+        }
+
+    def _summarize(self, last: Dict[str, Any], transitions: int) -> NormalizedEvent:
+        state = last.get("state") or "UNKNOWN"
+        title = (
+            f"{last['title']} flapped {transitions} times, now {state}"
+            if transitions > 1
+            else f"{last['title']} is now {state}"
+        )
+
+        return NormalizedEvent(
+            event_type=EventType.CLOUDWATCH,
+            severity=(Severity.CRITICAL if state == "ALARM" else Severity.INFO).value,
+            region=last.get("region"),
+            title=title,
+            description=last.get("description"),
+            timestamp=datetime.fromisoformat(last["timestamp"]),
+            source="CloudWatch",
+            details={
+                "current_state": state,
+                "transitions": transitions,
+                "account_id": last.get("account_id"),
+            },
+        )
+
+    def _key(self, bucket: int, *parts: str) -> str:
+        return ":".join([self.prefix, str(bucket), *parts])
+
+
+_coalescer: Optional[Coalescer] = None
+_coalescer_lock = threading.Lock()
+
+
+def get_coalescer() -> Optional[Coalescer]:
+    """
+    Return the container scoped coalescer, creating it on first use.
+    Coalescing is disabled unless COALESCE_WINDOW is set.
+
+    Environment Variables:
+        COALESCE_WINDOW: The length of a coalescing window in seconds, 0
+            disables coalescing
+        COALESCE_ROLLUP_THRESHOLD: The number of distinct alarms delivered
+            within a window before the rest are rolled up
+
+    Returns:
+        Optional[Coalescer]: The shared coalescer, or None when disabled
+
+    Raises:
+        ValueError: If the state backend is not shared by every container
+    """
+    global _coalescer
+
+    window = float(os.environ.get("COALESCE_WINDOW", "0"))
+    if window <= 0:
+        return None
+
+    with _coalescer_lock:
+        if _coalescer is None:
+            # Transitions absorbed by one container are flushed by another
+            store = get_state_store()
+            if not store.shared:
+                raise ValueError("Coalescing requires a shared state backend, set STATE_BACKEND to dynamodb")
+
+            _coalescer = Coalescer(
+                store,
+                window=window,
+                rollup_threshold=int(os.environ.get("COALESCE_ROLLUP_THRESHOLD", "10")),
+            )
+
+        return _coalescer
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import threading
+from typing import Any, Dict, List, Optional
+from notifications.events import NormalizedEvent
+from notifications.state import StateStore, get_state_store
+from notifications.utils import codec
+
+
+class Deduplicator:
+    """
+    Skips events which have already been delivered unchanged.
+
+    Each event is identified by its finding id, or when it has none by its
+    type, account, region, title and the resources it concerns, such as the
+    key of a KMS deletion, so events of other accounts or resources sharing a
+    title are not mistaken for one another. A fingerprint of the material fields of the event,
+    its severity, state and resources, is stored against that identity once the
+    event has been delivered. An event is a duplicate while the stored
+    fingerprint matches its own, so a finding re-emitted with only a new
+    timestamp or count is skipped, while a change of severity or state, or the
+    expiry of the TTL, delivers it again.
+    """
+
+    def __init__(self, store: StateStore, ttl: float = 3600, prefix: str = "dedup"):
+        """
+        Args:
+            store: The store holding the fingerprints of delivered events
+            ttl: The number of seconds an unchanged event is suppressed for
+            prefix: The prefix of the keys in the store
+        """
+        self.store = store
+        self.ttl = ttl
+        self.prefix = prefix
+        self.checked = 0
+        self.duplicates = 0
+        self._lock = threading.Lock()
+
+    def identity(self, event: NormalizedEvent) -> str:
+        """
+        Return the key identifying an event in the store.
+        """
+        details = event.details
+        event_type = getattr(event.event_type, "name", str(event.event_type))
+        finding_id = details.get("finding_id")
+        if finding_id:
+            parts = [event_type, finding_id]
+        else:
+            account = details.get("account_id") or details.get("account")
+            parts = [event_type, account, event.region, event.title, self._resources(details)]
+
+        return f"{self.prefix}:{self._digest(parts)}"
+
+    def fingerprint(self, event: NormalizedEvent) -> str:
+        """
+        Return the fingerprint of the material fields of an event.
+        """
+        details = event.details
+        state = details.get("current_state") or details.get("state") or details.get("status")
+
+        return self._digest([event.severity, state, self._resources(details)])
+
+    def is_duplicate(self, event: NormalizedEvent) -> bool:
+        """
+        Return whether an event has already been delivered unchanged within the TTL.
+        """
+        entry = self.store.get(self.identity(event))
+        duplicate = entry is not None and entry.get("fingerprint") == self.fingerprint(event)
+
+        with self._lock:
+            self.checked += 1
+            if duplicate:
+                self.duplicates += 1
+
+        return duplicate
+
+    def remember(self, event: NormalizedEvent) -> None:
+        """
+        Record that an event has been delivered, suppressing it for the TTL.
+        """
+        self.store.put(self.identity(event), {"fingerprint": self.fingerprint(event)}, self.ttl)
+
+    def filter(self, events: List[NormalizedEvent]) -> List[NormalizedEvent]:
+        """
+        Return the events which are not duplicates, in order.
+        """
+        return [event for event in events if not self.is_duplicate(event)]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the number of events checked and skipped as duplicates, and the
+        share of sends which were avoided.
+        """
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "duplicates": self.duplicates,
+                "duplicate_ratio": round(self.duplicates / self.checked, 4) if self.checked else 0.0,
+            }
+
+    def _resources(self, details: Dict[str, Any]) -> List[str]:
+        """
+        Return the sorted identifiers of the resources an event concerns.
+        """
+        resources = [
+            resource.get("resource_id") if isinstance(resource, dict) else resource
+            for resource in details.get("resources") or []
+        ]
+        for key in ("resource_id", "key_arn"):
+            if details.get(key):
+                resources.append(details[key])
+
+        return sorted(str(resource) for resource in resources)
+
+    def _digest(self, parts: List[Any]) -> str:
+        return hashlib.sha256(codec.dumps(parts, sort_keys=True)).hexdigest()
+
+
+_deduplicator: Optional[Deduplicator] = None
+_deduplicator_lock = threading.Lock()
+
+
+def get_deduplicator() -> Optional[Deduplicator]:
+    """
+    Return the container scoped deduplicator, creating it on first use.
+    Deduplication is disabled unless DEDUP_TTL is set.
+
+    Environment Variables:
+        DEDUP_TTL: The number of seconds an unchanged event is suppressed for,
+            0 disables deduplication
+
+    Returns:
+        Optional[Deduplicator]: The shared deduplicator, or None when disabled
+    """
+    global _deduplicator
+
+    ttl = float(os.environ.get("DEDUP_TTL", "0"))
+    if ttl <= 0:
+        return None
+
+    with _deduplicator_lock:
+        if _deduplicator is None:
+            _deduplicator = Deduplicator(get_state_store(), ttl=ttl)
+
+        return _deduplicator
@@ -0,0 +1,160 @@
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+from notifications.utils.imports import import_string
+from notifications.utils.secrets import get_secret_cache
+from notifications.utils.logging import logger
+
+if TYPE_CHECKING:
+    from notifications.formatters.base_formatter import BaseFormatter
+    from notifications.senders.base_sender import MessageSender
+
+# The supported notification platforms
+PLATFORMS = ("slack", "teams")
+
+# The formatter and sender of each platform, imported on first use so a
+# container only loads the platforms it delivers to
+FORMATTERS = {
+    "slack": "notifications.formatters.slack_formatter.SlackFormatter",
+    "teams": "notifications.formatters.teams_formatter.TeamsFormatter",
+}
+SENDERS = {
+    "slack": "notifications.senders.slack_sender.SlackSender",
+    "teams": "notifications.senders.teams_sender.TeamsSender",
+}
+
+
+def get_webhook_url(webhook_arn: str, refresh: bool = False) -> str:
+    """
+    Retrieve the webhook URL from the secret, via the container scoped cache.
+
+    Args:
+        webhook_arn: The ARN of the secret holding the webhook URL
+        refresh: Whether to bypass the cache and retrieve the secret again
+
+    Returns:
+        str: The webhook URL
+
+    Raises:
+        ValueError: If the secret is empty or does not contain a webhook URL
+    """
+    secret = get_secret_cache().get(webhook_arn, refresh=refresh)
+
+    # Check if the secret is empty or the webhook URL is not present
+    if not isinstance(secret, dict) or not secret.get("webhook_url"):
+        raise ValueError(f"Secret {webhook_arn} is empty")
+
+    return secret["webhook_url"]
+
+
+def create_formatter(platform: str) -> "BaseFormatter":
+    """
+    Create the formatter for the notification platform.
+    """
+    return import_string(FORMATTERS.get(platform, FORMATTERS["teams"]))()
+
+
+def create_sender(platform: str, webhook_url: str) -> "MessageSender":
+    """
+    Create the sender for the notification platform.
+    """
+    return import_string(SENDERS.get(platform, SENDERS["teams"]))(webhook_url)
+
+
+@dataclass
+class Destination:
+    """
+    A single webhook which notifications are delivered to.
+
+    Destinations are created per invocation, the webhook URL is resolved
+    lazily on the first send, from the secret when an ARN is configured.
+
+    Attributes:
+        name (str): A unique name for the destination
+        platform (str): The notification platform ('slack' or 'teams')
+        webhook_url (str): The webhook URL, if not held in a secret
+        webhook_arn (str): The ARN of the secret holding the webhook URL
+        fallback (str): The name of the destination messages are diverted to
+            while the circuit of this one is open
+    """
+
+    name: str
+    platform: str
+    webhook_url: str = ""
+    webhook_arn: str = ""
+    fallback: str = ""
+    _sender: Optional["MessageSender"] = field(default=None, init=False, repr=False)
+    _rotated: Optional[dict] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        self.platform = (self.platform or "").lower()
+        if self.platform not in PLATFORMS:
+            raise ValueError(f"Unsupported notification platform: {self.platform}")
+        if not self.webhook_url and not self.webhook_arn:
+            raise ValueError(f"Destination {self.name} is missing a webhook_url or webhook_arn")
+
+    def sender(self) -> "MessageSender":
+        """
+        Return the sender for the destination, resolving the webhook URL on first use.
+        """
+        with self._lock:
+            if self._sender is None:
+                webhook_url = self.webhook_url
+                if self.webhook_arn:
+                    logger.info(
+                        "Retrieving webhook URL from secret",
+                        extra={
+                            "action": "destination",
+                            "destination": self.name,
+                            "webhook_arn": self.webhook_arn,
+                        }
+                    )
+                    webhook_url = get_webhook_url(self.webhook_arn)
+                self.webhook_url = webhook_url
+                self._sender = create_sender(self.platform, webhook_url)
+
+            return self._sender
+
+    def rotated_sender(self) -> Optional["MessageSender"]:
+        """
+        Refresh the webhook secret, at most once per invocation, after the webhook
+        rejected a message as unauthorized or missing.
+
+        Returns:
+            Optional[MessageSender]: A sender for the rotated webhook URL, or None if
+            the URL is not held in a secret or the secret has not changed
+        """
+        if not self.webhook_arn:
+            return None
+
+        with self._lock:
+            if self._rotated is None:
+                rotated_url = get_webhook_url(self.webhook_arn, refresh=True)
+                logger.info(
+                    "Webhook rejected the message, refreshed the webhook secret",
+                    extra={
+                        "action": "destination",
+                        "destination": self.name,
+                        "webhook_arn": self.webhook_arn,
+                        "rotated": rotated_url != self.webhook_url,
+                    }
+                )
+                self._rotated = {
+                    "sender": (
+                        create_sender(self.platform, rotated_url)
+                        if rotated_url != self.webhook_url
+                        else None
+                    )
+                }
+
+            return self._rotated["sender"]
+
+    def promote(self, sender: "MessageSender") -> None:
+        """
+        Use the sender of the rotated webhook URL for the remaining sends, once
+        it has delivered a message, so they do not try the stale URL first.
+        """
+        with self._lock:
+            self._sender = sender
+            self.webhook_url = getattr(sender, "webhook_url", self.webhook_url)
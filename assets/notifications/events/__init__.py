@@ -1,5 +1,7 @@
 from .event_parser import EventParser
+from .envelope import EventEnvelope
+from .registry import ParserRegistry, register_parser
 from .normalized_event import NormalizedEvent
 from .event_type import EventType, EVENT_TYPE_MAPPING
 
-__all__ = ["EventParser", "NormalizedEvent", "EventType", EVENT_TYPE_MAPPING]
+__all__ = ["EventParser", "EventEnvelope", "ParserRegistry", "register_parser", "NormalizedEvent", "EventType", EVENT_TYPE_MAPPING]
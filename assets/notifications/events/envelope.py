@@ -0,0 +1,197 @@
+from dataclasses import dataclass
+import os
+from typing import Dict, Any, Optional
+from notifications.utils import codec
+
+# Whether normalized events keep a reference to the record they were parsed
+# from, for debugging. Records hold the whole encoded message, so they are
+# released once parsed by default.
+RETAIN_RAW_EVENT = os.environ.get("RETAIN_RAW_EVENT", "false").lower() == "true"
+
+
+@dataclass
+class EventEnvelope:
+    """
+    A single decoded record from an incoming Lambda event, delivered either
+    by SNS, by an SQS queue, which may itself be subscribed to SNS, or by an
+    EventBridge rule targeting the function directly.
+
+    The message is decoded exactly once when the envelope is built, the
+    envelope is then passed through classification and parsing so no parser
+    needs to decode the message again.
+
+    Attributes:
+        message (Dict[str, Any]): The decoded message body
+        message_id (Optional[str]): The SNS message id, the SQS message id
+            of a message not published through SNS, or the EventBridge event id
+        topic_arn (Optional[str]): The ARN of the topic which published the message, if any
+        subject (Optional[str]): The SNS subject, if any
+        timestamp (Optional[str]): The time SNS published the message, or the
+            time of the EventBridge event, if any
+        record (Dict[str, Any]): The original, unprocessed record
+    """
+
+    message: Dict[str, Any]
+    message_id: Optional[str]
+    topic_arn: Optional[str]
+    subject: Optional[str]
+    timestamp: Optional[str]
+    record: Dict[str, Any]
+
+    @property
+    def raw_event(self) -> Optional[Dict[str, Any]]:
+        """The record to retain on the normalized events, if enabled by RETAIN_RAW_EVENT."""
+        return self.record if RETAIN_RAW_EVENT else None
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "EventEnvelope":
+        """
+        Build an envelope from an SNS or SQS record, decoding the message body,
+        or from an EventBridge event, which is already decoded.
+
+        Args:
+            record (Dict[str, Any]): The record to decode
+
+        Returns:
+            EventEnvelope: The decoded envelope
+
+        Raises:
+            ValueError: If the record is neither an SNS nor an SQS record nor an
+            EventBridge event, or the message is not a JSON object
+        """
+        if is_sqs_record(record):
+            return cls.from_sqs_record(record)
+        if is_eventbridge_event(record):
+            return cls.from_eventbridge_event(record)
+        return cls.from_sns_record(record)
+
+    @classmethod
+    def from_eventbridge_event(cls, event: Dict[str, Any]) -> "EventEnvelope":
+        """
+        Build an envelope from an event delivered by an EventBridge rule. The
+        event is the message itself, so there is nothing to decode.
+
+        Args:
+            event (Dict[str, Any]): The EventBridge event
+
+        Returns:
+            EventEnvelope: The envelope
+        """
+        return cls(
+            message=event,
+            message_id=event.get("id"),
+            topic_arn=None,
+            subject=None,
+            timestamp=event.get("time"),
+            record=event,
+        )
+
+    @classmethod
+    def from_sqs_record(cls, record: Dict[str, Any]) -> "EventEnvelope":
+        """
+        Build an envelope from an SQS record. A queue subscribed to an SNS topic
+        without raw message delivery receives the SNS notification as the
+        body, which is unwrapped so the envelope carries the same message and
+        metadata as if SNS had invoked the Lambda directly.
+
+        Args:
+            record (Dict[str, Any]): The SQS record to decode
+
+        Returns:
+            EventEnvelope: The decoded envelope
+
+        Raises:
+            ValueError: If the body, or the SNS message it wraps, is not a JSON object
+        """
+        body = codec.loads(record["body"])
+        if not isinstance(body, dict):
+            raise ValueError("Unknown event type")
+
+        if body.get("Type") == "Notification" and isinstance(body.get("Message"), str):
+            message = codec.loads(body["Message"])
+            if not isinstance(message, dict):
+                raise ValueError("Unknown event type")
+
+            return cls(
+                message=message,
+                message_id=body.get("MessageId"),
+                topic_arn=body.get("TopicArn"),
+                subject=body.get("Subject"),
+                timestamp=body.get("Timestamp"),
+                record=record,
+            )
+
+        return cls(
+            message=body,
+            message_id=record.get("messageId"),
+            topic_arn=None,
+            subject=None,
+            timestamp=None,
+            record=record,
+        )
+
+    @classmethod
+    def from_sns_record(cls, record: Dict[str, Any]) -> "EventEnvelope":
+        """
+        Build an envelope from an SNS record, decoding the message body.
+
+        Args:
+            record (Dict[str, Any]): The SNS record to decode
+
+        Returns:
+            EventEnvelope: The decoded envelope
+
+        Raises:
+            ValueError: If the record is not an SNS record or the message is not a JSON object
+        """
+        if not isinstance(record, dict) or record.get("EventSource") != "aws:sns" or not "Sns" in record:
+            raise ValueError("Unknown event source, not aws:sns or aws:sqs")
+
+        sns = record["Sns"]
+        message = codec.loads(sns["Message"])
+        if not isinstance(message, dict):
+            raise ValueError("Unknown event type")
+
+        return cls(
+            message=message,
+            message_id=sns.get("MessageId"),
+            topic_arn=sns.get("TopicArn"),
+            subject=sns.get("Subject"),
+            timestamp=sns.get("Timestamp"),
+            record=record,
+        )
+
+
+def is_sqs_record(record: Any) -> bool:
+    """
+    Return whether a record was delivered by an SQS event source mapping.
+    """
+    return isinstance(record, dict) and record.get("eventSource") == "aws:sqs" and "body" in record
+
+
+def is_eventbridge_event(event: Any) -> bool:
+    """
+    Return whether an event was delivered by an EventBridge rule targeting
+    the function directly, rather than through SNS or SQS.
+    """
+    return (
+        isinstance(event, dict)
+        and "Records" not in event
+        and "detail-type" in event
+        and isinstance(event.get("detail"), dict)
+    )
+
+
+def get_message_id(record: Any) -> Optional[str]:
+    """
+    Return the identifier of a record as known to its event source: the SQS
+    message id, reported back in batchItemFailures, the SNS message id, or
+    the EventBridge event id.
+    """
+    if not isinstance(record, dict):
+        return None
+    if is_sqs_record(record):
+        return record.get("messageId")
+    if is_eventbridge_event(record):
+        return record.get("id")
+    return (record.get("Sns") or {}).get("MessageId")
@@ -1,38 +1,52 @@
-from typing import Dict, Any
-import json
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+from .envelope import EventEnvelope, is_eventbridge_event
 from .normalized_event import NormalizedEvent
-from .event_type import EventType, Severity
-from notifications.events.parsers.cloudwatch import CloudWatchParser
-from notifications.events.parsers.securityhub import SecurityParser
-from notifications.events.parsers.kms import KMSParser
-from notifications.events.parsers.default import DefaultParser
-from notifications.events.parsers.guardduty import GuardDutyParser
+from .registry import ParserRegistry, default_registry
+# Importing the parsers declares the built-in parsers with the default registry
+import notifications.events.parsers  # noqa: F401
+
+if TYPE_CHECKING:
+    from .parsers.base import BaseParser
 
 
 class EventParser:
     """
     Parses and normalizes different types of AWS events into a
-    consistent format. This class handles various AWS event types
-    and provides a default parser for unknown events.
+    consistent format. Events are classified using the compiled dispatch
+    table of the parser registry, which is built once per container.
     """
 
-    def __init__(self):
-        self._cloudwatch_parser = CloudWatchParser()
-        self._security_parser = SecurityParser()
-        self._kms_parser = KMSParser()
-        self._default_parser = DefaultParser()
-        
-        self._parser_cache = {
-            EventType.CLOUDWATCH: CloudWatchParser().parse,
-            EventType.SECURITY_HUB: SecurityParser().parse,
-            EventType.GUARDDUTY: GuardDutyParser().parse,
-            EventType.KMS_DELETION: KMSParser().parse,
-        }
+    def __init__(self, registry: Optional[ParserRegistry] = None):
+        self._registry = registry or default_registry
+
+    def get_records(self, event: Dict[Any, Any]) -> List[Dict[str, Any]]:
+        """
+        Return all the records delivered in a single Lambda invocation. An
+        EventBridge event invoking the function directly is its single record.
+
+        Args:
+            event (Dict[Any, Any]): The incoming Lambda event
+
+        Returns:
+            List[Dict[str, Any]]: The records contained in the event
+
+        Raises:
+            ValueError: If the event does not contain any records
+        """
+        if is_eventbridge_event(event):
+            return [event]
+
+        records = event.get("Records") if isinstance(event, dict) else None
+        if not isinstance(records, list) or len(records) <= 0:
+            raise ValueError("Unknown event source, not aws:sns or aws:sqs")
+
+        return records
 
     def parse_event(self, event: Dict[Any, Any]) -> NormalizedEvent:
         """
-        Parse an incoming event into a normalized format.
+        Parse an incoming single record event into a normalized format. Events
+        carrying multiple records should be iterated with get_records and
+        parse_record instead.
 
         Args:
             event (Dict[Any, Any]): The incoming event to parse
@@ -40,59 +54,62 @@ class EventParser:
         Returns:
             NormalizedEvent: A normalized representation of the incoming event
         """
-        event_type = self._determine_event_type(event)
+        return self.parse_record(self.get_records(event)[0])
 
-        # step: we always use the default parser if the event type is not in the cache
-        if not event_type in self._parser_cache:
-            return self._default_parser.parse_default(event)
+    def parse_record(self, record: Dict[Any, Any]) -> NormalizedEvent:
+        """
+        Parse a single record from an incoming event into a normalized format.
 
-        return self._parser_cache[event_type](event)
+        Args:
+            record (Dict[Any, Any]): The record to parse
 
-    
-    def _determine_event_type(self, event: Dict[Any, Any]) -> str:
+        Returns:
+            NormalizedEvent: A normalized representation of the record
         """
-        Determine the type of incoming AWS event based on its structure and content.
+        return self.parse_envelope(EventEnvelope.from_record(record))
+
+    def parse_envelope(self, envelope: EventEnvelope) -> NormalizedEvent:
+        """
+        Parse an already decoded envelope into a normalized format.
 
         Args:
-            event (Dict[Any, Any]): The raw event to analyze
+            envelope (EventEnvelope): The decoded record to parse
 
         Returns:
-            str: The identified event type (e.g., 'cloudwatch_alarm', 'securityhub', etc.)
-
-        Raises:
-            ValueError: If the event type cannot be determined
+            NormalizedEvent: A normalized representation of the envelope
         """
+        _, parser = self._registry.dispatch_table().resolve(envelope.message)
 
-        # Check if it's an SNS wrapped message
-        if not self._is_sns_event(event):
-            raise ValueError("Unknown event source, not aws:sns")
+        return parser.parse(envelope)
 
-        message = json.loads(event["Records"][0]["Sns"]["Message"])
+    def parse_all(self, record: Dict[Any, Any]) -> List[NormalizedEvent]:
+        """
+        Parse every event carried by a single record, such as all the findings
+        of a Security Hub event, into a normalized format.
+
+        Args:
+            record (Dict[Any, Any]): The record to parse
 
-        if "AlarmName" in message or message.get("detail-type", "") == "CloudWatch Alarm State Change":
-            return EventType.CLOUDWATCH
-        elif message.get("detail-type") == "Security Hub Findings - Imported":
-            return EventType.SECURITY_HUB
-        elif message.get("detail-type", "") == "GuardDuty Finding":
-            return EventType.GUARDDUTY
-        elif message.get("detail-type", "") == "KMS CMK Deletion":
-            return EventType.KMS_DELETION
+        Returns:
+            List[NormalizedEvent]: A normalized representation of each event
+        """
+        envelope, parser = self.classify(record)
 
-        raise ValueError("Unknown event type")
-    
+        return parser.parse_all(envelope)
 
-    def _is_sns_event(self, event: Dict[Any, Any]) -> bool:
+    def classify(self, record: Dict[Any, Any]) -> Tuple[EventEnvelope, "BaseParser"]:
         """
-        Check if the event is an SNS event
+        Decode a record and select the parser of its event type, without
+        parsing it yet, so the two steps can be timed apart.
+
+        Args:
+            record (Dict[Any, Any]): The record to classify
+
+        Returns:
+            Tuple[EventEnvelope, BaseParser]: The decoded record, and the parser
+            to parse it with
         """
-        if not "Records" in event or len(event["Records"]) <= 0:
-            return False
-        if (
-            not "EventSource" in event["Records"][0]
-            or event["Records"][0]["EventSource"] != "aws:sns"
-        ):
-            return False
-        if not "Sns" in event["Records"][0]:
-            return False
-
-        return True
+        envelope = EventEnvelope.from_record(record)
+        _, parser = self._registry.dispatch_table().resolve(envelope.message)
+
+        return envelope, parser
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Dict
+from typing import Any, Dict, Tuple
 
 
 class EventType(Enum):
@@ -33,6 +33,65 @@ class Severity(Enum):
     UNKNOWN = "unknown"
     
 
+# The rank of each severity label, higher is more severe. Security Hub labels
+# informational findings 'informational' rather than 'info'
+SEVERITY_RANKS: Dict[str, int] = {
+    Severity.CRITICAL.value: 5,
+    Severity.HIGH.value: 4,
+    Severity.MEDIUM.value: 3,
+    Severity.LOW.value: 2,
+    Severity.INFO.value: 1,
+    "informational": 1,
+    Severity.UNKNOWN.value: 0,
+}
+
+# GuardDuty scores findings from 1.0 to 10.0, including fractional scores
+# such as 5.3, each severity covers the scores from its lower bound up to the
+# next: [1, 4) low, [4, 6) medium, [6, 8) high and [8, 10] critical
+GUARDDUTY_SEVERITY_RANGES: Tuple[Tuple[float, Severity], ...] = (
+    (8.0, Severity.CRITICAL),
+    (6.0, Severity.HIGH),
+    (4.0, Severity.MEDIUM),
+)
+
+
+def get_severity_rank(severity: Any) -> int:
+    """
+    Return the rank of a severity label, 0 for unrecognized labels.
+    """
+    rank = SEVERITY_RANKS.get(severity)
+    if rank is None:
+        rank = SEVERITY_RANKS.get(str(severity).lower(), 0)
+    return rank
+
+
+def bucket_severity(
+    score: Any,
+    ranges: Tuple[Tuple[float, Severity], ...] = GUARDDUTY_SEVERITY_RANGES,
+    default: Severity = Severity.LOW,
+) -> str:
+    """
+    Return the severity whose range holds a numeric score.
+
+    Args:
+        score: The score, a number or numeric string
+        ranges: The lower bound of each severity, highest first
+        default: The severity of scores below every range, or not numeric
+
+    Returns:
+        str: The severity label
+    """
+    try:
+        score = float(score)
+    except (TypeError, ValueError):
+        return default.value
+
+    for lower_bound, severity in ranges:
+        if score >= lower_bound:
+            return severity.value
+    return default.value
+
+
 # Mapping of AWS event types to our enum
 EVENT_TYPE_MAPPING: Dict[str, EventType] = {
     "cloudwatch_alarm": EventType.CLOUDWATCH,
@@ -1,10 +1,10 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .event_type import EventType
 
 
-@dataclass
+@dataclass(slots=True)
 class NormalizedEvent:
     """
     Normalized representation of various AWS events.
@@ -21,7 +21,8 @@ class NormalizedEvent:
         timestamp (datetime): When the event occurred
         source (str): The AWS service that generated the event
         details (Dict[str, Any]): Additional event-specific details
-        raw_event (Dict[str, Any]): The original, unprocessed event
+        raw_event (Optional[Dict[str, Any]]): The original, unprocessed event,
+            only retained when RETAIN_RAW_EVENT is enabled
     """
 
     event_type: EventType
@@ -32,13 +33,22 @@ class NormalizedEvent:
     timestamp: datetime
     source: str
     details: Dict[str, Any]
-    raw_event: Dict[str, Any]
+    raw_event: Optional[Dict[str, Any]] = None
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, include_details: bool = True, include_raw_event: bool = False) -> Dict[str, Any]:
         """
         Convert the normalized event to a dictionary suitable for JSON serialization.
+        The details and raw event are referenced rather than copied, and are only
+        included when asked for.
+
+        Args:
+            include_details (bool): Whether to include the event details
+            include_raw_event (bool): Whether to include the raw event, when retained
+
+        Returns:
+            Dict[str, Any]: The event as a dictionary
         """
-        return {
+        result = {
             "event_type": str(self.event_type),
             "severity": self.severity,
             "title": self.title,
@@ -46,6 +56,10 @@ class NormalizedEvent:
             "description": self.description,
             "timestamp": self.timestamp.isoformat(),
             "source": self.source,
-            "details": self.details,
-            "raw_event": self.raw_event,
         }
+        if include_details:
+            result["details"] = self.details
+        if include_raw_event and self.raw_event is not None:
+            result["raw_event"] = self.raw_event
+
+        return result
@@ -1,7 +1,46 @@
-from .base import BaseParser
-from .cloudwatch import CloudWatchParser
-from .securityhub import SecurityParser
-from .kms import KMSParser
-from .default import DefaultParser
+from notifications.events.event_type import EventType
+from notifications.events.registry import LazyParser, default_registry
+from notifications.utils.imports import lazy_attributes
 
-__all__ = ["BaseParser", "CloudWatchParser", "SecurityParser", "KMSParser", "DefaultParser"]
\ No newline at end of file
+# The built-in parsers, declared with the keys they match on so that each is
+# only imported when an event it handles is first parsed. The registry rejects
+# a parser whose class attributes differ from its declaration once imported.
+PARSERS = (
+    LazyParser(
+        "notifications.events.parsers.cloudwatch.CloudWatchParser",
+        EventType.CLOUDWATCH,
+        detail_types=("CloudWatch Alarm State Change",),
+        fields=("AlarmName",),
+    ),
+    LazyParser(
+        "notifications.events.parsers.securityhub.SecurityParser",
+        EventType.SECURITY_HUB,
+        detail_types=("Security Hub Findings - Imported",),
+    ),
+    LazyParser(
+        "notifications.events.parsers.guardduty.GuardDutyParser",
+        EventType.GUARDDUTY,
+        detail_types=("GuardDuty Finding",),
+    ),
+    LazyParser(
+        "notifications.events.parsers.kms.KMSParser",
+        EventType.KMS_DELETION,
+        detail_types=("KMS CMK Deletion",),
+    ),
+)
+
+for _parser in PARSERS:
+    default_registry.register_lazy(_parser)
+
+_ATTRIBUTES = {
+    "BaseParser": "base",
+    "CloudWatchParser": "cloudwatch",
+    "SecurityParser": "securityhub",
+    "GuardDutyParser": "guardduty",
+    "KMSParser": "kms",
+    "DefaultParser": "default",
+}
+
+__getattr__ = lazy_attributes(__name__, _ATTRIBUTES)
+
+__all__ = ["BaseParser", "CloudWatchParser", "SecurityParser", "GuardDutyParser", "KMSParser", "DefaultParser"]
@@ -1,16 +1,41 @@
-from typing import Dict, Any
 from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+from notifications.events.envelope import EventEnvelope
+from notifications.events.event_type import EventType
 from notifications.events.normalized_event import NormalizedEvent
-import json
 
-class BaseParser:
-    def _get_message_body(self, event: Dict[Any, Any]) -> Dict[str, Any]:
-        """Extract the message body from an event, handling SNS message wrapping if present."""
-        if "Records" in event and event["Records"][0]["EventSource"] == "aws:sns":
-            return json.loads(event["Records"][0]["Sns"]["Message"])
-        return event 
-    
+class BaseParser(ABC):
+    """
+    Base class for event parsers. Subclasses declare the keys they match on,
+    and are registered with the parser registry using @register_parser.
+    """
+
+    # The event type produced by the parser
+    event_type: EventType = EventType.UNKNOWN
+    # EventBridge detail-type values handled by the parser
+    detail_types: Tuple[str, ...] = ()
+    # EventBridge source values handled by the parser
+    sources: Tuple[str, ...] = ()
+    # Top level message fields whose presence identifies the event
+    fields: Tuple[str, ...] = ()
+
     @abstractmethod
-    def parse(self, event: Dict[Any, Any]) -> NormalizedEvent:
-        """Parse an event into a normalized format."""
+    def parse(self, envelope: EventEnvelope) -> NormalizedEvent:
+        """Parse a decoded envelope into a normalized format."""
         pass
+
+    def peek_severity(self, message: Dict[str, Any]) -> Optional[str]:
+        """
+        Return the severity of a decoded message from a few cheap fields,
+        without parsing it, so unwanted events are rejected early. For a
+        message carrying several events this is the highest severity among
+        them. Returns None when the severity is only known once parsed.
+        """
+        return None
+
+    def parse_all(self, envelope: EventEnvelope) -> List[NormalizedEvent]:
+        """
+        Parse every event carried by a decoded envelope. Most events carry a
+        single event, parsers for batched events override this method.
+        """
+        return [self.parse(envelope)]
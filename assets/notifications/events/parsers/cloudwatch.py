@@ -1,32 +1,46 @@
-from typing import Dict, Any
 from datetime import datetime
+from typing import Any, Dict, Optional
+from notifications.events.envelope import EventEnvelope
 from notifications.events.normalized_event import NormalizedEvent
 from notifications.events.event_type import EventType, Severity
 from notifications.events.parsers.base import BaseParser
+from notifications.events.registry import register_parser
 
+@register_parser
 class CloudWatchParser(BaseParser):
     """ 
     Parses CloudWatch events into a normalized format.
     """
-    def parse(self, event: Dict[Any, Any]) -> NormalizedEvent:
-        message = self._get_message_body(event)
-        
+
+    event_type = EventType.CLOUDWATCH
+    detail_types = ("CloudWatch Alarm State Change",)
+    fields = ("AlarmName",)
+
+    def peek_severity(self, message: Dict[str, Any]) -> Optional[str]:
+        """An alarm entering the ALARM state is critical, any other transition is informational."""
         if "AlarmName" in message:
-            return self._parse_cloudwatch_alarm(event)
-        return self._parse_cloudwatch_eventbridge(event)
+            state = message.get("NewStateValue")
+        else:
+            state = message.get("detail", {}).get("state", {}).get("value")
+        return (Severity.CRITICAL if state == "ALARM" else Severity.INFO).value
+
+    def parse(self, envelope: EventEnvelope) -> NormalizedEvent:
+        if "AlarmName" in envelope.message:
+            return self._parse_cloudwatch_alarm(envelope)
+        return self._parse_cloudwatch_eventbridge(envelope)
     
-    def _parse_cloudwatch_alarm(self, event: Dict[Any, Any]) -> NormalizedEvent:
+    def _parse_cloudwatch_alarm(self, envelope: EventEnvelope) -> NormalizedEvent:
         """
         Parse a CloudWatch Alarm event into a normalized format.
         Extracts alarm-specific information such as state changes and reasons.
 
         Args:
-            event (Dict[Any, Any]): The CloudWatch Alarm event to parse
+            envelope (EventEnvelope): The decoded CloudWatch Alarm event to parse
 
         Returns:
             NormalizedEvent: A normalized representation of the CloudWatch Alarm event
         """
-        message = self._get_message_body(event)
+        message = envelope.message
         severity = (Severity.CRITICAL if message.get("NewStateValue") == "ALARM" else Severity.INFO).value
 
         return NormalizedEvent(
@@ -43,15 +57,16 @@ class CloudWatchParser(BaseParser):
                 "reason": message.get("NewStateReason"),
                 "previous_state": message.get("OldStateValue"),
                 "current_state": message.get("NewStateValue"),
+                "account_id": message.get("AWSAccountId"),
             },
-            raw_event=event,
+            raw_event=envelope.raw_event,
         )
 
-    def _parse_cloudwatch_eventbridge(self, event: Dict[Any, Any]) -> NormalizedEvent:
+    def _parse_cloudwatch_eventbridge(self, envelope: EventEnvelope) -> NormalizedEvent:
         """
         Parse a CloudWatch EventBridge event into a normalized format.
         """
-        message = self._get_message_body(event) 
+        message = envelope.message
         detail = message.get("detail", {})
         configuration = detail.get("configuration", {})
         state = detail.get("state", {})
@@ -72,7 +87,8 @@ class CloudWatchParser(BaseParser):
                 "reason": state.get("reason"),
                 "previous_state": previous_state.get("value"),
                 "current_state": state.get("value"),
+                "account_id": message.get("account"),
                 "resources": message.get("resources", []),
             },
-            raw_event=event,
+            raw_event=envelope.raw_event,
         )   
\ No newline at end of file
@@ -1,8 +1,9 @@
 from typing import Dict, Any
-import json
 from datetime import datetime
+from notifications.events.envelope import EventEnvelope
 from notifications.events.normalized_event import NormalizedEvent
 from notifications.events.parsers.base import BaseParser
+from notifications.utils import codec
 
 class DefaultParser(BaseParser):
     """ 
@@ -10,28 +11,26 @@ class DefaultParser(BaseParser):
     meaningful information from any AWS event structure.
     """
     
-    def parse(self, event: Dict[Any, Any]) -> NormalizedEvent:
-        message = self._get_message_body(event)
+    def parse(self, envelope: EventEnvelope) -> NormalizedEvent:
+        message = envelope.message
         source = self._extract_source(message)
         title = self._extract_title(message)
         description = self._extract_description(message)
         timestamp = self._extract_timestamp(message)
         severity = self._extract_severity(message)
         details = self._extract_details(message)
-        region = message.get("TopicArn", ":::unknown:::").split(":")[3]
-        subject = message.get("Subject")
+        region = (envelope.topic_arn or ":::unknown:::").split(":")[3]
 
         return NormalizedEvent(
             event_type="unknown",
             severity=severity,
-            subject=subject,
             title=title,
             region=region,
             description=description,
             timestamp=timestamp,
             source=source,
             details=details,
-            raw_event=event,
+            raw_event=envelope.raw_event,
         )
     
     def _extract_source(self, message: Dict[str, Any]) -> str:
@@ -99,7 +98,8 @@ class DefaultParser(BaseParser):
         """
         # Try to create a meaningful description from available fields
         if "detail" in message and isinstance(message["detail"], dict):
-            return f"Event details: {json.dumps(message['detail'], indent=2)}"
+            # Compact JSON, as the description is rendered in the payload size budget
+            return f"Event details: {codec.dumps_str(message['detail'])}"
 
         # If no detail field, use the message itself
         return f"Raw event received from {self._extract_source(message)}"
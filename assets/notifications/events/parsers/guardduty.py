@@ -1,43 +1,40 @@
-from typing import Dict, Any
 from datetime import datetime
+from notifications.events.envelope import EventEnvelope
 from notifications.events.normalized_event import NormalizedEvent
-from notifications.events.event_type import EventType, Severity
+from typing import Any, Dict, Optional
+from notifications.events.event_type import EventType, bucket_severity
 from notifications.events.parsers.base import BaseParser
+from notifications.events.registry import register_parser
 
+@register_parser
 class GuardDutyParser(BaseParser):
     """
     Parses GuardDuty events into a normalized format.
     """
-    
-    def parse(self, event: Dict[Any, Any]) -> NormalizedEvent:
+
+    event_type = EventType.GUARDDUTY
+    detail_types = ("GuardDuty Finding",)
+
+    def peek_severity(self, message: Dict[str, Any]) -> Optional[str]:
+        """Bucket the numeric severity score of the finding into a severity label."""
+        return bucket_severity(message.get("detail", {}).get("severity", 1.0))
+
+    def parse(self, envelope: EventEnvelope) -> NormalizedEvent:
         """
         Parse a GuardDuty finding event into a normalized format.
         Extracts security-specific information such as severity, findings details, and affected resources.
 
         Args:
-            event (Dict[Any, Any]): The GuardDuty event to parse
+            envelope (EventEnvelope): The decoded GuardDuty event to parse
 
         Returns:
             NormalizedEvent: A normalized representation of the GuardDuty event
         """
 
-        # Map GuardDuty severity levels to our severity levels
-        severity_mapping = {
-            1.0: Severity.LOW.value,
-            2.0: Severity.LOW.value,
-            3.0: Severity.LOW.value,
-            4.0: Severity.MEDIUM.value,
-            5.0: Severity.MEDIUM.value,
-            6.0: Severity.HIGH.value,
-            7.0: Severity.HIGH.value,
-            8.0: Severity.CRITICAL.value,
-            9.0: Severity.CRITICAL.value,
-            10.0: Severity.CRITICAL.value,
-        }
-
-        message = self._get_message_body(event)
+        message = envelope.message
         finding = message.get("detail", {})
-        severity = severity_mapping.get(finding.get("severity", 1.0), Severity.LOW.value)
+        # Scores are fractional, such as 5.3, so they are bucketed by range
+        severity = self.peek_severity(message)
 
         return NormalizedEvent(
             event_type=EventType.GUARDDUTY,
@@ -59,6 +56,6 @@ class GuardDutyParser(BaseParser):
                 "resource_type": finding.get("resource", {}).get("resourceType"),
                 "resource_id": finding.get("resource", {}).get("resourceId"),
             },
-            raw_event=event,
+            raw_event=envelope.raw_event,
         )
     
\ No newline at end of file
@@ -1,20 +1,30 @@
-from typing import Dict, Any
 from datetime import datetime
+from typing import Any, Dict, Optional
+from notifications.events.envelope import EventEnvelope
 from notifications.events.normalized_event import NormalizedEvent
 from notifications.events.event_type import EventType, Severity
 from notifications.events.parsers.base import BaseParser
+from notifications.events.registry import register_parser
 
+@register_parser
 class KMSParser(BaseParser):
     """ 
     Parses KMS deletion events into a normalized format.
     """
+
+    event_type = EventType.KMS_DELETION
+    detail_types = ("KMS CMK Deletion",)
+
+    def peek_severity(self, message: Dict[str, Any]) -> Optional[str]:
+        """The scheduled deletion of a key is always critical."""
+        return Severity.CRITICAL.value
     
-    def parse(self, event: Dict[Any, Any]) -> NormalizedEvent:
+    def parse(self, envelope: EventEnvelope) -> NormalizedEvent:
         """
         Parse a KMS deletion event into a normalized format.
         """
         
-        message = self._get_message_body(event)
+        message = envelope.message
         detail = message.get("detail", {})
         
         return NormalizedEvent(
@@ -29,5 +39,5 @@ class KMSParser(BaseParser):
                 "key_arn": message.get("resources", [])[0],
                 "key_id": detail.get("key-id"),
             }, 
-            raw_event=event
+            raw_event=envelope.raw_event
         ) 
\ No newline at end of file
@@ -1,28 +1,83 @@
-from typing import Dict, Any
 from datetime import datetime
+from typing import Any, Dict, List, Optional
+from notifications.events.envelope import EventEnvelope
 from notifications.events.normalized_event import NormalizedEvent
-from notifications.events.event_type import EventType, Severity
+from notifications.events.event_type import EventType, Severity, get_severity_rank
 from notifications.events.parsers.base import BaseParser
+from notifications.events.registry import register_parser
 
+@register_parser
 class SecurityParser(BaseParser):
     """
     Parses SecurityHub and GuardDuty events into a normalized format.
     """
-    
-    def parse(self, event: Dict[Any, Any]) -> NormalizedEvent:
+
+    event_type = EventType.SECURITY_HUB
+    detail_types = ("Security Hub Findings - Imported",)
+
+    def peek_severity(self, message: Dict[str, Any]) -> Optional[str]:
+        """Return the highest severity label among the findings of the event."""
+        labels = [
+            finding.get("Severity", {}).get("Label", Severity.UNKNOWN.value).lower()
+            for finding in message.get("detail", {}).get("findings") or ()
+        ]
+        return max(labels, key=get_severity_rank) if labels else None
+
+    def parse(self, envelope: EventEnvelope) -> NormalizedEvent:
         """
-        Parse a SecurityHub finding event into a normalized format.
+        Parse the first finding of a SecurityHub event into a normalized format.
+        Events carrying several findings should be parsed with parse_all instead.
+
+        Args:
+            envelope (EventEnvelope): The decoded SecurityHub event to parse
+
+        Returns:
+            NormalizedEvent: A normalized representation of the first finding
+
+        Raises:
+            ValueError: If the event does not contain any findings
+        """
+        findings = envelope.message["detail"]["findings"]
+        if len(findings) <= 0:
+            raise ValueError("Security Hub event has no findings")
+
+        return self._parse_finding(findings[0], envelope)
+
+    def parse_all(self, envelope: EventEnvelope) -> List[NormalizedEvent]:
+        """
+        Parse every finding of a SecurityHub event, EventBridge delivers up to
+        100 findings in a single event.
+
+        Args:
+            envelope (EventEnvelope): The decoded SecurityHub event to parse
+
+        Returns:
+            List[NormalizedEvent]: A normalized event for each finding, in order
+        """
+        return [
+            self._parse_finding(finding, envelope)
+            for finding in envelope.message["detail"]["findings"]
+        ]
+
+    def _parse_finding(self, finding: Dict[str, Any], envelope: EventEnvelope) -> NormalizedEvent:
+        """
+        Parse a single SecurityHub finding into a normalized format.
         Extracts security-specific information such as severity, findings, and compliance status.
 
         Args:
-            event (Dict[Any, Any]): The SecurityHub event to parse
+            finding (Dict[str, Any]): The finding to parse
+            envelope (EventEnvelope): The decoded SecurityHub event carrying the finding
 
         Returns:
-            NormalizedEvent: A normalized representation of the SecurityHub event
+            NormalizedEvent: A normalized representation of the finding
         """
-        message = self._get_message_body(event)
-        finding = message["detail"]["findings"][0]
         details = {}
+
+        if finding.get("Id") is not None:
+            details["finding_id"] = finding.get("Id")
+
+        if finding.get("AwsAccountId") is not None:
+            details["account_id"] = finding.get("AwsAccountId")
         
         if finding.get("Remediation", {}).get("Recommendation", {}).get("Text"):
             details["remediation"] = finding.get("Remediation", {}).get("Recommendation", {}).get("Text")
@@ -50,5 +105,5 @@ class SecurityParser(BaseParser):
             ),
             source="SecurityHub",
             details=details,
-            raw_event=event,
+            raw_event=envelope.raw_event,
         )
\ No newline at end of file
@@ -0,0 +1,248 @@
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Type, Union
+from .event_type import EventType
+from notifications.utils.imports import import_string
+
+
+class DispatchTable:
+    """
+    A compiled view of a parser registry, used to classify decoded messages.
+
+    Classification is a dictionary lookup on the detail-type, then on the
+    source, before falling back to an ordered list of field presence checks,
+    so the cost of classifying an event does not grow with the number of
+    registered parsers.
+    """
+
+    def __init__(
+        self,
+        by_detail_type: Dict[str, Tuple[EventType, Any]],
+        by_source: Dict[str, Tuple[EventType, Any]],
+        by_field: List[Tuple[str, EventType, Any]],
+    ):
+        self.by_detail_type = by_detail_type
+        self.by_source = by_source
+        self.by_field = by_field
+
+    def resolve(self, message: Dict[str, Any]) -> Tuple[EventType, Any]:
+        """
+        Find the event type and parser for a decoded message.
+
+        Args:
+            message (Dict[str, Any]): The decoded message to classify
+
+        Returns:
+            Tuple[EventType, BaseParser]: The event type and the parser instance
+
+        Raises:
+            ValueError: If no registered parser matches the message
+        """
+        detail_type = message.get("detail-type")
+        if detail_type is not None:
+            match = self.by_detail_type.get(detail_type)
+            if match is not None:
+                return match
+
+        source = message.get("source")
+        if source is not None:
+            match = self.by_source.get(source)
+            if match is not None:
+                return match
+
+        for field, event_type, parser in self.by_field:
+            if field in message:
+                return event_type, parser
+
+        raise ValueError("Unknown event type")
+
+
+class LazyParser:
+    """
+    A parser declared by its import path and the keys it matches on, which is
+    imported on first use. A container then only loads the parsers of the
+    events it receives.
+
+    The dispatch table holds the LazyParser itself, which delegates to the
+    parser once loaded.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        event_type: EventType,
+        detail_types: Tuple[str, ...] = (),
+        sources: Tuple[str, ...] = (),
+        fields: Tuple[str, ...] = (),
+    ):
+        """
+        Args:
+            path: The dotted path of the parser class
+            event_type: The EventType produced by the parser
+            detail_types: EventBridge detail-type values handled by the parser
+            sources: EventBridge source values handled by the parser
+            fields: Top level message fields whose presence identifies the event
+        """
+        self.path = path
+        self.event_type = event_type
+        self.detail_types = detail_types
+        self.sources = sources
+        self.fields = fields
+        self.__name__ = path.rpartition(".")[2]
+        self._parser = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Any:
+        """
+        Import and instantiate the parser, on first use only.
+        """
+        with self._lock:
+            if self._parser is None:
+                self._parser = import_string(self.path)()
+            return self._parser
+
+    def parse(self, envelope: Any) -> Any:
+        return self.load().parse(envelope)
+
+    def parse_all(self, envelope: Any) -> List[Any]:
+        return self.load().parse_all(envelope)
+
+    def peek_severity(self, message: Any) -> Optional[str]:
+        return self.load().peek_severity(message)
+
+
+class ParserRegistry:
+    """
+    Holds the parsers available to the EventParser, and the keys each of them
+    matches on.
+
+    Parsers declare the keys they match as class attributes:
+
+        - event_type: the EventType produced by the parser
+        - detail_types: EventBridge detail-type values handled by the parser
+        - sources: EventBridge source values handled by the parser
+        - fields: top level message fields whose presence identifies the event,
+          checked in registration order when nothing else matches
+    """
+
+    def __init__(self):
+        self._parsers: List[Union[Type, LazyParser]] = []
+        self._table: Optional[DispatchTable] = None
+        self._lock = threading.Lock()
+
+    def register(self, parser_cls: Type) -> Type:
+        """
+        Register a parser class, usable as a class decorator.
+
+        Args:
+            parser_cls: The parser class to register
+
+        Returns:
+            Type: The parser class, unchanged
+
+        Raises:
+            ValueError: If a key is already claimed by another parser
+        """
+        with self._lock:
+            path = f"{parser_cls.__module__}.{parser_cls.__qualname__}"
+            claimed = self._claimed_keys()
+            for key in self._keys(parser_cls):
+                owner = claimed.get(key)
+                if owner is not None and owner is not parser_cls and getattr(owner, "path", None) != path:
+                    raise ValueError(
+                        f"{parser_cls.__name__} matches {key[0]} {key[1]!r}, already registered by {owner.__name__}"
+                    )
+
+            # A parser declared lazily is registered again once its module is
+            # imported, the compiled table keeps delegating to the declaration,
+            # which must declare the same keys as the class
+            declaration = next((entry for entry in self._parsers if getattr(entry, "path", None) == path), None)
+            if declaration is not None:
+                if (
+                    declaration.event_type != parser_cls.event_type
+                    or self._keys(declaration) != self._keys(parser_cls)
+                ):
+                    raise ValueError(f"{parser_cls.__name__} does not match the keys of its lazy declaration")
+                return parser_cls
+
+            if parser_cls not in self._parsers:
+                self._parsers.append(parser_cls)
+            self._table = None
+
+        return parser_cls
+
+    def register_lazy(self, parser: LazyParser) -> LazyParser:
+        """
+        Register a parser declared by its import path, which is only imported
+        when an event it matches is first parsed.
+
+        Args:
+            parser: The declaration of the parser
+
+        Returns:
+            LazyParser: The declaration, unchanged
+
+        Raises:
+            ValueError: If a key is already claimed by another parser
+        """
+        with self._lock:
+            claimed = self._claimed_keys()
+            for key in self._keys(parser):
+                if key in claimed and claimed[key] is not parser:
+                    raise ValueError(
+                        f"{parser.__name__} matches {key[0]} {key[1]!r}, already registered by {claimed[key].__name__}"
+                    )
+
+            if parser not in self._parsers:
+                self._parsers.append(parser)
+            self._table = None
+
+        return parser
+
+    def dispatch_table(self) -> DispatchTable:
+        """
+        Return the compiled dispatch table, compiling it on first use. The table,
+        and the parser instances it holds, are shared for the life of the container.
+        """
+        with self._lock:
+            if self._table is None:
+                self._table = self._compile()
+            return self._table
+
+    def _compile(self) -> DispatchTable:
+        by_detail_type: Dict[str, Tuple[EventType, Any]] = {}
+        by_source: Dict[str, Tuple[EventType, Any]] = {}
+        by_field: List[Tuple[str, EventType, Any]] = []
+
+        for parser_cls in self._parsers:
+            parser = parser_cls if isinstance(parser_cls, LazyParser) else parser_cls()
+            entry = (parser_cls.event_type, parser)
+            for detail_type in parser_cls.detail_types:
+                by_detail_type[detail_type] = entry
+            for source in parser_cls.sources:
+                by_source[source] = entry
+            for field in parser_cls.fields:
+                by_field.append((field, *entry))
+
+        return DispatchTable(by_detail_type, by_source, by_field)
+
+    def _claimed_keys(self) -> Dict[Tuple[str, str], Union[Type, LazyParser]]:
+        return {key: parser_cls for parser_cls in self._parsers for key in self._keys(parser_cls)}
+
+    @staticmethod
+    def _keys(parser_cls: Union[Type, LazyParser]) -> List[Tuple[str, str]]:
+        return (
+            [("detail-type", value) for value in parser_cls.detail_types]
+            + [("source", value) for value in parser_cls.sources]
+            + [("field", value) for value in parser_cls.fields]
+        )
+
+
+# The registry used by the EventParser, shared for the life of the container
+default_registry = ParserRegistry()
+
+
+def register_parser(parser_cls: Type) -> Type:
+    """
+    Register a parser with the default registry, usable as a class decorator.
+    """
+    return default_registry.register(parser_cls)
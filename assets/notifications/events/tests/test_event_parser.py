@@ -1,5 +1,7 @@
 from datetime import datetime
-from notifications.events import EventParser, NormalizedEvent, EventType
+from notifications.events import EventParser, EventEnvelope, NormalizedEvent, EventType
+from notifications.utils import codec
+from unittest.mock import patch
 import pytest
 import json
 
@@ -271,3 +273,191 @@ class TestEventParser:
 
         with pytest.raises(ValueError, match="Unknown event type"):
             self.parser.parse_event(test_event)
+
+    def test_parse_multiple_records(self):
+        """Test that every record of a batched event can be parsed"""
+        records = [
+            self.get_sns_event({
+                "AlarmName": f"Alarm {i}",
+                "NewStateValue": "ALARM",
+                "StateChangeTime": "2024-01-01T00:00:00Z",
+            })["Records"][0]
+            for i in range(3)
+        ]
+
+        results = [
+            self.parser.parse_record(record)
+            for record in self.parser.get_records({"Records": records})
+        ]
+
+        assert [result.title for result in results] == ["Alarm 0", "Alarm 1", "Alarm 2"]
+
+    def test_message_decoded_once(self):
+        """Test that the SNS message is decoded once per record, regardless of parser"""
+        alarm_message = {
+            "AlarmName": "Test Alarm",
+            "NewStateValue": "ALARM",
+            "StateChangeTime": "2024-01-01T00:00:00Z",
+        }
+        test_event = self.get_sns_event(alarm_message)
+
+        with patch("notifications.events.envelope.codec.loads", wraps=codec.loads) as loads:
+            result = self.parser.parse_event(test_event)
+
+        assert result.title == "Test Alarm"
+        assert loads.call_count == 1
+
+    def test_envelope_carries_sns_metadata(self):
+        """Test that the envelope exposes the SNS metadata alongside the decoded message"""
+        record = {
+            "EventSource": "aws:sns",
+            "Sns": {
+                "MessageId": "95df01b4-ee98-5cb9-9903-4c221d41eb5e",
+                "TopicArn": "arn:aws:sns:us-east-1:123456789012:notifications",
+                "Subject": "ALARM: Test Alarm",
+                "Timestamp": "2024-01-01T00:00:00.000Z",
+                "Message": json.dumps({"AlarmName": "Test Alarm"}),
+            },
+        }
+
+        envelope = EventEnvelope.from_sns_record(record)
+
+        assert envelope.message == {"AlarmName": "Test Alarm"}
+        assert envelope.message_id == "95df01b4-ee98-5cb9-9903-4c221d41eb5e"
+        assert envelope.topic_arn == "arn:aws:sns:us-east-1:123456789012:notifications"
+        assert envelope.subject == "ALARM: Test Alarm"
+        assert envelope.timestamp == "2024-01-01T00:00:00.000Z"
+        assert envelope.record is record
+
+    def test_sqs_record_wrapping_sns_notification(self):
+        """Test that an SNS notification delivered through an SQS queue is unwrapped"""
+        alarm_message = {
+            "AlarmName": "Test Alarm",
+            "NewStateValue": "ALARM",
+            "StateChangeTime": "2024-01-01T00:00:00Z",
+        }
+        record = {
+            "messageId": "059f36b4-87a3-44ab-83d2-661975830a7d",
+            "eventSource": "aws:sqs",
+            "body": json.dumps({
+                "Type": "Notification",
+                "MessageId": "95df01b4-ee98-5cb9-9903-4c221d41eb5e",
+                "TopicArn": "arn:aws:sns:us-east-1:123456789012:notifications",
+                "Timestamp": "2024-01-01T00:00:00.000Z",
+                "Message": json.dumps(alarm_message),
+            }),
+        }
+
+        envelope = EventEnvelope.from_record(record)
+
+        assert envelope.message == alarm_message
+        assert envelope.message_id == "95df01b4-ee98-5cb9-9903-4c221d41eb5e"
+        assert envelope.topic_arn == "arn:aws:sns:us-east-1:123456789012:notifications"
+        assert envelope.record is record
+        sqs_result = self.parser.parse_record(record)
+        sns_result = self.parser.parse_record(self.get_sns_event(alarm_message)["Records"][0])
+        assert sqs_result.to_dict() == sns_result.to_dict()
+
+    def test_eventbridge_event_is_its_own_record(self):
+        """Test that an EventBridge event invoking the function directly is parsed without an SNS envelope"""
+        event = {
+            "id": "c7f1a1d2-5b2c-4b0e-9d3f-0a1b2c3d4e5f",
+            "detail-type": "CloudWatch Alarm State Change",
+            "source": "aws.cloudwatch",
+            "time": "2024-01-01T00:00:00Z",
+            "region": "us-east-1",
+            "detail": {"alarmName": "Test Alarm", "state": {"value": "ALARM"}},
+        }
+
+        records = self.parser.get_records(event)
+        envelope = EventEnvelope.from_record(records[0])
+
+        assert records == [event]
+        assert envelope.message is event
+        assert envelope.message_id == "c7f1a1d2-5b2c-4b0e-9d3f-0a1b2c3d4e5f"
+        assert envelope.timestamp == "2024-01-01T00:00:00Z"
+        direct = self.parser.parse_all(event)[0]
+        published = self.parser.parse_event(self.get_sns_event(event))
+        assert (direct.event_type, direct.title, direct.details) == (published.event_type, published.title, published.details)
+
+    def test_sqs_record_with_raw_message(self):
+        """Test that an SQS message carrying the event itself is parsed"""
+        record = {
+            "messageId": "059f36b4-87a3-44ab-83d2-661975830a7d",
+            "eventSource": "aws:sqs",
+            "body": json.dumps({
+                "AlarmName": "Test Alarm",
+                "NewStateValue": "ALARM",
+                "StateChangeTime": "2024-01-01T00:00:00Z",
+            }),
+        }
+
+        envelope = EventEnvelope.from_record(record)
+
+        assert envelope.message_id == "059f36b4-87a3-44ab-83d2-661975830a7d"
+        assert envelope.topic_arn is None
+        assert self.parser.parse_record(record).title == "Test Alarm"
+
+    def test_parse_all_security_hub_findings(self):
+        """Test that every finding of a Security Hub event is parsed, not only the first one"""
+        security_finding = {
+            "detail-type": "Security Hub Findings - Imported",
+            "source": "aws.securityhub",
+            "detail": {
+                "findings": [
+                    {
+                        "Title": f"Finding {i}",
+                        "Description": "Security issue detected",
+                        "Severity": {"Label": "HIGH" if i % 2 else "LOW"},
+                        "UpdatedAt": "2024-01-01T00:00:00Z",
+                        "Resources": [{"Type": "AwsS3Bucket", "Id": f"arn:aws:s3:::bucket-{i}"}],
+                    }
+                    for i in range(3)
+                ]
+            },
+        }
+
+        test_event = self.get_sns_event(security_finding)
+        results = self.parser.parse_all(test_event["Records"][0])
+
+        assert [result.title for result in results] == ["Finding 0", "Finding 1", "Finding 2"]
+        assert [result.severity for result in results] == ["low", "high", "low"]
+        assert results[2].details["resources"][0]["resource_id"] == "arn:aws:s3:::bucket-2"
+        assert self.parser.parse_event(test_event).title == "Finding 0"
+
+    def test_raw_event_is_only_retained_when_enabled(self, monkeypatch):
+        """Test that normalized events only keep the record when RETAIN_RAW_EVENT is enabled"""
+        test_event = self.get_sns_event({
+            "AlarmName": "Test Alarm",
+            "NewStateValue": "ALARM",
+            "StateChangeTime": "2024-01-01T00:00:00Z",
+        })
+
+        result = self.parser.parse_event(test_event)
+
+        assert result.raw_event is None
+        assert "raw_event" not in result.to_dict(include_raw_event=True)
+
+        monkeypatch.setattr("notifications.events.envelope.RETAIN_RAW_EVENT", True)
+        result = self.parser.parse_event(test_event)
+
+        assert result.raw_event is test_event["Records"][0]
+        assert result.to_dict(include_raw_event=True)["raw_event"] is test_event["Records"][0]
+        assert "raw_event" not in result.to_dict()
+
+    def test_normalized_event_is_compact(self):
+        """Test that normalized events use slots, and to_dict only references the details when asked"""
+        event = NormalizedEvent(
+            event_type=EventType.GUARDDUTY,
+            severity="high",
+            title="Finding",
+            region="us-east-1",
+            description="Description",
+            timestamp=datetime(2024, 1, 1),
+            source="GuardDuty",
+            details={"finding_id": "1"},
+        )
+
+        assert not hasattr(event, "__dict__")
+        assert event.to_dict()["details"] is event.details
+        assert "details" not in event.to_dict(include_details=False)
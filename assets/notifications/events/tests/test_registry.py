@@ -0,0 +1,140 @@
+from datetime import datetime, timezone
+import json
+import pytest
+from notifications.events import EventParser, EventType, NormalizedEvent, ParserRegistry
+from notifications.events.envelope import EventEnvelope
+from notifications.events.parsers.base import BaseParser
+from notifications.events.parsers import PARSERS
+from notifications.events.registry import LazyParser, default_registry
+from notifications.utils.imports import import_string
+
+
+class BudgetParser(BaseParser):
+    event_type = EventType.UNKNOWN
+    detail_types = ("Budget Threshold Exceeded",)
+    sources = ("aws.budgets",)
+
+    def parse(self, envelope: EventEnvelope) -> NormalizedEvent:
+        return NormalizedEvent(
+            event_type=self.event_type,
+            severity="high",
+            title=envelope.message["detail"]["budgetName"],
+            region=envelope.message.get("region", "unknown"),
+            description="Budget exceeded",
+            timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            source="Budgets",
+            details={},
+            raw_event=envelope.record,
+        )
+
+
+class MarkerParser(BudgetParser):
+    detail_types = ()
+    sources = ()
+    fields = ("Marker",)
+
+
+class TestParserRegistry:
+    def get_envelope(self, message):
+        return EventEnvelope.from_sns_record({
+            "EventSource": "aws:sns",
+            "Sns": {"Message": json.dumps(message)},
+        })
+
+    def test_custom_parser_registration(self):
+        """Test that a parser registered with a registry is used by the EventParser"""
+        registry = ParserRegistry()
+        registry.register(BudgetParser)
+        parser = EventParser(registry=registry)
+
+        result = parser.parse_envelope(self.get_envelope({
+            "detail-type": "Budget Threshold Exceeded",
+            "detail": {"budgetName": "Monthly"},
+        }))
+
+        assert result.title == "Monthly"
+
+    def test_dispatch_order(self):
+        """Test that detail-type, then source, then field presence are used to classify"""
+        registry = ParserRegistry()
+        registry.register(BudgetParser)
+        registry.register(MarkerParser)
+        table = registry.dispatch_table()
+
+        assert isinstance(table.resolve({"detail-type": "Budget Threshold Exceeded"})[1], BudgetParser)
+        assert isinstance(table.resolve({"source": "aws.budgets"})[1], BudgetParser)
+        assert isinstance(table.resolve({"Marker": True})[1], MarkerParser)
+        with pytest.raises(ValueError, match="Unknown event type"):
+            table.resolve({"detail-type": "Something Else"})
+
+    def test_conflicting_registration(self):
+        """Test that two parsers cannot claim the same key"""
+        registry = ParserRegistry()
+        registry.register(BudgetParser)
+
+        class OtherBudgetParser(BudgetParser):
+            sources = ()
+
+        with pytest.raises(ValueError, match="already registered by BudgetParser"):
+            registry.register(OtherBudgetParser)
+
+    def test_dispatch_table_is_built_once(self):
+        """Test that the dispatch table and parser instances are shared across EventParsers"""
+        table = default_registry.dispatch_table()
+
+        EventParser()
+        EventParser()
+
+        assert default_registry.dispatch_table() is table
+        assert table.by_detail_type["GuardDuty Finding"][0] == EventType.GUARDDUTY
+        assert table.by_detail_type["Security Hub Findings - Imported"][0] == EventType.SECURITY_HUB
+        assert table.by_detail_type["KMS CMK Deletion"][0] == EventType.KMS_DELETION
+        assert [field for field, _, _ in table.by_field] == ["AlarmName"]
+
+    def test_lazy_parser_is_loaded_on_first_use(self):
+        """Test that a lazily declared parser is only imported when an event it matches is parsed"""
+        registry = ParserRegistry()
+        lazy = registry.register_lazy(LazyParser(
+            f"{__name__}.BudgetParser",
+            EventType.UNKNOWN,
+            detail_types=("Budget Threshold Exceeded",),
+            sources=("aws.budgets",),
+        ))
+        table = registry.dispatch_table()
+
+        assert table.resolve({"detail-type": "Budget Threshold Exceeded"})[1] is lazy
+        assert lazy._parser is None
+
+        result = EventParser(registry=registry).parse_envelope(self.get_envelope({
+            "detail-type": "Budget Threshold Exceeded",
+            "detail": {"budgetName": "Monthly"},
+        }))
+
+        assert result.title == "Monthly"
+        assert isinstance(lazy._parser, BudgetParser)
+
+        # Registering the class once imported keeps the compiled table
+        registry.register(BudgetParser)
+        assert registry.dispatch_table() is table
+
+    @pytest.mark.parametrize("declaration", PARSERS, ids=lambda declaration: declaration.__name__)
+    def test_lazy_declarations_match_parsers(self, declaration):
+        """Test that the keys declared for each built-in parser match the parser class"""
+        parser_cls = import_string(declaration.path)
+
+        assert declaration.event_type == parser_cls.event_type
+        assert declaration.detail_types == parser_cls.detail_types
+        assert declaration.sources == parser_cls.sources
+        assert declaration.fields == parser_cls.fields
+
+    def test_lazy_declaration_must_match_parser(self):
+        """Test that a parser whose keys differ from its lazy declaration is rejected once imported"""
+        registry = ParserRegistry()
+        registry.register_lazy(LazyParser(
+            f"{BudgetParser.__module__}.{BudgetParser.__qualname__}",
+            EventType.UNKNOWN,
+            detail_types=("Budget Threshold Exceeded",),
+        ))
+
+        with pytest.raises(ValueError, match="does not match the keys of its lazy declaration"):
+            registry.register(BudgetParser)
@@ -0,0 +1,178 @@
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+from notifications.events import NormalizedEvent
+from notifications.events.event_type import SEVERITY_RANKS, get_severity_rank
+from notifications.utils import codec
+
+# The key of the minimum severity applying to every event type without its own
+DEFAULT_KEY = "*"
+
+
+class EventFilter:
+    """
+    Drops unwanted events as early as possible.
+
+    Each record is first checked on cheap fields of its decoded message, before
+    it is parsed: its EventBridge source, its account, and the severity its
+    parser reads from a field or two, such as the bucketed score of a
+    GuardDuty finding. Most unwanted records are rejected there, without being
+    parsed, formatted or sent. A record carrying several events, such as the
+    findings of a Security Hub event, is only rejected when all of them are
+    below the minimum severity, the remaining events are filtered once parsed.
+
+    Records without a source or account, such as CloudWatch alarms published
+    to SNS, are not dropped by the source and account filters.
+    """
+
+    def __init__(
+        self,
+        min_severity: Optional[Dict[str, str]] = None,
+        include_sources: Optional[Iterable[str]] = None,
+        exclude_sources: Optional[Iterable[str]] = None,
+        include_accounts: Optional[Iterable[str]] = None,
+        exclude_accounts: Optional[Iterable[str]] = None,
+    ):
+        """
+        Args:
+            min_severity: The minimum severity of each event type by name, such
+                as {"SECURITY_HUB": "medium"}, with '*' applying to the others
+            include_sources: The only EventBridge sources delivered, if given
+            exclude_sources: The EventBridge sources dropped
+            include_accounts: The only accounts delivered, if given
+            exclude_accounts: The accounts dropped
+
+        Raises:
+            ValueError: If a minimum severity is not a known severity label
+        """
+        self._min_ranks: Dict[str, int] = {}
+        for event_type, severity in (min_severity or {}).items():
+            if str(severity).lower() not in SEVERITY_RANKS:
+                raise ValueError(f"Unknown minimum severity for {event_type}: {severity}")
+            self._min_ranks[event_type.upper() if event_type != DEFAULT_KEY else DEFAULT_KEY] = (
+                SEVERITY_RANKS[str(severity).lower()]
+            )
+        self._default_rank = self._min_ranks.pop(DEFAULT_KEY, 0)
+
+        self.include_sources = frozenset(include_sources) if include_sources else None
+        self.exclude_sources = frozenset(exclude_sources or ())
+        self.include_accounts = frozenset(str(account) for account in include_accounts) if include_accounts else None
+        self.exclude_accounts = frozenset(str(account) for account in exclude_accounts or ())
+
+        self.checked = 0
+        self.dropped: Dict[str, int] = {"source": 0, "account": 0, "severity": 0}
+        self._lock = threading.Lock()
+
+    def min_rank(self, event_type: Any) -> int:
+        """
+        Return the minimum severity rank of an event type.
+        """
+        return self._min_ranks.get(getattr(event_type, "name", str(event_type)), self._default_rank)
+
+    def check(self, message: Dict[str, Any], event_type: Any, parser: Any) -> Optional[str]:
+        """
+        Check a decoded message before it is parsed.
+
+        Args:
+            message: The decoded message
+            event_type: The EventType the message was classified as
+            parser: The parser selected for the message, read for its severity
+
+        Returns:
+            Optional[str]: The reason the record is dropped, 'source', 'account'
+            or 'severity', or None if it is kept
+        """
+        reason = None
+
+        source = message.get("source")
+        if source is not None and (
+            source in self.exclude_sources
+            or (self.include_sources is not None and source not in self.include_sources)
+        ):
+            reason = "source"
+
+        if reason is None:
+            account = message.get("account") or message.get("AWSAccountId")
+            if account is not None and (
+                str(account) in self.exclude_accounts
+                or (self.include_accounts is not None and str(account) not in self.include_accounts)
+            ):
+                reason = "account"
+
+        if reason is None:
+            min_rank = self.min_rank(event_type)
+            if min_rank > 0:
+                severity = parser.peek_severity(message)
+                if severity is not None and get_severity_rank(severity) < min_rank:
+                    reason = "severity"
+
+        with self._lock:
+            self.checked += 1
+            if reason is not None:
+                self.dropped[reason] += 1
+
+        return reason
+
+    def filter(self, events: List[NormalizedEvent]) -> List[NormalizedEvent]:
+        """
+        Return the parsed events at or above the minimum severity of their type, in order.
+        """
+        kept = [event for event in events if get_severity_rank(event.severity) >= self.min_rank(event.event_type)]
+
+        if len(kept) < len(events):
+            with self._lock:
+                self.dropped["severity"] += len(events) - len(kept)
+
+        return kept
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the number of records checked, and of records and events dropped
+        by each filter.
+        """
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "dropped": sum(self.dropped.values()),
+                **{f"dropped_{reason}": count for reason, count in self.dropped.items()},
+            }
+
+
+_event_filter: Optional[EventFilter] = None
+_event_filter_lock = threading.Lock()
+
+
+def get_event_filter() -> Optional[EventFilter]:
+    """
+    Return the container scoped event filter, creating it on first use.
+    Filtering is disabled unless EVENT_FILTER is set.
+
+    Environment Variables:
+        EVENT_FILTER: Optional JSON object with the min_severity,
+            include_sources, exclude_sources, include_accounts and
+            exclude_accounts arguments of EventFilter
+
+    Returns:
+        Optional[EventFilter]: The shared event filter, or None when disabled
+
+    Raises:
+        ValueError: If EVENT_FILTER is not a JSON object of known settings
+    """
+    global _event_filter
+
+    config = os.environ.get("EVENT_FILTER", "")
+    if not config:
+        return None
+
+    with _event_filter_lock:
+        if _event_filter is None:
+            settings = codec.loads(config)
+            if not isinstance(settings, dict):
+                raise ValueError("EVENT_FILTER must be a JSON object")
+            try:
+                # Unset Terraform attributes are encoded as null
+                _event_filter = EventFilter(**{key: value for key, value in settings.items() if value is not None})
+            except TypeError as e:
+                raise ValueError(f"Invalid EVENT_FILTER: {e}") from e
+
+        return _event_filter
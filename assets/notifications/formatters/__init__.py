@@ -1,5 +1,13 @@
-from .slack_formatter import SlackFormatter
-from .teams_formatter import TeamsFormatter
-from .base_formatter import BaseFormatter
+from notifications.utils.imports import lazy_attributes
+
+# Formatters are imported on first use, so a container only loads the
+# platforms it delivers to
+_ATTRIBUTES = {
+    "SlackFormatter": "slack_formatter",
+    "TeamsFormatter": "teams_formatter",
+    "BaseFormatter": "base_formatter",
+}
+
+__getattr__ = lazy_attributes(__name__, _ATTRIBUTES)
 
 __all__ = ["SlackFormatter", "TeamsFormatter", "BaseFormatter"]
@@ -1,16 +1,300 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from notifications.events import NormalizedEvent
-from notifications.events.event_type import EventType, EVENT_TYPE_MAPPING
+from notifications.events.event_type import EventType, EVENT_TYPE_MAPPING, SEVERITY_RANKS, Severity
+from notifications.utils import codec, format_key_name
+
+# Order in which severities are listed in a digest, most severe first
+SEVERITY_ORDER: Tuple[str, ...] = tuple(severity.value for severity in Severity)
+# Severity each label is grouped under, the spellings of known severities are
+# added on first use, so the labels of event data cannot grow it without bound
+_SEVERITY_GROUPS: Dict[Any, str] = {severity: severity for severity in SEVERITY_ORDER}
+# Severity each lowercased label known to the severity ranks is grouped under,
+# such as 'informational' reported by Security Hub, grouped as info
+_SEVERITY_ALIASES: Dict[str, str] = {
+    label: {SEVERITY_RANKS[severity]: severity for severity in SEVERITY_ORDER}[rank]
+    for label, rank in SEVERITY_RANKS.items()
+}
 
 
 class BaseFormatter(ABC):
     """
     Base formatter class that implements the strategy pattern for formatting different event types.
     Concrete implementations should provide platform-specific formatting methods.
+
+    Every message is kept within the size budget of its platform: detail
+    values are rendered with bounded length, and a message which still exceeds
+    the platform limits is split into continuation messages by format_messages.
     """
 
+    # The maximum serialized size in bytes of a single message
+    MAX_MESSAGE_BYTES = 32000
+    # The number of items of a list detail rendered before the rest are counted
+    MAX_LIST_ITEMS = 5
+    # The maximum length in characters of a rendered detail value
+    MAX_VALUE_LENGTH = 500
+    # Keys naming a nested dictionary, rendered in its place within a list
+    IDENTITY_KEYS: Tuple[str, ...] = ("resource_id", "id", "name", "arn")
+
     @abstractmethod
     def format(self, event: NormalizedEvent) -> Dict[str, Any]:
         """Format the message based on event type"""
         pass
+
+    def format_messages(self, event: NormalizedEvent) -> List[Dict[str, Any]]:
+        """
+        Format an event into the messages delivered for it. This is a single
+        message, unless the event exceeds the platform limits, in which case
+        continuation messages follow.
+
+        Args:
+            event (NormalizedEvent): The event to format
+
+        Returns:
+            List[Dict[str, Any]]: The messages, in order
+        """
+        return self._split_message(self.format(event))
+
+    def _split_message(self, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Split a formatted message into continuation messages when it exceeds
+        the platform limits. Platforms override this, by default the message
+        is delivered as is.
+        """
+        return [message]
+
+    @abstractmethod
+    def format_digest(self, events: List[NormalizedEvent]) -> List[Dict[str, Any]]:
+        """
+        Format several events into a digest, paginated into as many messages
+        as are required to stay within the platform payload limits.
+        """
+        pass
+
+    def _truncate(self, text: Optional[str], max_chars: int) -> str:
+        """
+        Truncate a text to at most max_chars characters, marking the cut. A
+        missing text, such as the description of an alarm without one, is empty.
+        """
+        if text is None:
+            return ""
+        if len(text) <= max_chars:
+            return text
+        return text[: max_chars - 1] + "…"
+
+    def _render_value(self, key: str, value: Any) -> str:
+        """
+        Render a detail value as text of bounded length. Lists show their first
+        MAX_LIST_ITEMS items followed by a count of the rest, such as
+        '+37 more resources', and dictionaries are rendered as compact JSON.
+
+        Args:
+            key (str): The key of the detail, naming the items of a list
+            value (Any): The value to render
+
+        Returns:
+            str: The rendered value, at most MAX_VALUE_LENGTH characters
+        """
+        if isinstance(value, (list, tuple)):
+            shown = ", ".join(self._render_item(item) for item in value[: self.MAX_LIST_ITEMS])
+            remaining = len(value) - self.MAX_LIST_ITEMS
+            if remaining > 0:
+                noun = format_key_name(key).lower()
+                # The count must survive the truncation of long items
+                suffix = f" (+{remaining} more {noun})"
+                return self._truncate(shown, self.MAX_VALUE_LENGTH - len(suffix)) + suffix
+            text = shown
+        elif isinstance(value, dict):
+            text = self._compact_json(value)
+        else:
+            text = str(value)
+
+        return self._truncate(text, self.MAX_VALUE_LENGTH)
+
+    def _render_item(self, item: Any) -> str:
+        """
+        Render an item of a list detail, naming a dictionary by its identity
+        key when it has one.
+        """
+        if isinstance(item, dict):
+            for key in self.IDENTITY_KEYS:
+                if item.get(key):
+                    return str(item[key])
+            return self._compact_json(item)
+        return str(item)
+
+    def _compact_json(self, value: Any) -> str:
+        return codec.dumps_str(value)
+
+    def _message_size(self, message: Any) -> int:
+        """
+        Return the serialized size of a message, or of a part of one, in bytes.
+        """
+        return len(codec.dumps(message))
+
+    def _get_digest_title(self, events: List[NormalizedEvent]) -> str:
+        """
+        Get the title of a digest, naming the type and number of its events.
+        """
+        event_type = events[0].event_type
+        noun = "alarms" if event_type == EventType.CLOUDWATCH else "findings"
+
+        return f"{event_type.emoji} {event_type.display_name} digest: {len(events)} {noun}"
+
+    def _get_resource_name(self, event: NormalizedEvent) -> str:
+        """
+        Get the name of the resource an event relates to, used to group the
+        events of a digest.
+
+        Args:
+            event (NormalizedEvent): The event to inspect
+
+        Returns:
+            str: The resource identifier, or a placeholder if it has none
+        """
+        details = event.details
+        resource_id = details.get("resource_id")
+        if resource_id:
+            return str(resource_id)
+
+        for resource in details.get("resources") or ():
+            # Resources are either parsed resource details, or plain ARNs
+            if isinstance(resource, dict):
+                resource_id = resource.get("resource_id")
+                if resource_id:
+                    return str(resource_id)
+            elif isinstance(resource, str) and resource:
+                return resource
+
+        return "Unspecified resource"
+
+    def _group_digest(
+        self, events: List[NormalizedEvent]
+    ) -> List[Tuple[str, List[Tuple[str, List[NormalizedEvent]]]]]:
+        """
+        Group the events of a digest by severity, most severe first, then by
+        resource. Events keep their original order within a group.
+
+        Args:
+            events (List[NormalizedEvent]): The events to group
+
+        Returns:
+            List[Tuple[str, List[Tuple[str, List[NormalizedEvent]]]]]: The
+            severity of each group, with the events of each resource
+        """
+        groups: Dict[str, Dict[str, List[NormalizedEvent]]] = {}
+        get_resource_name = self._get_resource_name
+
+        for event in events:
+            severity = _SEVERITY_GROUPS.get(event.severity)
+            if severity is None:
+                severity = self._get_severity_group(event.severity)
+
+            resources = groups.get(severity)
+            if resources is None:
+                resources = groups[severity] = {}
+
+            resource = get_resource_name(event)
+            resource_events = resources.get(resource)
+            if resource_events is None:
+                resources[resource] = [event]
+            else:
+                resource_events.append(event)
+
+        return [
+            (severity, list(groups[severity].items()))
+            for severity in SEVERITY_ORDER
+            if severity in groups
+        ]
+
+    def _get_severity_group(self, severity: Any) -> str:
+        """
+        Get the severity an unrecognized label is grouped under, remembering
+        the spellings of known severities for the following events.
+        """
+        group = _SEVERITY_ALIASES.get(str(severity or Severity.UNKNOWN.value).lower())
+        if group is None:
+            return Severity.UNKNOWN.value
+        _SEVERITY_GROUPS[severity] = group
+
+        return group
+
+    def _summarize_digest(
+        self, groups: List[Tuple[str, List[Tuple[str, List[NormalizedEvent]]]]]
+    ) -> str:
+        """
+        Summarize the number of events of each severity in a digest.
+
+        Args:
+            groups: The events of the digest, as grouped by _group_digest
+
+        Returns:
+            str: The summary, for example 'Critical: 2 · High: 5'
+        """
+        return " · ".join(
+            f"{severity.capitalize()}: {sum(len(resource_events) for _, resource_events in resources)}"
+            for severity, resources in groups
+        )
+
+    def _chunk_lines(self, lines: List[str], max_chars: int) -> List[str]:
+        """
+        Join lines into as few texts as possible, each at most max_chars long.
+        A single line longer than max_chars is truncated.
+
+        Args:
+            lines (List[str]): The lines to join
+            max_chars (int): The maximum length of each text
+
+        Returns:
+            List[str]: The joined texts
+        """
+        # Most resources have few enough events to fit in a single text
+        if sum(map(len, lines)) + len(lines) - 1 <= max_chars:
+            return ["\n".join(lines)] if lines else []
+
+        chunks: List[str] = []
+        current: List[str] = []
+        size = 0
+
+        for line in lines:
+            if len(line) > max_chars:
+                line = line[: max_chars - 1] + "…"
+            if current and size + 1 + len(line) > max_chars:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            size += len(line) + (1 if current else 0)
+            current.append(line)
+
+        if current:
+            chunks.append("\n".join(current))
+
+        return chunks
+
+    def _paginate(
+        self, items: List[Dict[str, Any]], max_items: int, max_bytes: int
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Split the content items of a digest into pages, each holding at most
+        max_items items whose serialized size is at most max_bytes.
+
+        Args:
+            items (List[Dict[str, Any]]): The content items, in display order
+            max_items (int): The maximum number of items on a page
+            max_bytes (int): The maximum serialized size of the items on a page
+
+        Returns:
+            List[List[Dict[str, Any]]]: The items of each page, at least one page
+        """
+        pages: List[List[Dict[str, Any]]] = [[]]
+        size = 0
+
+        for item in items:
+            # Including the comma separating the item from the previous one
+            item_size = self._message_size(item) + 1
+            if pages[-1] and (len(pages[-1]) >= max_items or size + item_size > max_bytes):
+                pages.append([])
+                size = 0
+            pages[-1].append(item)
+            size += item_size
+
+        return pages
@@ -1,4 +1,5 @@
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping
 from .base_formatter import BaseFormatter
 from notifications.events import NormalizedEvent
 from notifications.events.event_type import EventType
@@ -8,6 +9,38 @@ from notifications.utils import format_key_name
 class SlackFormatter(BaseFormatter):
     """Formats messages for Slack"""
 
+    # Slack rejects messages with more than 50 blocks, section texts longer
+    # than 3000 characters and header texts longer than 150 characters
+    MAX_BLOCKS = 50
+    MAX_TEXT_LENGTH = 3000
+    MAX_HEADER_LENGTH = 150
+    # Keep the blocks of each message well below the message size limit
+    MAX_MESSAGE_BYTES = 32000
+
+    # Color code of each severity level
+    SEVERITY_COLORS: Dict[str, str] = {
+        "critical": "#FF0000",
+        "high": "#FFA500",
+        "medium": "#FFFF00",
+        "low": "#00FF00",
+        "info": "#0000FF",
+    }
+    DEFAULT_COLOR = "#808080"
+
+    # Formatter method of each event type, events of any other type use
+    # _format_default. If you want to override an add a custom formatter, you
+    # can do so here by adding a new key to the formatters dictionary
+    FORMATTERS: Dict[EventType, str] = {
+        # EventType.AWS_BUDGETS: "_format_budgets",
+        # EventType.CLOUDWATCH: "_format_cloudwatch",
+        # EventType.COST_ANOMALY: "_format_cost_anomaly",
+        # EventType.SECURITY_HUB: "_format_security_hub",
+    }
+
+    # Blocks without any per event content. They are read only and copied
+    # into each message, so a caller editing one message cannot alter another
+    DIVIDER_BLOCK: Mapping[str, Any] = MappingProxyType({"type": "divider"})
+
     def _get_severity_color(self, severity: str) -> str:
         """
         Get the color code for a given severity level.
@@ -18,39 +51,123 @@ class SlackFormatter(BaseFormatter):
         Returns:
             str: Hex color code corresponding to the severity level
         """
-        severity_colors = {
-            "critical": "#FF0000",
-            "high": "#FFA500",
-            "medium": "#FFFF00",
-            "low": "#00FF00",
-            "info": "#0000FF",
-        }
-        return severity_colors.get(severity.lower(), "#808080")
+        color = self.SEVERITY_COLORS.get(severity)
+        if color is None:
+            color = self.SEVERITY_COLORS.get(severity.lower(), self.DEFAULT_COLOR)
+        return color
 
     def format(self, event: NormalizedEvent) -> Dict[str, Any]:
         """Route to specific formatter based on event type"""
-        # If you want to override an add a custom formatter, you can do so here
-        # by adding a new key to the formatters dictionary
-        formatters = {
-            # EventType.AWS_BUDGETS: self._format_budgets,
-            # EventType.CLOUDWATCH: self._format_cloudwatch,
-            # EventType.COST_ANOMALY: self._format_cost_anomaly,
-            # EventType.SECURITY_HUB: self._format_security_hub,
-        }
-
         event_type = event.event_type
-        formatter = formatters.get(event_type, self._format_default)
+        formatter = getattr(self, self.FORMATTERS.get(event_type, "_format_default"))
 
         return formatter(event, event_type)
 
+    def format_digest(self, events: List[NormalizedEvent]) -> List[Dict[str, Any]]:
+        """
+        Format several events into a digest grouped by severity and resource.
+        The digest is split across several messages when the blocks exceed the
+        Slack limits, each message repeats the header and shows its page number.
+
+        Args:
+            events (List[NormalizedEvent]): The events to include in the digest
+
+        Returns:
+            List[Dict[str, Any]]: The messages of the digest, in order
+        """
+        title = self._get_digest_title(events)
+
+        groups = self._group_digest(events)
+
+        content = []
+        for severity, resources in groups:
+            count = sum(len(resource_events) for _, resource_events in resources)
+            content.append({
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": f"*{severity.capitalize()}* ({count})"},
+            })
+            for resource, resource_events in resources:
+                lines = [f"*{resource}*"] + [f"• {event.title}" for event in resource_events]
+                for text in self._chunk_lines(lines, self.MAX_TEXT_LENGTH):
+                    content.append({
+                        "type": "section",
+                        "text": {"type": "mrkdwn", "text": text},
+                    })
+
+        # Every page carries a header, a summary and a page footer
+        pages = self._paginate(content, self.MAX_BLOCKS - 3, self.MAX_MESSAGE_BYTES)
+        summary = self._summarize_digest(groups)
+
+        return [
+            {
+                "blocks": [
+                    {
+                        "type": "header",
+                        "text": {"type": "plain_text", "text": title, "emoji": True},
+                    },
+                    {
+                        "type": "context",
+                        "elements": [{"type": "mrkdwn", "text": f"*Source:* {events[0].source}\n{summary}"}],
+                    },
+                    *page,
+                    {
+                        "type": "context",
+                        "elements": [{"type": "mrkdwn", "text": f"Page {number} of {len(pages)}"}],
+                    },
+                ]
+            }
+            for number, page in enumerate(pages, start=1)
+        ]
+
+    def _split_message(self, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Split a message exceeding the block or size limits into continuation
+        messages, each repeating the header marked as continued.
+        """
+        blocks = message.get("blocks")
+        if not blocks or (
+            len(blocks) <= self.MAX_BLOCKS and self._message_size(message) <= self.MAX_MESSAGE_BYTES
+        ):
+            return [message]
+
+        header = blocks[0] if blocks[0].get("type") == "header" else None
+        content = blocks[1:] if header is not None else blocks
+        # The budget left once the envelope and header of each page are counted
+        budget = self.MAX_MESSAGE_BYTES - self._message_size({**message, "blocks": [header] if header else []})
+        pages = self._paginate(content, self.MAX_BLOCKS - 1, budget)
+
+        messages = []
+        for number, page in enumerate(pages, start=1):
+            if header is not None:
+                page = [header if number == 1 else self._continued_header(header, number, len(pages)), *page]
+            messages.append({**message, "blocks": page})
+
+        return messages
+
+    def _continued_header(self, header: Dict[str, Any], number: int, total: int) -> Dict[str, Any]:
+        """Mark the header block of a continuation message with its number"""
+        suffix = f" (continued {number}/{total})"
+        text = self._truncate(header["text"]["text"], self.MAX_HEADER_LENGTH - len(suffix)) + suffix
+        return {**header, "text": {**header["text"], "text": text}}
+
     def _format_default(
         self, event: NormalizedEvent, event_type: EventType
     ) -> Dict[str, Any]:
         """Default formatter for unknown event types"""
-        # Format each detail key-value pair as a bullet point
-        details_text = "\n".join(
-            [f"• {format_key_name(k)}: {v}" for k, v in event.details.items()]
-        )
+        details = event.details
+        # Format each detail key-value pair as a bullet point, split across
+        # as many sections as the section text limit requires
+        details_lines = ["*Details:*"] + [
+            f"• {format_key_name(k)}: {self._render_value(k, v)}" for k, v in details.items()
+        ]
+
+        context_text = f"*Source:* {event.source}\n*Severity:* {event.severity}\n"
+        state = details.get("state")
+        if state:
+            context_text += f"*State:* {state}\n"
+        threshold = details.get("threshold")
+        if threshold:
+            context_text += f"*Threshold:* {threshold}\n"
 
         return {
             "blocks": [
@@ -58,46 +175,26 @@ class SlackFormatter(BaseFormatter):
                     "type": "header",
                     "text": {
                         "type": "plain_text",
-                        "text": f"{event_type.emoji} {event.title}",
+                        "text": self._truncate(f"{event_type.emoji} {event.title}", self.MAX_HEADER_LENGTH),
                         "emoji": True,
                     },
                 },
                 {
                     "type": "context",
-                    "elements": [
-                        {
-                            "type": "mrkdwn",
-                            "text": (
-                                f"*Source:* {event.source}\n"
-                                f"*Severity:* {event.severity}\n"
-                                + (
-                                    f"*State:* {event.details.get('state')}\n"
-                                    if event.details.get("state")
-                                    else ""
-                                )
-                                + (
-                                    f"*Threshold:* {event.details.get('threshold')}\n"
-                                    if event.details.get("threshold")
-                                    else ""
-                                )
-                            ),
-                        }
-                    ],
+                    "elements": [{"type": "mrkdwn", "text": context_text}],
                 },
                 {
                     "type": "section",
                     "text": {
                         "type": "mrkdwn",
-                        "text": f"*Description:*\n{event.description}",
+                        "text": self._truncate(f"*Description:*\n{event.description}", self.MAX_TEXT_LENGTH),
                     },
                 },
-                {
-                    "type": "divider",
-                },
-                {
-                    "type": "section",
-                    "text": {"type": "mrkdwn", "text": f"*Details:*\n{details_text}"},
-                },
+                dict(self.DIVIDER_BLOCK),
+                *(
+                    {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+                    for text in self._chunk_lines(details_lines, self.MAX_TEXT_LENGTH)
+                ),
                 {
                     "type": "context",
                     "elements": [
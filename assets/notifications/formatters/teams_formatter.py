@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from .base_formatter import BaseFormatter
 from notifications.events.event_type import EventType
 from notifications.events import NormalizedEvent
@@ -8,56 +8,160 @@ from notifications.utils import format_key_name
 class TeamsFormatter(BaseFormatter):
     """Formats messages for Microsoft Teams"""
 
+    # Teams rejects messages larger than about 28KB, keep the body of each
+    # message well below it to leave room for the card envelope
+    MAX_MESSAGE_BYTES = 24000
+    MAX_TEXT_LENGTH = 3000
+
+    # Formatter method of each event type, events of any other type use _format_default
+    FORMATTERS: Dict[EventType, str] = {
+        # EventType.SECURITY_HUB: "_format_security_hub",
+        # EventType.CLOUDWATCH: "_format_cloudwatch",
+        # EventType.COST_ANOMALY: "_format_cost_anomaly",
+        # EventType.CLOUDTRAIL: "_format_cloudtrail",
+        # EventType.AWS_BUDGETS: "_format_budgets",
+    }
+
+    # The static envelope of every Adaptive Card
+    CARD_CONTENT_TYPE = "application/vnd.microsoft.card.adaptive"
+    CARD_SCHEMA = "http://adaptivecards.io/schemas/adaptive-card.json"
+    CARD_VERSION = "1.2"
+
     def format(self, event: NormalizedEvent) -> Dict[str, Any]:
         """Route to specific formatter based on event type"""
-        formatters = {
-            # EventType.SECURITY_HUB: self._format_security_hub,
-            # EventType.CLOUDWATCH: self._format_cloudwatch,
-            # EventType.COST_ANOMALY: self._format_cost_anomaly,
-            # EventType.CLOUDTRAIL: self._format_cloudtrail,
-            # EventType.AWS_BUDGETS: self._format_budgets,
-        }
-
         event_type = event.event_type
-        formatter = formatters.get(event_type, self._format_default)
+        formatter = getattr(self, self.FORMATTERS.get(event_type, "_format_default"))
 
         return formatter(event, event_type)
 
-    def _format_default(
-        self, event: NormalizedEvent, event_type: EventType
-    ) -> Dict[str, Any]:
-        """Default formatter for unknown event types"""
-        # Convert details into list of maps with formatted names
-        facts = [
-            {"name": format_key_name(k), "value": str(v)}
-            for k, v in event.details.items()
-        ]
-
+    def _card(self, body: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Wrap the body of an Adaptive Card in a Teams message"""
         return {
             "type": "message",
             "attachments": [
                 {
-                    "contentType": "application/vnd.microsoft.card.adaptive",
+                    "contentType": self.CARD_CONTENT_TYPE,
                     "content": {
                         "type": "AdaptiveCard",
-                        "body": [
-                            {
-                                "type": "TextBlock",
-                                "size": "Large",
-                                "weight": "Bolder",
-                                "text": f"{event_type.emoji} {event.title}",
-                                "wrap": True,
-                            },
-                            {
-                                "type": "TextBlock",
-                                "text": event.description,
-                                "wrap": True,
-                            },
-                            {"type": "FactSet", "facts": facts},
-                        ],
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "version": "1.2",
+                        "body": body,
+                        "$schema": self.CARD_SCHEMA,
+                        "version": self.CARD_VERSION,
                     },
                 }
             ],
         }
+
+    def format_digest(self, events: List[NormalizedEvent]) -> List[Dict[str, Any]]:
+        """
+        Format several events into a digest grouped by severity and resource.
+        The digest is split across several cards when the body exceeds the
+        Teams message size limit, each card repeats the header and shows its
+        page number.
+
+        Args:
+            events (List[NormalizedEvent]): The events to include in the digest
+
+        Returns:
+            List[Dict[str, Any]]: The messages of the digest, in order
+        """
+        title = self._get_digest_title(events)
+        groups = self._group_digest(events)
+
+        content = []
+        for severity, resources in groups:
+            count = sum(len(resource_events) for _, resource_events in resources)
+            content.append({
+                "type": "TextBlock",
+                "weight": "Bolder",
+                "text": f"{severity.capitalize()} ({count})",
+                "wrap": True,
+            })
+            for resource, resource_events in resources:
+                lines = [f"**{resource}**"] + [f"- {event.title}" for event in resource_events]
+                for text in self._chunk_lines(lines, self.MAX_TEXT_LENGTH):
+                    content.append({"type": "TextBlock", "text": text, "wrap": True})
+
+        pages = self._paginate(content, len(content) or 1, self.MAX_MESSAGE_BYTES)
+        summary = self._summarize_digest(groups)
+
+        return [
+            self._card([
+                {
+                    "type": "TextBlock",
+                    "size": "Large",
+                    "weight": "Bolder",
+                    "text": title,
+                    "wrap": True,
+                },
+                {
+                    "type": "TextBlock",
+                    "text": f"Source: {events[0].source} · {summary}",
+                    "isSubtle": True,
+                    "wrap": True,
+                },
+                *page,
+                {
+                    "type": "TextBlock",
+                    "text": f"Page {number} of {len(pages)}",
+                    "isSubtle": True,
+                    "wrap": True,
+                },
+            ])
+            for number, page in enumerate(pages, start=1)
+        ]
+
+    def _split_message(self, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Split a card exceeding the message size limit into continuation cards,
+        each repeating the title marked as continued.
+        """
+        try:
+            body = message["attachments"][0]["content"]["body"]
+        except (KeyError, IndexError, TypeError):
+            return [message]
+        if not body or self._message_size(body) <= self.MAX_MESSAGE_BYTES:
+            return [message]
+
+        title, content = body[0], body[1:]
+        pages = self._paginate(content, len(content) or 1, self.MAX_MESSAGE_BYTES - self._message_size([title]))
+
+        return [
+            self._card([
+                title if number == 1 else {**title, "text": f"{title['text']} (continued {number}/{len(pages)})"},
+                *page,
+            ])
+            for number, page in enumerate(pages, start=1)
+        ]
+
+    def _format_default(
+        self, event: NormalizedEvent, event_type: EventType
+    ) -> Dict[str, Any]:
+        """Default formatter for unknown event types"""
+        # Convert details into list of maps with formatted names, split across
+        # as many fact sets as the text limit requires
+        fact_sets: List[List[Dict[str, str]]] = [[]]
+        size = 0
+        for k, v in event.details.items():
+            fact = {"name": format_key_name(k), "value": self._render_value(k, v)}
+            fact_size = len(fact["name"]) + len(fact["value"])
+            if fact_sets[-1] and size + fact_size > self.MAX_TEXT_LENGTH:
+                fact_sets.append([])
+                size = 0
+            fact_sets[-1].append(fact)
+            size += fact_size
+
+        return self._card([
+            {
+                "type": "TextBlock",
+                "size": "Large",
+                "weight": "Bolder",
+                "text": self._truncate(f"{event_type.emoji} {event.title}", self.MAX_TEXT_LENGTH),
+                "wrap": True,
+            },
+            {
+                "type": "TextBlock",
+                "text": self._truncate(event.description, self.MAX_TEXT_LENGTH),
+                "wrap": True,
+            },
+            *({"type": "FactSet", "facts": facts} for facts in fact_sets),
+        ])
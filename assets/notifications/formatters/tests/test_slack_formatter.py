@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from notifications.events import NormalizedEvent
 from notifications.events.event_type import EventType
 from notifications.formatters.slack_formatter import SlackFormatter
+from notifications.utils import codec
 
 
 class TestSlackFormatter:
@@ -42,4 +43,164 @@ class TestSlackFormatter:
         # Check the basic structure
         assert isinstance(result, dict)
         assert "blocks" in result
-        assert len(result["blocks"]) == 6
\ No newline at end of file
+        assert len(result["blocks"]) == 6
+
+    def test_format_does_not_share_blocks_between_messages(self):
+        """Test that editing one message leaves the next message untouched"""
+        first = self.formatter.format(self.sample_event)
+        for block in first["blocks"]:
+            block["edited"] = True
+
+        second = self.formatter.format(self.sample_event)
+        assert not any("edited" in block for block in second["blocks"])
+        assert dict(SlackFormatter.DIVIDER_BLOCK) == {"type": "divider"}
+
+    def get_findings(self, count, severity="high", resources=1):
+        """Helper to create Security Hub findings spread across resources"""
+        return [
+            NormalizedEvent(
+                title=f"Finding {i}",
+                description="Security issue detected",
+                event_type=EventType.SECURITY_HUB,
+                severity=severity,
+                region="us-east-1",
+                source="SecurityHub",
+                timestamp=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+                details={"resources": [{"resource_id": f"bucket-{i % resources}"}]},
+                raw_event={},
+            )
+            for i in range(count)
+        ]
+
+    def test_format_digest(self):
+        """Test that a digest groups findings by severity, then by resource"""
+        events = self.get_findings(2, "low") + self.get_findings(3, "critical", resources=2)
+
+        pages = self.formatter.format_digest(events)
+
+        assert len(pages) == 1
+        blocks = pages[0]["blocks"]
+        assert blocks[0]["text"]["text"] == "🔒 Security Alert digest: 5 findings"
+        assert "Critical: 3 · Low: 2" in blocks[1]["elements"][0]["text"]
+        texts = [block["text"]["text"] for block in blocks[2:-1]]
+        assert texts == [
+            "*Critical* (3)",
+            "*bucket-0*\n• Finding 0\n• Finding 2",
+            "*bucket-1*\n• Finding 1",
+            "*Low* (2)",
+            "*bucket-0*\n• Finding 0\n• Finding 1",
+        ]
+        assert blocks[-1]["elements"][0]["text"] == "Page 1 of 1"
+
+    def test_digest_severity_labels_are_not_cached_unbounded(self):
+        """Test that only the spellings of known severities are remembered when grouping a digest"""
+        from notifications.formatters import base_formatter
+
+        events = self.get_findings(1, "HIGH") + self.get_findings(1, "Label-1") + self.get_findings(1, "Label-2")
+
+        groups = self.formatter._group_digest(events)
+
+        assert [severity for severity, _ in groups] == ["high", "unknown"]
+        assert base_formatter._SEVERITY_GROUPS["HIGH"] == "high"
+        assert "Label-1" not in base_formatter._SEVERITY_GROUPS
+        assert "Label-2" not in base_formatter._SEVERITY_GROUPS
+
+    def test_format_digest_groups_informational_findings_as_info(self):
+        """Test that Security Hub INFORMATIONAL findings are grouped and summarized as info"""
+        events = self.get_findings(1, "high") + self.get_findings(2, "INFORMATIONAL")
+
+        pages = self.formatter.format_digest(events)
+
+        assert "High: 1 · Info: 2" in pages[0]["blocks"][1]["elements"][0]["text"]
+
+    def test_format_digest_is_paginated(self):
+        """Test that a digest exceeding the Slack block limit is split across messages"""
+        events = self.get_findings(100, resources=100)
+
+        pages = self.formatter.format_digest(events)
+
+        assert len(pages) == 3
+        assert all(len(page["blocks"]) <= SlackFormatter.MAX_BLOCKS for page in pages)
+        assert pages[-1]["blocks"][-1]["elements"][0]["text"] == "Page 3 of 3"
+        titles = [
+            line
+            for page in pages
+            for block in page["blocks"][2:-1]
+            for line in block["text"]["text"].split("\n")
+            if line.startswith("•")
+        ]
+        assert len(titles) == 100
+
+    def test_format_digest_splits_long_sections(self):
+        """Test that the findings of a resource are split when they exceed the section text limit"""
+        events = self.get_findings(400)
+
+        blocks = self.formatter.format_digest(events)[0]["blocks"]
+
+        sections = [block["text"]["text"] for block in blocks[3:-1]]
+        assert len(sections) > 1
+        assert all(len(text) <= SlackFormatter.MAX_TEXT_LENGTH for text in sections)
+
+    def test_format_dispatches_on_event_type(self):
+        """Test that formatters registered in the class dispatch table are used for their event type"""
+
+        class CustomFormatter(SlackFormatter):
+            FORMATTERS = {EventType.CLOUDWATCH: "_format_cloudwatch"}
+
+            def _format_cloudwatch(self, event, event_type):
+                return {"text": event.title}
+
+        formatter = CustomFormatter()
+
+        assert formatter.format(self.sample_event) == {"text": "Test Alert"}
+        self.sample_event.event_type = EventType.GUARDDUTY
+        assert len(formatter.format(self.sample_event)["blocks"]) == 6
+
+    def test_format_summarizes_long_lists(self):
+        """Test that list details show their first items and count the rest"""
+        self.sample_event.details = {
+            "resources": [{"resource_id": f"i-{i:04d}"} for i in range(42)],
+        }
+
+        blocks = self.formatter.format(self.sample_event)["blocks"]
+
+        details = blocks[4]["text"]["text"]
+        assert "• Resources: i-0000, i-0001, i-0002, i-0003, i-0004 (+37 more resources)" in details
+
+    def test_format_truncates_long_texts(self):
+        """Test that the header and description are cut to the Slack text limits"""
+        self.sample_event.title = "T" * 500
+        self.sample_event.description = "D" * 10000
+
+        blocks = self.formatter.format(self.sample_event)["blocks"]
+
+        assert len(blocks[0]["text"]["text"]) == SlackFormatter.MAX_HEADER_LENGTH
+        assert len(blocks[2]["text"]["text"]) == SlackFormatter.MAX_TEXT_LENGTH
+        assert blocks[2]["text"]["text"].endswith("…")
+
+    def test_format_messages_splits_oversized_events(self):
+        """Test that an event exceeding the Slack limits is split into continuation messages"""
+        self.sample_event.details = {f"field_{i}": "v" * 1000 for i in range(300)}
+
+        messages = self.formatter.format_messages(self.sample_event)
+
+        assert len(messages) > 1
+        for number, message in enumerate(messages, start=1):
+            assert len(message["blocks"]) <= SlackFormatter.MAX_BLOCKS
+            assert len(codec.dumps(message)) <= SlackFormatter.MAX_MESSAGE_BYTES
+            header = message["blocks"][0]["text"]["text"]
+            if number > 1:
+                assert header.endswith(f"(continued {number}/{len(messages)})")
+        lines = [
+            line
+            for message in messages
+            for block in message["blocks"]
+            if block["type"] == "section"
+            for line in block["text"]["text"].split("\n")
+            if line.startswith("• Field")
+        ]
+        assert len(lines) == 300
+
+    def test_format_messages_keeps_small_events_whole(self):
+        """Test that an event within the Slack limits is delivered as a single message"""
+        assert self.formatter.format_messages(self.sample_event) == [self.formatter.format(self.sample_event)]
@@ -1,3 +1,4 @@
+import json
 import pytest
 from datetime import datetime, timezone
 from notifications.events import NormalizedEvent
@@ -51,6 +52,14 @@ class TestTeamsFormatter:
         assert body[2]["facts"][3]["name"] == "Current Value"
         assert body[2]["facts"][3]["value"] == "150"
 
+    def test_format_without_description(self):
+        """Test formatting an event without a description, such as an alarm without an AlarmDescription"""
+        self.sample_event.description = None
+
+        result = self.formatter.format(self.sample_event)
+
+        assert result["attachments"][0]["content"]["body"][1]["text"] == ""
+
     def test_format_with_empty_details(self):
         """Test formatting when details are empty"""
         result = self.formatter.format(self.sample_event)
@@ -74,3 +83,63 @@ class TestTeamsFormatter:
         assert facts[2]["value"] == "CPU Usage"
         assert facts[3]["name"] == "Current Value"
         assert facts[3]["value"] == "150"
+
+    def test_format_digest_is_paginated(self):
+        """Test that a digest exceeding the Teams size limit is split across cards"""
+        events = [
+            NormalizedEvent(
+                title=f"Finding {i} " + "x" * 200,
+                description="Security issue detected",
+                event_type=EventType.SECURITY_HUB,
+                severity="high" if i % 2 else "medium",
+                region="us-east-1",
+                source="SecurityHub",
+                timestamp=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+                details={"resources": [{"resource_id": f"bucket-{i}"}]},
+                raw_event={},
+            )
+            for i in range(200)
+        ]
+
+        pages = self.formatter.format_digest(events)
+
+        assert len(pages) > 1
+        for number, page in enumerate(pages, start=1):
+            body = page["attachments"][0]["content"]["body"]
+            assert body[0]["text"] == "🔒 Security Alert digest: 200 findings"
+            assert body[-1]["text"] == f"Page {number} of {len(pages)}"
+            assert len(json.dumps(page).encode("utf-8")) < 28000
+
+        first_body = pages[0]["attachments"][0]["content"]["body"]
+        assert "High: 100 · Medium: 100" in first_body[1]["text"]
+        assert first_body[2]["text"] == "High (100)"
+
+    def test_format_bounds_fact_values(self):
+        """Test that long fact values are summarized and split across fact sets"""
+        self.sample_event.details = {
+            "resources": [f"arn:aws:s3:::bucket-{i}" for i in range(12)],
+            "policy": {"Statement": [{"Effect": "Allow", "Resource": "*" * 2000}]},
+            **{f"field_{i}": "v" * 400 for i in range(20)},
+        }
+
+        body = self.formatter.format(self.sample_event)["attachments"][0]["content"]["body"]
+
+        fact_sets = [block["facts"] for block in body if block["type"] == "FactSet"]
+        assert len(fact_sets) > 1
+        assert fact_sets[0][0]["value"].endswith("(+7 more resources)")
+        for facts in fact_sets:
+            assert all(len(fact["value"]) <= TeamsFormatter.MAX_VALUE_LENGTH for fact in facts)
+        assert sum(len(facts) for facts in fact_sets) == 22
+
+    def test_format_messages_splits_oversized_events(self):
+        """Test that a card exceeding the Teams size limit is split into continuation cards"""
+        self.sample_event.details = {f"field_{i}": "v" * 450 for i in range(200)}
+
+        messages = self.formatter.format_messages(self.sample_event)
+
+        assert len(messages) > 1
+        for number, message in enumerate(messages, start=1):
+            assert len(json.dumps(message).encode("utf-8")) < 28000
+            title = message["attachments"][0]["content"]["body"][0]["text"]
+            if number > 1:
+                assert title.endswith(f"(continued {number}/{len(messages)})")
@@ -1,63 +1,496 @@
 import os
-import json
-import boto3
-from typing import Dict, Any
-from notifications.events import EventParser
-from notifications.formatters import SlackFormatter, TeamsFormatter
-from notifications.senders import SlackSender, TeamsSender
-from notifications.utils.secrets import get_secret
-from notifications.utils.logging import logger
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from notifications.coalescing import Coalescer, get_coalescer
+from notifications.dedup import Deduplicator, get_deduplicator
+from notifications.destinations import Destination, PLATFORMS, create_formatter
+from notifications.filtering import EventFilter, get_event_filter
+from notifications.events import EventParser, NormalizedEvent
+from notifications.events.envelope import get_message_id, is_sqs_record
+from notifications.events.event_type import Severity
+from notifications.routing import Router, get_router
+from notifications.senders import (
+    DeliveryResult,
+    SpillQueue,
+    get_circuit_breaker,
+    get_rate_limiter,
+    get_retry_policy,
+    get_spill_queue,
+)
+from notifications.utils import codec
+from notifications.utils.secrets import ROTATION_STATUS_CODES
+from notifications.utils.logging import logger, log_payload
+from notifications.utils.metrics import StageTimer
 
 
 def get_notification_config():
     """
     Get and validate notification configuration from environment variables.
 
-    This function retrieves the notification platform and corresponding
-    webhook URLs from environment variables. It validates that the platform
-    is supported (either 'slack' or 'teams') and that the required webhook URL
-    for the selected platform is present.
+    This function retrieves the destinations notifications are delivered to.
+    Multiple destinations are configured as a JSON list in DESTINATIONS, else a
+    single destination is built from the notification platform and the
+    corresponding webhook URL. It validates that each platform is supported
+    (either 'slack' or 'teams') and that each destination has a webhook.
 
     Environment Variables:
-        NOTIFICATION_PLATFORM: The platform to use ('slack' or 'teams)
-        SLACK_WEBHOOK_URL: Required webhook URL if platform is 'slack'
-        SLACK_WEBHOOK_ARN: Optional ARN for the Slack webhook secret
-        TEAMS_WEBHOOK_URL: Required webhook URL if platform is 'teams'
-        TEAMS_WEBHOOK_ARN: Optional ARN for the Teams webhook secret
+        DESTINATIONS: Optional JSON list of destinations, each with a name, platform
+            and either a webhook_url or a webhook_arn, and optionally the name of
+            a fallback destination on the same platform
+        NOTIFICATION_PLATFORM: The platform to use ('slack' or 'teams), when
+            DESTINATIONS is not set
+        WEBHOOK_URL: The webhook URL, when DESTINATIONS is not set
+        WEBHOOK_ARN: Optional ARN for the webhook secret, when DESTINATIONS is not set
+        DELIVERY_CONCURRENCY: Optional maximum number of concurrent webhook sends
 
     Returns:
         dict: Configuration dictionary containing:
-            - platform: str - The selected notification platform
-            - webhook_url: str - The webhook URL
-            - webhook_arn: str - The webhook ARN
+            - destinations: List[dict] - The name, platform, webhook_url,
+              webhook_arn and fallback of each destination
+            - delivery_concurrency: int - The maximum number of concurrent sends
 
     Raises:
-        ValueError: If the platform is unsupported or if the required webhook
+        ValueError: If a platform is unsupported or if a required webhook
         URL is missing
     """
-    platform = os.environ.get("NOTIFICATION_PLATFORM", "slack").lower()
+    destinations_config = os.environ.get("DESTINATIONS", "")
 
-    if platform not in ["slack", "teams"]:
-        raise ValueError(f"Unsupported notification platform: {platform}")
+    if destinations_config:
+        destinations = codec.loads(destinations_config)
+        if not isinstance(destinations, list) or len(destinations) <= 0:
+            raise ValueError("DESTINATIONS must be a non-empty JSON list")
+    else:
+        destinations = [
+            {
+                "name": "default",
+                "platform": os.environ.get("NOTIFICATION_PLATFORM", "slack"),
+                "webhook_url": os.environ.get("WEBHOOK_URL", ""),
+                "webhook_arn": os.environ.get("WEBHOOK_ARN", ""),
+            }
+        ]
+
+    names = set()
+    for index, destination in enumerate(destinations):
+        destination.setdefault("name", f"destination-{index}")
+        destination["platform"] = (destination.get("platform") or "").lower()
+        destination["webhook_url"] = destination.get("webhook_url") or ""
+        destination["webhook_arn"] = destination.get("webhook_arn") or ""
+        destination["fallback"] = destination.get("fallback") or ""
 
-    # Validate webhook URL based on platform
-    webhook_url = os.environ.get("WEBHOOK_URL", "")
-    webhook_arn = os.environ.get("WEBHOOK_ARN", "")
+        if destination["platform"] not in PLATFORMS:
+            raise ValueError(f"Unsupported notification platform: {destination['platform']}")
 
-    if not webhook_url and not webhook_arn:
-        raise ValueError("Missing WEBHOOK_URL or WEBHOOK_ARN environment variable")
+        # Validate webhook URL based on platform
+        if not destination["webhook_url"] and not destination["webhook_arn"]:
+            raise ValueError("Missing WEBHOOK_URL or WEBHOOK_ARN environment variable")
+
+        if destination["name"] in names:
+            raise ValueError(f"Duplicate destination name: {destination['name']}")
+        names.add(destination["name"])
+
+    # A fallback is sent the message formatted for the destination it replaces
+    platforms = {destination["name"]: destination["platform"] for destination in destinations}
+    for destination in destinations:
+        fallback = destination["fallback"]
+        if fallback and (fallback == destination["name"] or platforms.get(fallback) != destination["platform"]):
+            raise ValueError(
+                f"Fallback of destination {destination['name']} must be another {destination['platform']} destination"
+            )
+
+    delivery_concurrency = int(os.environ.get("DELIVERY_CONCURRENCY", "8"))
+    if delivery_concurrency < 1:
+        raise ValueError("DELIVERY_CONCURRENCY must be at least 1")
 
     return {
-        "platform": platform,
-        "webhook_url": webhook_url,
-        "webhook_arn": webhook_arn,
+        "destinations": destinations,
+        "delivery_concurrency": delivery_concurrency,
+    }
+
+
+def process_records(
+    records: List[Dict[str, Any]],
+    parser: EventParser,
+    destinations: List[Destination],
+    max_workers: int = 8,
+    deduplicator: Optional[Deduplicator] = None,
+    coalescer: Optional[Coalescer] = None,
+    metrics: Optional[StageTimer] = None,
+    event_filter: Optional[EventFilter] = None,
+    router: Optional[Router] = None,
+    spill_queue: Optional[SpillQueue] = None,
+    flush_coalesced: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Parse, format and deliver every record of an invocation to every destination.
+
+    Each record is parsed exactly once and formatted once per platform, the
+    formatted message is shared by all the destinations on that platform. A
+    record carrying several events is formatted as a digest, which may span
+    several messages, as may a single event exceeding the platform limits.
+    The sends are then made concurrently on a bounded thread
+    pool. A failure in one record or destination never prevents the remaining
+    sends.
+
+    A message refused because the circuit of its webhook is open is diverted
+    to the fallback of the destination. Else, unless its source redelivers it,
+    it is queued in the spill queue when given, reported as failed, and
+    replayed once the destination accepts a message again.
+
+    When a router is given, each event is only delivered to the destinations
+    its routing rules select, and muted events are dropped. The events of a
+    record routed to different destinations are formatted separately.
+
+    When an event filter is given, records are checked as soon as they are
+    classified, and unwanted records are dropped before they are parsed, the
+    events of the remaining records are filtered once parsed.
+
+    When a deduplicator is given, events already delivered unchanged are
+    skipped, and delivered events are remembered. When a coalescer is given,
+    bursts of alarm transitions are absorbed. When flush_coalesced is also set,
+    as by the scheduled flush, the summaries of the closed coalescing windows
+    are delivered as an additional result, the windows are released to be
+    flushed again when the summaries are not delivered. When a stage
+    timer is given, the time spent classifying, parsing, formatting, fetching
+    webhook secrets and sending is added to it.
+
+    Args:
+        records: The records delivered in the invocation
+        parser: The parser used to normalize each record
+        destinations: The destinations to deliver each record to
+        max_workers: The maximum number of concurrent sends
+        deduplicator: The optional deduplicator used to skip unchanged events
+        coalescer: The optional coalescer used to absorb bursts of alarms
+        metrics: The optional stage timer the time of each stage is added to
+        event_filter: The optional filter dropping unwanted records and events
+        router: The optional router selecting the destinations of each event
+        spill_queue: The optional queue holding the messages of open circuits
+        flush_coalesced: Whether to deliver the summaries of the closed coalescing windows
+
+    Returns:
+        List[Dict[str, Any]]: A result summary for each record, in record order,
+        followed by the result of the coalesced summaries if any
+    """
+    metrics = metrics or StageTimer()
+    results = []
+    # The events of a record delivered to the same destinations, with their messages
+    batches: List[Dict[str, Any]] = []
+    formatters = {
+        destination.platform: create_formatter(destination.platform)
+        for destination in destinations
     }
+    destination_names = tuple(destination.name for destination in destinations)
+    destinations_by_name = {destination.name: destination for destination in destinations}
+
+    def prepare(index: int, normalized_events: List[NormalizedEvent]) -> None:
+        event_type = normalized_events[0].event_type
+        results[index]["event_type"] = getattr(event_type, "name", str(event_type))
+
+        for normalized_event in normalized_events:
+            log_payload(
+                logging.DEBUG,
+                "Normalized event created",
+                "normalized_event",
+                normalized_event.to_dict,
+                extra={"action": "process_records", "index": index},
+            )
+
+        if router is None:
+            routes = {destination_names: normalized_events}
+        else:
+            routes = {}
+            for normalized_event in normalized_events:
+                routes.setdefault(router.route(normalized_event, destination_names), []).append(normalized_event)
+            muted = routes.pop((), [])
+            if muted:
+                results[index]["muted"] = len(muted)
+            if not routes:
+                results[index]["success"] = True
+                return
+
+        for names, routed_events in routes.items():
+            platforms = {destinations_by_name[name].platform for name in names}
+
+            # A record carrying several events, such as the findings of a
+            # Security Hub event, is delivered as a single digest
+            with metrics.time("format"):
+                if len(routed_events) == 1:
+                    messages = {
+                        platform: formatters[platform].format_messages(routed_events[0])
+                        for platform in platforms
+                    }
+                else:
+                    messages = {
+                        platform: formatters[platform].format_digest(routed_events)
+                        for platform in platforms
+                    }
+
+            log_payload(
+                logging.DEBUG,
+                "Formatted message",
+                "formatted_message",
+                messages,
+                extra={"action": "process_records", "index": index},
+            )
+
+            batches.append({
+                "index": index,
+                "events": routed_events,
+                "destinations": [destinations_by_name[name] for name in names],
+                "messages": messages,
+            })
+
+    for index, record in enumerate(records):
+        result = {
+            "index": index,
+            "message_id": get_message_id(record),
+            "success": False,
+        }
+        results.append(result)
+
+        try:
+            with metrics.time("classify"):
+                envelope, record_parser = parser.classify(record)
+            if event_filter is not None:
+                with metrics.time("filter"):
+                    reason = event_filter.check(envelope.message, record_parser.event_type, record_parser)
+                if reason is not None:
+                    # Dropped records are acknowledged, they are never retried
+                    result["success"] = True
+                    result["filtered"] = reason
+                    continue
+
+            with metrics.time("parse"):
+                normalized_events = record_parser.parse_all(envelope)
+            result["events"] = len(normalized_events)
+            if event_filter is not None:
+                kept_events = event_filter.filter(normalized_events)
+                result["filtered_events"] = len(normalized_events) - len(kept_events)
+                normalized_events = kept_events
+            if deduplicator is not None:
+                fresh_events = deduplicator.filter(normalized_events)
+                result["duplicates"] = len(normalized_events) - len(fresh_events)
+                normalized_events = fresh_events
+
+            if coalescer is not None:
+                pending_events = coalescer.coalesce(normalized_events)
+                result["coalesced"] = len(normalized_events) - len(pending_events)
+                normalized_events = pending_events
+
+            if not normalized_events:
+                result["success"] = True
+                continue
+
+            prepare(index, normalized_events)
+        except Exception as e:
+            result["error"] = str(e)
+            logger.error("Error processing record", extra={
+                "action": "process_records",
+                "index": index,
+                "error": str(e),
+            }, exc_info=True)
+
+    # Flushing claims each closed window in the state store, so it is left to
+    # the scheduled flush rather than made on every invocation
+    if coalescer is not None and flush_coalesced:
+        index = len(results)
+        results.append({"index": index, "message_id": None, "success": False, "summary": True})
+        try:
+            summaries = coalescer.flush()
+            results[index]["events"] = len(summaries)
+            if summaries:
+                prepare(index, summaries)
+            else:
+                results.pop()
+        except Exception as e:
+            results[index]["error"] = str(e)
+            logger.error("Error flushing coalesced alarms", extra={
+                "action": "process_records",
+                "error": str(e),
+            }, exc_info=True)
+            coalescer.release()
+
+    if not batches:
+        return results
+
+    def send(destination: Destination, message: Dict[str, Any], priority: bool) -> DeliveryResult:
+        # The webhook URL is resolved from its secret on the first send
+        with metrics.time("secret"):
+            sender = destination.sender()
+        with metrics.time("send"):
+            delivery = sender.send(message, priority=priority)
+        if not delivery.success and delivery.status in ROTATION_STATUS_CODES:
+            with metrics.time("secret"):
+                rotated_sender = destination.rotated_sender()
+            if rotated_sender is not None:
+                with metrics.time("send"):
+                    delivery = rotated_sender.send(message, priority=priority)
+                if delivery.success:
+                    destination.promote(rotated_sender)
+        return delivery
+
+    def divert(
+        destination: Destination, message: Dict[str, Any], priority: bool, delivery: DeliveryResult, spill: bool
+    ) -> Tuple[DeliveryResult, Optional[str]]:
+        """
+        Divert a message refused by an open circuit, returning where it went. A
+        spilled message is not delivered yet, and is reported as failed.
+        """
+        fallback = destinations_by_name.get(destination.fallback)
+        if fallback is not None:
+            fallback_delivery = send(fallback, message, priority)
+            if fallback_delivery.success:
+                return fallback_delivery, fallback.name
+        if spill and spill_queue is not None and spill_queue.append(destination.name, message):
+            return DeliveryResult(
+                success=False,
+                error="Queued in the spill queue while the circuit is open",
+                bytes=delivery.bytes,
+                circuit_open=True,
+            ), "spill_queue"
+        return delivery, None
+
+    def replay(destination: Destination) -> None:
+        """Send the messages spilled while the circuit of a destination was open."""
+        spilled = spill_queue.drain(destination.name)
+        replayed = 0
+        for message in spilled:
+            if not send(destination, message, False).success:
+                break
+            replayed += 1
+        # The messages left are queued again, in order
+        for message in spilled[replayed:]:
+            spill_queue.append(destination.name, message)
+
+        logger.info("Replayed spilled messages", extra={
+            "action": "process_records",
+            "destination": destination.name,
+            "messages": len(spilled),
+            "replayed": replayed,
+        })
+
+    def deliver(
+        batch: Dict[str, Any], destination: Destination
+    ) -> Tuple[Optional[str], List[int], Optional[str]]:
+        index = batch["index"]
+        sizes = []
+        diverted = None
+        try:
+            # Critical events are sent ahead of queued lower severity messages
+            priority = any(
+                normalized_event.severity == Severity.CRITICAL.value
+                for normalized_event in batch["events"]
+            )
+            # The messages of SQS records and of coalesced summaries are left to
+            # be redelivered once reported as failed, rather than spilled
+            spill = not results[index].get("summary") and not is_sqs_record(records[index])
+
+            # The pages of a digest are sent in order, stopping at the first
+            # failure, the remaining pages of a spilled digest are spilled too
+            for message in batch["messages"][destination.platform]:
+                delivery = send(destination, message, priority)
+                if delivery.circuit_open:
+                    delivery, diverted = divert(destination, message, priority, delivery, spill)
+                sizes.append(delivery.bytes)
+                if not delivery.success and diverted != "spill_queue":
+                    break
+
+            if delivery.success and diverted is None and spill_queue is not None and spill_queue.pending(destination.name):
+                replay(destination)
+
+            return (None if delivery.success else delivery.error or "Failed to send notification"), sizes, diverted
+        except Exception as e:
+            logger.error("Error sending record", extra={
+                "action": "process_records",
+                "index": index,
+                "destination": destination.name,
+                "error": str(e),
+            })
+            return str(e), sizes, diverted
+
+    jobs = [(batch, destination) for batch in batches for destination in batch["destinations"]]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        outcomes = list(executor.map(lambda job: deliver(*job), jobs))
+
+    # A destination may receive several batches of a record, it failed if any did
+    deliveries: Dict[int, Dict[str, Optional[str]]] = {}
+    message_bytes: Dict[int, Dict[str, List[int]]] = {}
+    delivered_events: Dict[int, List[NormalizedEvent]] = {}
+    for batch in batches:
+        delivered_events.setdefault(batch["index"], []).extend(batch["events"])
+    for (batch, destination), (error, sizes, diverted) in zip(jobs, outcomes):
+        errors = deliveries.setdefault(batch["index"], {})
+        errors[destination.name] = errors.get(destination.name) or error
+        message_bytes.setdefault(batch["index"], {}).setdefault(destination.name, []).extend(sizes)
+        if diverted is not None:
+            results[batch["index"]].setdefault("diverted", {})[destination.name] = diverted
+
+    for index, errors in deliveries.items():
+        results[index]["destinations"] = {name: error is None for name, error in errors.items()}
+        results[index]["success"] = all(error is None for error in errors.values())
+        results[index]["message_bytes"] = message_bytes[index]
+
+        if deduplicator is not None and results[index]["success"] and not results[index].get("summary"):
+            for normalized_event in delivered_events[index]:
+                deduplicator.remember(normalized_event)
+
+        failures = [f"{name}: {error}" for name, error in errors.items() if error is not None]
+        if failures:
+            results[index]["error"] = "; ".join(failures)
+
+    # The absorbed transitions were acknowledged with their records, so the
+    # windows of an undelivered summary are flushed again by a later invocation
+    if coalescer is not None and results[-1].get("summary") and not results[-1]["success"]:
+        coalescer.release()
+
+    return results
+
+
+def is_flush_event(event: Dict[Any, Any]) -> bool:
+    """
+    Return whether an event is the scheduled trigger flushing the coalesced
+    alarms of closed windows, rather than a notification.
+    """
+    return isinstance(event, dict) and event.get("action") == "flush" and "Records" not in event
+
+
+def get_batch_item_failures(results: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    Return the failed records of an SQS batch, in the partial batch response
+    format of the event source mapping.
+
+    Args:
+        results: The result of each record, as returned by process_records
+
+    Returns:
+        List[Dict[str, str]]: The message id of each failed record
+    """
+    return [
+        {"itemIdentifier": result["message_id"]}
+        for result in results
+        if not result["success"] and result.get("message_id")
+    ]
+
+
+def get_metric_dimension(values: List[str]) -> str:
+    """
+    Return the value of a metric dimension over an invocation: the single
+    value seen, 'Mixed' if several were seen, or 'None' if there were none.
+    """
+    distinct = set(values)
+    if not distinct:
+        return "None"
+    return distinct.pop() if len(distinct) == 1 else "Mixed"
 
 
 def lambda_handler(event: Dict[Any, Any], context: Any) -> Dict[str, Any]:
     """
     Main Lambda handler to process various AWS events and send notifications
 
+    Records are delivered by SNS, or in batches by an SQS queue, in which case
+    the response lists the failed messages in batchItemFailures so only those
+    are redelivered.
+
     Args:
         event: The event to process
         context: The context of the Lambda function
@@ -65,98 +498,101 @@ def lambda_handler(event: Dict[Any, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: The response from the Lambda function
     """
-    logger.info(
+    log_payload(
+        logging.INFO,
         "Processing notification event",
+        "event",
+        event,
         extra={
             "action": "lambda_handler",
-            "event": "lambda_handler",
-            "event": json.dumps(event),
-        }
+            "records": len(event.get("Records") or []) if isinstance(event, dict) else 0,
+        },
+        sampled=True,
     )
 
+    metrics = StageTimer()
+    destinations: List[Destination] = []
+    results: List[Dict[str, Any]] = []
+    outcome = "Error"
+
     try:
         # Get notification configuration
-        config = get_notification_config()
-
-        logger.info(
-            "Using notification platform",
-            extra={
-                "action": "lambda_handler",
-                "platform": config["platform"],
-            }
-        )
-
-        # Validate platform
-        if config["platform"] not in ["slack", "teams"]:
-            raise ValueError(f'Invalid platform: {config["platform"]}')
+        with metrics.time("config"):
+            config = get_notification_config()
 
-        webhook_url = config["webhook_url"]
+            destinations = [Destination(**destination) for destination in config["destinations"]]
 
-        # If the webhook ARN is present, we need to retrieve the secret from the ARN
-        if config["webhook_arn"] != "":
-            logger.info(
-                "Retrieving webhook URL from secret",
-                extra={
-                    "action": "lambda_handler",
-                    "event": "lambda_handler",
-                    "webhook_arn": config["webhook_arn"],
-                }
-            )
-
-            client = boto3.client('secretsmanager')
-            secret = get_secret(client, config["webhook_arn"])
-
-            # Check if the secret is empty or the webhook URL is not present
-            if secret is None or secret["webhook_url"] == "":
-                raise ValueError(f"Secret {config['webhook_arn']} is empty")
-
-            webhook_url = secret["webhook_url"]
-
-        # Parse and normalize the event
-        parser = EventParser()
-        normalized_event = parser.parse_event(event)
+            # The rules are compiled once per container, and checked against
+            # the destinations of each invocation
+            router = get_router()
+            if router is not None:
+                router.validate(destination.name for destination in destinations)
 
-        # Convert normalized_event to dict before logging
-        logger.debug(
-            "Normalized event created",
+        logger.info(
+            "Using notification destinations",
             extra={
                 "action": "lambda_handler",
-                "event": "lambda_handler",
-                "normalized_event": json.dumps(normalized_event.to_dict()),
+                "destinations": [
+                    {"name": destination.name, "platform": destination.platform}
+                    for destination in destinations
+                ],
             }
         )
 
-        # Create appropriate formatter and sender based on platform
-        if config["platform"] == "slack":
-            formatter = SlackFormatter()
-            sender = SlackSender(webhook_url)
-        else:  # teams
-            formatter = TeamsFormatter()
-            sender = TeamsSender(webhook_url)
-
-        # Format the message
-        message = formatter.format(normalized_event)
+        # Parse, format and deliver every record in the invocation
+        parser = EventParser()
+        records = [] if is_flush_event(event) else parser.get_records(event)
 
-        logger.debug(
-            "Formatted message",
-            extra={
-                "action": "lambda_handler",
-                "event": "lambda_handler",
-                "message": json.dumps(message),
-            }
+        event_filter = get_event_filter()
+        deduplicator = get_deduplicator()
+        rate_limiter = get_rate_limiter()
+        circuit_breaker = get_circuit_breaker()
+        spill_queue = get_spill_queue()
+        coalescer = get_coalescer()
+        results = process_records(
+            records,
+            parser,
+            destinations,
+            max_workers=config["delivery_concurrency"],
+            deduplicator=deduplicator,
+            coalescer=coalescer,
+            metrics=metrics,
+            event_filter=event_filter,
+            router=router,
+            spill_queue=spill_queue,
+            flush_coalesced=is_flush_event(event),
         )
-        # Attempt to send the message
-        success = sender.send_message(message)
+        success = all(result["success"] for result in results)
+        outcome = "Success" if success else "Failure"
 
-        logger.info("Message sent successfully", extra={
+        logger.info("Processed notification records", extra={
             "action": "lambda_handler",
             "event": "lambda_handler",
             "success": success,
+            "records": len(results),
+            "failed": sum(1 for result in results if not result["success"]),
+            "duplicates": sum(result.get("duplicates", 0) for result in results),
+            "filtered": sum(1 for result in results if result.get("filtered")),
+            "muted": sum(result.get("muted", 0) for result in results),
+            "diverted": sum(len(result.get("diverted", {})) for result in results),
+            "bytes_sent": sum(
+                sum(sizes)
+                for result in results
+                for sizes in result.get("message_bytes", {}).values()
+            ),
+            "filter_metrics": event_filter.stats() if event_filter is not None else None,
+            "routing_metrics": router.stats() if router is not None else None,
+            "dedup_metrics": deduplicator.stats() if deduplicator is not None else None,
+            "coalesce_metrics": coalescer.stats() if coalescer is not None else None,
+            "retry_metrics": get_retry_policy().metrics.stats(),
+            "rate_limit_metrics": rate_limiter.stats() if rate_limiter is not None else None,
+            "circuit_breaker_metrics": circuit_breaker.stats() if circuit_breaker is not None else None,
+            "spill_queue_metrics": spill_queue.stats() if spill_queue is not None else None,
         })
 
-        return {
+        response = {
             "statusCode": 200 if success else 500,
-            "body": json.dumps(
+            "body": codec.dumps_str(
                 {
                     "message": (
                         "Notification sent successfully"
@@ -165,13 +601,28 @@ def lambda_handler(event: Dict[Any, Any], context: Any) -> Dict[str, Any]:
                     )
                 }
             ),
+            "results": results,
         }
 
+        # An SQS event source only redelivers the messages reported as failed,
+        # rather than the whole batch
+        if any(is_sqs_record(record) for record in records):
+            response["batchItemFailures"] = get_batch_item_failures(results)
+
+        return response
+
     except Exception as e:
         logger.error("Error processing event", extra={
             "action": "lambda_handler",
             "event": "lambda_handler",
             "error": str(e),
-            "exc_info": True,
-        })
+        }, exc_info=True)
         raise
+
+    finally:
+        # Published as a single log line, from which CloudWatch extracts the metrics
+        metrics.emit(
+            event_type=get_metric_dimension([result["event_type"] for result in results if "event_type" in result]),
+            platform=get_metric_dimension([destination.platform for destination in destinations]),
+            outcome=outcome,
+        )
@@ -0,0 +1,315 @@
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+from notifications.events import NormalizedEvent
+from notifications.utils import codec
+
+# The exact match fields of a rule, each compiled into a hash index
+ROUTE_FIELDS = ("accounts", "regions", "severities", "event_types")
+
+# Backreferences are numbered within a single pattern, so patterns using them
+# are matched on their own rather than through the combined prefilter
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+@dataclass
+class RoutingRule:
+    """
+    A rule routing the events it matches to destinations, or muting them.
+
+    A rule matches an event when every criterion it sets matches, an empty
+    criterion matches any event. A rule without any criterion matches every
+    event.
+
+    Attributes:
+        name (str): A unique name for the rule, used in logs
+        destinations (List[str]): The names of the destinations matching events are delivered to
+        mute (bool): Whether matching events are dropped, whichever other rules match them
+        accounts (List[str]): The accounts matched
+        regions (List[str]): The regions matched
+        severities (List[str]): The severity labels matched
+        event_types (List[str]): The event type names matched, such as 'GUARDDUTY'
+        title_pattern (str): A regular expression searched for in the event title
+    """
+
+    name: str
+    destinations: List[str] = field(default_factory=list)
+    mute: bool = False
+    accounts: List[str] = field(default_factory=list)
+    regions: List[str] = field(default_factory=list)
+    severities: List[str] = field(default_factory=list)
+    event_types: List[str] = field(default_factory=list)
+    title_pattern: Optional[str] = None
+
+    def __post_init__(self):
+        if self.mute == bool(self.destinations):
+            raise ValueError(f"Routing rule {self.name} must either mute or have destinations")
+
+        self.accounts = [str(account) for account in self.accounts]
+        self.severities = [str(severity).lower() for severity in self.severities]
+        self.event_types = [str(event_type).upper() for event_type in self.event_types]
+        if self.title_pattern:
+            try:
+                re.compile(self.title_pattern)
+            except re.error as e:
+                raise ValueError(f"Routing rule {self.name} has an invalid title_pattern: {e}") from e
+
+
+def get_event_keys(event: NormalizedEvent) -> Tuple[str, str, str, str]:
+    """
+    Return the value of each of the ROUTE_FIELDS of an event.
+    """
+    details = event.details or {}
+    account = details.get("account_id") or details.get("account") or ""
+
+    return (
+        str(account),
+        event.region or "",
+        (event.severity or "").lower(),
+        getattr(event.event_type, "name", str(event.event_type)),
+    )
+
+
+class Router:
+    """
+    Routes events to destinations through a compiled set of rules.
+
+    The rules are compiled once into bitmasks, bit i standing for rule i. Each
+    exact match field has a hash index from each value to the rules naming it,
+    and a mask of the rules not constraining the field. The candidates of an
+    event are the AND of one lookup per field. A single regular expression
+    combining every title pattern is searched first: when it does not match,
+    the candidates with a pattern are dropped without searching each one. When
+    it matches, the pattern of each remaining candidate is searched on its own,
+    as an alternation only reports the first pattern matching. Events whose
+    title matches no pattern are routed with four dictionary lookups and a
+    single regex search, however many rules are configured.
+
+    An event is delivered to the destinations of every matching rule, unless a
+    matching rule mutes it. Events no rule matches are delivered to the
+    default destinations, all of them unless given.
+    """
+
+    def __init__(self, rules: List[RoutingRule], default_destinations: Optional[List[str]] = None):
+        """
+        Args:
+            rules: The rules, in order
+            default_destinations: The destinations of the events no rule
+                matches, None delivers them to every destination
+
+        Raises:
+            ValueError: If two rules share a name
+        """
+        names = set()
+        for rule in rules:
+            if rule.name in names:
+                raise ValueError(f"Duplicate routing rule name: {rule.name}")
+            names.add(rule.name)
+
+        self.rules = rules
+        self.default_destinations = tuple(default_destinations) if default_destinations is not None else None
+        # The names of the destinations referenced by the rules
+        self.destination_names = frozenset(
+            {name for rule in rules for name in rule.destinations} | set(self.default_destinations or ())
+        )
+
+        self._indexes: List[Dict[str, int]] = [{} for _ in ROUTE_FIELDS]
+        self._wildcards: List[int] = [0 for _ in ROUTE_FIELDS]
+        self._mute_mask = 0
+        self._pattern_mask = 0
+        self._patterns: Dict[int, Pattern] = {}
+
+        prefiltered = []
+        prefiltered_mask = 0
+        for bit, rule in enumerate(rules):
+            mask = 1 << bit
+            for position, name in enumerate(ROUTE_FIELDS):
+                values = getattr(rule, name)
+                if not values:
+                    self._wildcards[position] |= mask
+                for value in values:
+                    self._indexes[position][value] = self._indexes[position].get(value, 0) | mask
+            if rule.mute:
+                self._mute_mask |= mask
+            if rule.title_pattern:
+                self._pattern_mask |= mask
+                self._patterns[bit] = re.compile(rule.title_pattern)
+                if not _BACKREFERENCE.search(rule.title_pattern):
+                    prefiltered.append(rule.title_pattern)
+                    prefiltered_mask |= mask
+
+        # The rules whose pattern is covered by the combined prefilter
+        self._prefilter_mask = 0
+        self._prefilter: Optional[Pattern] = None
+        if prefiltered:
+            try:
+                self._prefilter = re.compile("|".join(f"(?:{pattern})" for pattern in prefiltered))
+                self._prefilter_mask = prefiltered_mask
+            except re.error:
+                # Such as patterns starting with global flags, matched on their own
+                self._prefilter = None
+
+        # The destinations of each distinct set of matched rules
+        self._routes: Dict[Tuple[int, Tuple[str, ...]], Tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+        self.routed = 0
+        self.muted = 0
+        self.unmatched = 0
+
+    def validate(self, destinations: Iterable[str]) -> None:
+        """
+        Check that the rules only reference configured destinations.
+
+        Raises:
+            ValueError: If a rule references an unknown destination
+        """
+        unknown = self.destination_names - set(destinations)
+        if unknown:
+            raise ValueError(f"Routing rules reference unknown destinations: {', '.join(sorted(unknown))}")
+
+    def match(self, event: NormalizedEvent) -> int:
+        """
+        Return the bitmask of the rules matching an event.
+        """
+        candidates = -1
+        for index, wildcard, value in zip(self._indexes, self._wildcards, get_event_keys(event)):
+            candidates &= index.get(value, 0) | wildcard
+            if not candidates:
+                return 0
+
+        pending = candidates & self._pattern_mask
+        if pending:
+            title = event.title or ""
+            if self._prefilter is not None and not self._prefilter.search(title):
+                candidates &= ~self._prefilter_mask
+                pending &= ~self._prefilter_mask
+            while pending:
+                low = pending & -pending
+                pending ^= low
+                if not self._patterns[low.bit_length() - 1].search(title):
+                    candidates &= ~low
+
+        return candidates
+
+    def route(self, event: NormalizedEvent, destinations: Tuple[str, ...]) -> Tuple[str, ...]:
+        """
+        Return the names of the destinations an event is delivered to.
+
+        Args:
+            event: The event to route
+            destinations: The names of every configured destination, in order
+
+        Returns:
+            Tuple[str, ...]: The destination names, in configuration order,
+            empty when the event is muted
+        """
+        matched = self.match(event)
+
+        with self._lock:
+            if not matched:
+                self.unmatched += 1
+            elif matched & self._mute_mask:
+                self.muted += 1
+                return ()
+            else:
+                self.routed += 1
+
+            names = self._routes.get((matched, destinations))
+            if names is None:
+                if matched:
+                    selected = set()
+                    remaining = matched
+                    while remaining:
+                        low = remaining & -remaining
+                        remaining ^= low
+                        selected.update(self.rules[low.bit_length() - 1].destinations)
+                else:
+                    selected = set(destinations if self.default_destinations is None else self.default_destinations)
+                names = self._routes[(matched, destinations)] = tuple(
+                    name for name in destinations if name in selected
+                )
+
+        return names
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the number of rules, and of events routed by a rule, muted, or
+        delivered to the default destinations.
+        """
+        with self._lock:
+            return {
+                "rules": len(self.rules),
+                "routed": self.routed,
+                "muted": self.muted,
+                "unmatched": self.unmatched,
+            }
+
+
+def load_routing_config(config: Any) -> Router:
+    """
+    Compile a routing configuration, either a list of rules, or an object with
+    the rules and the default destinations.
+
+    Raises:
+        ValueError: If the configuration or a rule is invalid
+    """
+    if isinstance(config, list):
+        config = {"rules": config}
+    if not isinstance(config, dict) or not isinstance(config.get("rules"), list):
+        raise ValueError("Routing rules must be a JSON list of rules, or an object with a list of rules")
+
+    rules = []
+    for index, rule in enumerate(config["rules"]):
+        if not isinstance(rule, dict):
+            raise ValueError(f"Routing rule {index} must be a JSON object")
+        try:
+            # Unset Terraform attributes are encoded as null
+            rules.append(RoutingRule(**{
+                "name": f"rule-{index}",
+                **{key: value for key, value in rule.items() if value is not None},
+            }))
+        except TypeError as e:
+            raise ValueError(f"Invalid routing rule {index}: {e}") from e
+
+    return Router(rules, default_destinations=config.get("default_destinations"))
+
+
+_router: Optional[Router] = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> Optional[Router]:
+    """
+    Return the container scoped router, compiling the rules on first use.
+    Routing is disabled unless ROUTING_RULES or ROUTING_RULES_FILE is set,
+    every event is then delivered to every destination.
+
+    Environment Variables:
+        ROUTING_RULES: Optional JSON routing configuration
+        ROUTING_RULES_FILE: Optional path of a JSON routing configuration, such
+            as a file shipped in a layer, for rule sets exceeding the size
+            limit of the environment variables
+
+    Returns:
+        Optional[Router]: The shared router, or None when disabled
+
+    Raises:
+        ValueError: If the routing configuration is invalid
+    """
+    global _router
+
+    config = os.environ.get("ROUTING_RULES", "")
+    path = os.environ.get("ROUTING_RULES_FILE", "")
+    if not config and not path:
+        return None
+
+    with _router_lock:
+        if _router is None:
+            if not config:
+                with open(path, "rb") as f:
+                    config = f.read()
+            _router = load_routing_config(codec.loads(config))
+
+        return _router
@@ -1,4 +1,43 @@
-from .slack_sender import SlackSender
-from .teams_sender import TeamsSender
+from notifications.utils.imports import lazy_attributes
 
-__all__ = ["SlackSender", "TeamsSender"]
+# Senders are imported on first use, so a container only loads the
+# platforms it delivers to
+_ATTRIBUTES = {
+    "MessageSender": "base_sender",
+    "DeliveryResult": "base_sender",
+    "ConnectionPool": "connection_pool",
+    "get_connection_pool": "connection_pool",
+    "RateLimiter": "rate_limiter",
+    "get_rate_limiter": "rate_limiter",
+    "CircuitBreaker": "circuit_breaker",
+    "get_circuit_breaker": "circuit_breaker",
+    "SpillQueue": "spill_queue",
+    "get_spill_queue": "spill_queue",
+    "RetryPolicy": "retry",
+    "RetryMetrics": "retry",
+    "get_retry_policy": "retry",
+    "WebhookSender": "webhook_sender",
+    "SlackSender": "slack_sender",
+    "TeamsSender": "teams_sender",
+}
+
+__getattr__ = lazy_attributes(__name__, _ATTRIBUTES)
+
+__all__ = [
+    "MessageSender",
+    "DeliveryResult",
+    "ConnectionPool",
+    "get_connection_pool",
+    "RateLimiter",
+    "get_rate_limiter",
+    "CircuitBreaker",
+    "get_circuit_breaker",
+    "SpillQueue",
+    "get_spill_queue",
+    "RetryPolicy",
+    "RetryMetrics",
+    "get_retry_policy",
+    "WebhookSender",
+    "SlackSender",
+    "TeamsSender",
+]
@@ -1,5 +1,29 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+
+@dataclass
+class DeliveryResult:
+    """The outcome of delivering a single message to a webhook.
+
+    Attributes:
+        success (bool): True if the message was accepted by the platform
+        status (Optional[int]): The HTTP status code returned, if a response was received
+        error (Optional[str]): A description of the failure, if any
+        retry_after (Optional[float]): The delay in seconds requested by the platform, if any
+        attempts (int): The number of attempts made to deliver the message
+        bytes (int): The serialized size of the message in bytes
+        circuit_open (bool): True if the message was not sent as the circuit of the webhook is open
+    """
+
+    success: bool
+    status: Optional[int] = None
+    error: Optional[str] = None
+    retry_after: Optional[float] = None
+    attempts: int = 1
+    bytes: int = 0
+    circuit_open: bool = False
 
 
 class MessageSender(ABC):
@@ -10,6 +34,20 @@ class MessageSender(ABC):
     """
 
     @abstractmethod
+    def send(self, message: Dict[str, Any], priority: bool = False) -> DeliveryResult:
+        """Send the formatted message to the target platform.
+
+        Args:
+            message (Dict[str, Any]): The formatted message to be sent. Structure depends
+                                    on the target platform's API requirements.
+            priority (bool): Whether the message is for a critical event, and should
+                             be sent ahead of queued lower severity messages.
+
+        Returns:
+            DeliveryResult: The outcome of the delivery, including the HTTP status.
+        """
+        pass
+
     def send_message(self, message: Dict[str, Any]) -> bool:
         """Send the formatted message to the target platform.
 
@@ -20,4 +58,4 @@ class MessageSender(ABC):
         Returns:
             bool: True if message was sent successfully, False otherwise.
         """
-        pass
+        return self.send(message).success
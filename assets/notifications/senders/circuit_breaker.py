@@ -0,0 +1,218 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+from urllib.parse import urlsplit
+from notifications.utils.logging import logger
+
+# The states of a circuit
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# HTTP status codes which indicate the webhook is unavailable. Rate limited
+# and rejected requests are answered by a live endpoint, so they do not count
+FAILURE_STATUS_CODES = frozenset({408, 500, 502, 503, 504})
+
+
+class _Circuit:
+    """The state and recent outcomes of the webhooks of a single host."""
+
+    def __init__(self, window: int):
+        self.state = CLOSED
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.opened_at = 0.0
+        self.probing = False
+        self.probed_at = 0.0
+
+
+class CircuitBreaker:
+    """
+    Stops sending to a webhook host which keeps failing, so each send fails
+    fast instead of waiting for the connection timeout of a dead endpoint.
+
+    The outcome of the last window attempts made to each host is tracked. Once
+    at least min_calls attempts were made and the share of failures reaches
+    failure_rate, the circuit opens and sends are refused for cooldown seconds.
+    The circuit is then half open: a single probe is let through, closing the
+    circuit when it succeeds, and opening it again when it fails.
+
+    Circuits are kept per host, as the webhooks of a platform fail together,
+    and live for the lifetime of the container.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window: int = 20,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            failure_rate: The share of failed attempts opening the circuit
+            min_calls: The number of attempts made before the circuit may open
+            window: The number of recent attempts the failure rate is computed over
+            cooldown: The number of seconds sends are refused once the circuit opens
+            clock: The monotonic clock the cooldown is measured with
+        """
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.cooldown = cooldown
+        self.rejected = 0
+        self.opened = 0
+        self._clock = clock
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, url: str) -> bool:
+        """
+        Return whether a send to a webhook may be attempted, letting a single
+        probe through once the cooldown of an open circuit has elapsed.
+
+        Args:
+            url: The webhook URL the message is sent to
+        """
+        host = get_host(url)
+        with self._lock:
+            circuit = self._circuit(host)
+            now = self._clock()
+            if circuit.state == OPEN and now - circuit.opened_at >= self.cooldown:
+                self._transition(host, circuit, HALF_OPEN)
+            if circuit.state == CLOSED:
+                return True
+            # A probe which never reported back is replaced after a cooldown
+            if circuit.state == HALF_OPEN and (not circuit.probing or now - circuit.probed_at >= self.cooldown):
+                circuit.probing = True
+                circuit.probed_at = now
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record(self, url: str, success: bool) -> None:
+        """
+        Record the outcome of an attempt to send to a webhook.
+
+        Args:
+            url: The webhook URL the message was sent to
+            success: Whether the webhook answered, see is_failure
+        """
+        host = get_host(url)
+        with self._lock:
+            circuit = self._circuit(host)
+            if circuit.state == HALF_OPEN:
+                circuit.probing = False
+                self._transition(host, circuit, CLOSED if success else OPEN)
+                return
+            if circuit.state == OPEN:
+                # An attempt allowed before the circuit opened
+                return
+
+            circuit.outcomes.append(success)
+            failures = circuit.outcomes.count(False)
+            if len(circuit.outcomes) >= self.min_calls and failures / len(circuit.outcomes) >= self.failure_rate:
+                self._transition(host, circuit, OPEN)
+
+    def state(self, url: str) -> str:
+        """Return the state of the circuit of a webhook host."""
+        with self._lock:
+            circuit = self._circuits.get(get_host(url))
+            return circuit.state if circuit is not None else CLOSED
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the number of sends refused, of circuits opened, and the state of
+        every circuit which is not closed.
+        """
+        with self._lock:
+            return {
+                "rejected": self.rejected,
+                "opened": self.opened,
+                "circuits": {host: circuit.state for host, circuit in self._circuits.items() if circuit.state != CLOSED},
+            }
+
+    def _circuit(self, host: str) -> _Circuit:
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = _Circuit(self.window)
+        return circuit
+
+    def _transition(self, host: str, circuit: _Circuit, state: str) -> None:
+        """Change the state of a circuit, logging the change."""
+        previous = circuit.state
+        total = len(circuit.outcomes)
+        failure_rate = round(circuit.outcomes.count(False) / total, 3) if total else None
+
+        circuit.state = state
+        if state == OPEN:
+            circuit.opened_at = self._clock()
+            self.opened += 1
+        elif state == CLOSED:
+            circuit.outcomes.clear()
+
+        (logger.warning if state == OPEN else logger.info)(
+            f"Circuit breaker {state.replace('_', ' ')}",
+            extra={
+                "action": "circuit_breaker",
+                "host": host,
+                "state": state,
+                "previous_state": previous,
+                "failure_rate": failure_rate,
+                "attempts": total,
+                "cooldown": self.cooldown,
+            }
+        )
+
+
+def get_host(url: str) -> str:
+    """Return the host of a webhook URL, which its circuit is kept for."""
+    return urlsplit(url).netloc or url
+
+
+def is_failure(status: Optional[int]) -> bool:
+    """
+    Return whether an attempt shows the webhook is unavailable: a network
+    error or timeout, which carries no status, or a server error.
+    """
+    return status is None or status in FAILURE_STATUS_CODES
+
+
+_circuit_breaker: Optional[CircuitBreaker] = None
+_circuit_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> Optional[CircuitBreaker]:
+    """
+    Return the container scoped circuit breaker, creating it on first use.
+    The circuit breaker is disabled unless CIRCUIT_BREAKER_FAILURE_RATE is set.
+
+    Environment Variables:
+        CIRCUIT_BREAKER_FAILURE_RATE: The share of failed attempts to a host
+            opening its circuit, between 0 and 1, 0 disables the breaker
+        CIRCUIT_BREAKER_MIN_CALLS: The number of attempts made before a circuit may open
+        CIRCUIT_BREAKER_WINDOW: The number of recent attempts the failure rate is computed over
+        CIRCUIT_BREAKER_COOLDOWN: The number of seconds a circuit stays open
+
+    Returns:
+        Optional[CircuitBreaker]: The shared circuit breaker, or None when disabled
+    """
+    global _circuit_breaker
+
+    failure_rate = float(os.environ.get("CIRCUIT_BREAKER_FAILURE_RATE", "0"))
+    if failure_rate <= 0:
+        return None
+
+    with _circuit_breaker_lock:
+        if _circuit_breaker is None:
+            _circuit_breaker = CircuitBreaker(
+                failure_rate=failure_rate,
+                min_calls=int(os.environ.get("CIRCUIT_BREAKER_MIN_CALLS", "5")),
+                window=int(os.environ.get("CIRCUIT_BREAKER_WINDOW", "20")),
+                cooldown=float(os.environ.get("CIRCUIT_BREAKER_COOLDOWN", "30")),
+            )
+
+        return _circuit_breaker
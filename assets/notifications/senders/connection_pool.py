@@ -0,0 +1,214 @@
+import http.client
+import os
+import ssl
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+# Errors raised when a pooled keep-alive connection has been closed by the remote
+# end while idle, the request is retried once on a fresh connection
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+@dataclass
+class HTTPResponse:
+    """A fully read HTTP response.
+
+    Attributes:
+        status (int): The HTTP status code
+        headers (Dict[str, str]): The response headers, keyed by lower case name
+        body (bytes): The response body
+    """
+
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+
+class ConnectionPool:
+    """A thread safe pool of keep-alive HTTP(S) connections, keyed by host.
+
+    Connections are reused across messages and across warm invocations, which
+    avoids paying for DNS resolution, TCP setup and the TLS handshake on every
+    webhook call. Connections closed by the remote end while idle are replaced
+    transparently.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0,
+        max_idle_per_host: int = 4,
+    ):
+        """
+        Args:
+            connect_timeout: The timeout in seconds to establish a connection
+            read_timeout: The timeout in seconds to wait on the remote end once connected
+            max_idle_per_host: The maximum number of idle connections kept per host
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.created = 0
+        self.reused = 0
+        self.reconnects = 0
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> HTTPResponse:
+        """Send a request over a pooled connection and read the full response.
+
+        Args:
+            method: The HTTP method
+            url: The absolute URL to send the request to
+            body: The optional request body
+            headers: The optional request headers
+
+        Returns:
+            HTTPResponse: The response from the remote end
+
+        Raises:
+            OSError: If the connection fails or times out
+            http.client.HTTPException: If the remote end returns an invalid response
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        connection, reused = self._acquire(key)
+        try:
+            try:
+                response, data = self._send(connection, method, path, body, headers or {})
+            except _STALE_CONNECTION_ERRORS:
+                connection.close()
+                if not reused:
+                    raise
+                with self._lock:
+                    self.reconnects += 1
+                connection = self._connect(key)
+                response, data = self._send(connection, method, path, body, headers or {})
+        except BaseException:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(key, connection)
+
+        return HTTPResponse(
+            status=response.status,
+            headers={name.lower(): value for name, value in response.getheaders()},
+            body=data,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Return the connection counters for the pool."""
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "reconnects": self.reconnects,
+        }
+
+    def close(self) -> None:
+        """Close all idle connections held by the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def _send(
+        self,
+        connection: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+    ) -> Tuple[http.client.HTTPResponse, bytes]:
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        # The body must be fully read before the connection can be reused
+        return response, response.read()
+
+    def _acquire(self, key: Tuple[str, str, int]) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.reused += 1
+                return idle.pop(), True
+
+        return self._connect(key), False
+
+    def _release(self, key: Tuple[str, str, int], connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+
+        connection.close()
+
+    def _connect(self, key: Tuple[str, str, int]) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            connection = http.client.HTTPSConnection(
+                host, port, timeout=self.connect_timeout, context=self._ssl_context
+            )
+        elif scheme == "http":
+            connection = http.client.HTTPConnection(host, port, timeout=self.connect_timeout)
+        else:
+            raise ValueError(f"Unsupported URL scheme: {scheme}")
+
+        connection.connect()
+        # Once connected, waits on the remote end are bounded by the read timeout
+        connection.sock.settimeout(self.read_timeout)
+
+        with self._lock:
+            self.created += 1
+
+        return connection
+
+
+_connection_pool: Optional[ConnectionPool] = None
+_connection_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Return the container scoped connection pool, creating it on first use.
+
+    Environment Variables:
+        WEBHOOK_CONNECT_TIMEOUT: The timeout in seconds to connect to a webhook
+        WEBHOOK_READ_TIMEOUT: The timeout in seconds to wait on a webhook response
+
+    Returns:
+        ConnectionPool: The shared connection pool
+    """
+    global _connection_pool
+
+    with _connection_pool_lock:
+        if _connection_pool is None:
+            _connection_pool = ConnectionPool(
+                connect_timeout=float(os.environ.get("WEBHOOK_CONNECT_TIMEOUT", "3")),
+                read_timeout=float(os.environ.get("WEBHOOK_READ_TIMEOUT", "10")),
+            )
+
+        return _connection_pool
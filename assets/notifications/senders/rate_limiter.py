@@ -0,0 +1,246 @@
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+from notifications.state import StateStore, get_state_store
+from notifications.utils.logging import logger
+
+
+class TokenBucket:
+    """
+    A token bucket refilled at rate tokens per second, holding at most burst tokens.
+    """
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def try_take(self, now: float) -> bool:
+        """
+        Take a token if one is available, returning whether it was taken.
+        """
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self, now: float) -> float:
+        """
+        Return the number of seconds until a token is available.
+        """
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class _Limit:
+    """The bucket and waiting lanes of a single webhook."""
+
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self.condition = threading.Condition()
+        self.priority: Deque[object] = deque()
+        self.normal: Deque[object] = deque()
+
+
+class RateLimiter:
+    """
+    Paces the sends to each webhook URL with a token bucket, shared by all the
+    threads of the container.
+
+    Waiting senders queue in two lanes, a sender in the priority lane, used for
+    critical events, is always served before any queued in the normal lane. When
+    a state store is given, each send must also claim a slot in a fixed window
+    shared with the other containers, allowing burst sends per burst / rate
+    seconds; priority sends claim a slot without waiting for one.
+
+    A sender never waits longer than max_wait, after which the message is sent
+    anyway and the overflow counted, leaving the retry policy to handle a 429.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 1,
+        max_wait: float = 10.0,
+        store: Optional[StateStore] = None,
+        prefix: str = "ratelimit",
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            rate: The number of messages per second allowed to each webhook
+            burst: The number of messages which may be sent back to back
+            max_wait: The upper bound in seconds a sender waits for its turn
+            store: The optional store used to share the limit across containers
+            prefix: The prefix of the keys in the store
+            clock: The monotonic clock used to refill the buckets
+            wall_clock: The clock used to determine the shared windows
+            sleep: The function used to wait for a shared window
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.store = store
+        self.prefix = prefix
+        self.acquired = 0
+        self.priority = 0
+        self.waited = 0.0
+        self.overflows = 0
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._sleep = sleep
+        self._limits: Dict[str, _Limit] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, priority: bool = False) -> float:
+        """
+        Wait for the turn of a sender to send a message to a webhook.
+
+        Args:
+            key: The webhook URL the message is sent to
+            priority: Whether the message is sent in the priority lane
+
+        Returns:
+            float: The number of seconds waited
+        """
+        start = self._clock()
+        deadline = start + self.max_wait
+        overflow = not self._acquire_local(key, priority, deadline)
+        if not overflow and self.store is not None:
+            overflow = not self._acquire_shared(key, priority, deadline)
+
+        waited = self._clock() - start
+        with self._lock:
+            self.acquired += 1
+            self.priority += 1 if priority else 0
+            self.waited += waited
+            self.overflows += 1 if overflow else 0
+
+        if overflow:
+            logger.warning("Rate limit wait exceeded, sending anyway", extra={
+                "action": "rate_limit",
+                "priority": priority,
+                "waited": round(waited, 3),
+            })
+
+        return waited
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the number of sends paced, the time spent waiting and the
+        number of sends made without waiting for their turn.
+        """
+        with self._lock:
+            return {
+                "acquired": self.acquired,
+                "priority": self.priority,
+                "waited": round(self.waited, 3),
+                "overflows": self.overflows,
+            }
+
+    def _limit(self, key: str) -> _Limit:
+        with self._lock:
+            limit = self._limits.get(key)
+            if limit is None:
+                limit = self._limits[key] = _Limit(TokenBucket(self.rate, self.burst, self._clock()))
+            return limit
+
+    def _acquire_local(self, key: str, priority: bool, deadline: float) -> bool:
+        """
+        Take a token from the bucket of the webhook once at the head of the
+        lanes, returning False if the deadline passed first.
+        """
+        limit = self._limit(key)
+        ticket = object()
+
+        with limit.condition:
+            lane = limit.priority if priority else limit.normal
+            lane.append(ticket)
+            try:
+                while True:
+                    now = self._clock()
+                    head = limit.priority[0] if limit.priority else limit.normal[0]
+                    if head is ticket:
+                        if limit.bucket.try_take(now):
+                            return True
+                        wait = limit.bucket.wait_time(now)
+                    else:
+                        wait = None
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return False
+                    limit.condition.wait(remaining if wait is None else min(wait, remaining))
+            finally:
+                lane.remove(ticket)
+                limit.condition.notify_all()
+
+    def _acquire_shared(self, key: str, priority: bool, deadline: float) -> bool:
+        """
+        Claim a slot in the window shared with the other containers, returning
+        False if the deadline passed first.
+        """
+        window = self.burst / self.rate
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+        while True:
+            now = self._wall_clock()
+            index = int(now // window)
+            claimed = self.store.increment(f"{self.prefix}:{digest}:{index}", ttl=window * 2)
+            if claimed <= self.burst or priority:
+                return True
+
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                return False
+            self._sleep(min((index + 1) * window - now, remaining))
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Return the container scoped rate limiter, creating it on first use.
+    Rate limiting is disabled unless WEBHOOK_RATE_LIMIT is set.
+
+    Environment Variables:
+        WEBHOOK_RATE_LIMIT: The number of messages per second allowed to each
+            webhook, 0 disables rate limiting
+        WEBHOOK_RATE_BURST: The number of messages which may be sent back to back
+        WEBHOOK_RATE_MAX_WAIT: The upper bound in seconds a message waits for its turn
+        WEBHOOK_RATE_SHARED: Whether the limit is shared across containers
+            through the state store ('true' or 'false')
+
+    Returns:
+        Optional[RateLimiter]: The shared rate limiter, or None when disabled
+    """
+    global _rate_limiter
+
+    rate = float(os.environ.get("WEBHOOK_RATE_LIMIT", "0"))
+    if rate <= 0:
+        return None
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            shared = os.environ.get("WEBHOOK_RATE_SHARED", "false").lower() == "true"
+            _rate_limiter = RateLimiter(
+                rate=rate,
+                burst=int(os.environ.get("WEBHOOK_RATE_BURST", "1")),
+                max_wait=float(os.environ.get("WEBHOOK_RATE_MAX_WAIT", "10")),
+                store=get_state_store() if shared else None,
+            )
+
+        return _rate_limiter
@@ -0,0 +1,214 @@
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, FrozenSet, Optional
+from .base_sender import DeliveryResult
+from notifications.utils.logging import logger
+
+
+# HTTP status codes which indicate a transient failure worth retrying
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either as seconds or as an HTTP date.
+
+    Args:
+        value: The header value
+        now: The current time, used to resolve an HTTP date
+
+    Returns:
+        Optional[float]: The number of seconds to wait, or None if the header is absent or invalid
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class RetryMetrics:
+    """Thread safe counters describing retry behaviour across all senders.
+
+    The counters live for the lifetime of the container, and are used to tune
+    the retry settings from real traffic.
+    """
+
+    _FIELDS = (
+        "deliveries",
+        "attempts",
+        "retries",
+        "retry_after_honored",
+        "recovered",
+        "exhausted",
+        "budget_exceeded",
+        "not_retryable",
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(self._FIELDS, 0)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return dict(self._counters)
+
+
+@dataclass
+class RetryPolicy:
+    """Decides whether, and how long after, a failed delivery is retried.
+
+    Retries use exponential backoff with full jitter, honour the Retry-After
+    header returned by rate limited webhooks, and stop once either the maximum
+    number of attempts or the total time budget is used up.
+
+    Attributes:
+        max_attempts (int): The maximum number of attempts, including the first
+        base_delay (float): The backoff in seconds before the first retry
+        max_delay (float): The upper bound in seconds of a single backoff
+        total_budget (float): The upper bound in seconds spent on a delivery, including waits
+        retryable_statuses (FrozenSet[int]): The HTTP status codes which are retried
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    total_budget: float = 15.0
+    retryable_statuses: FrozenSet[int] = RETRYABLE_STATUS_CODES
+    metrics: RetryMetrics = field(default_factory=RetryMetrics, repr=False)
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+
+    def is_retryable(self, result: DeliveryResult) -> bool:
+        """
+        Check if a failed delivery is worth retrying. Network errors and
+        timeouts, which carry no status, are always retried, unless the
+        circuit of the webhook is open.
+        """
+        if result.success or result.circuit_open:
+            return False
+        return result.status is None or result.status in self.retryable_statuses
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Return the number of seconds to wait before the next attempt.
+
+        Args:
+            attempt: The number of attempts made so far
+            retry_after: The delay requested by the remote end, if any
+
+        Returns:
+            float: The delay in seconds
+        """
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def execute(self, operation: Callable[[], DeliveryResult], target: str = "") -> DeliveryResult:
+        """
+        Run a delivery, retrying transient failures according to the policy.
+
+        Args:
+            operation: Performs a single delivery attempt
+            target: A description of the destination, used in logs
+
+        Returns:
+            DeliveryResult: The result of the final attempt
+        """
+        started = self.clock()
+        self.metrics.increment("deliveries")
+        attempt = 0
+
+        while True:
+            attempt += 1
+            self.metrics.increment("attempts")
+            result = operation()
+            result.attempts = attempt
+
+            if result.success:
+                if attempt > 1:
+                    self.metrics.increment("recovered")
+                return result
+
+            if not self.is_retryable(result):
+                self.metrics.increment("not_retryable")
+                return result
+
+            if attempt >= self.max_attempts:
+                self.metrics.increment("exhausted")
+                return result
+
+            delay = self.backoff(attempt, result.retry_after)
+            if result.retry_after is not None:
+                self.metrics.increment("retry_after_honored")
+
+            if self.clock() - started + delay > self.total_budget:
+                self.metrics.increment("budget_exceeded")
+                return result
+
+            logger.warning(
+                "Retrying failed delivery",
+                extra={
+                    "action": "retry",
+                    "target": target,
+                    "attempt": attempt,
+                    "status": result.status,
+                    "error": result.error,
+                    "delay": round(delay, 3),
+                }
+            )
+            self.metrics.increment("retries")
+            self.sleep(delay)
+
+
+_retry_policy: Optional[RetryPolicy] = None
+_retry_policy_lock = threading.Lock()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """
+    Return the container scoped retry policy, creating it on first use.
+
+    Environment Variables:
+        WEBHOOK_MAX_ATTEMPTS: The maximum number of attempts per message
+        WEBHOOK_RETRY_BASE_DELAY: The backoff in seconds before the first retry
+        WEBHOOK_RETRY_MAX_DELAY: The upper bound in seconds of a single backoff
+        WEBHOOK_RETRY_BUDGET: The upper bound in seconds spent delivering a message
+
+    Returns:
+        RetryPolicy: The shared retry policy
+    """
+    global _retry_policy
+
+    with _retry_policy_lock:
+        if _retry_policy is None:
+            _retry_policy = RetryPolicy(
+                max_attempts=int(os.environ.get("WEBHOOK_MAX_ATTEMPTS", "3")),
+                base_delay=float(os.environ.get("WEBHOOK_RETRY_BASE_DELAY", "0.5")),
+                max_delay=float(os.environ.get("WEBHOOK_RETRY_MAX_DELAY", "10")),
+                total_budget=float(os.environ.get("WEBHOOK_RETRY_BUDGET", "15")),
+            )
+
+        return _retry_policy
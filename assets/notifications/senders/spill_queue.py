@@ -0,0 +1,144 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from notifications.utils import codec
+from notifications.utils.logging import logger
+
+
+class SpillQueue:
+    """
+    Holds the messages of destinations whose circuit is open on local disk,
+    so they are delivered later rather than lost or waited on.
+
+    Each destination has a JSON Lines file in the directory, one message per
+    line. The messages are drained once the destination accepts a message
+    again. The queue lives in the ephemeral storage of the container, so it
+    is bounded by max_bytes, and messages still queued when the container is
+    recycled are lost.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 * 1024):
+        """
+        Args:
+            directory: The directory the queue files are written to, created if missing
+            max_bytes: The upper bound of the size of all the queue files
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.spilled = 0
+        self.replayed = 0
+        self.overflows = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        # Queue files left by a previous handler of this container are kept
+        self._size = sum(
+            os.path.getsize(os.path.join(directory, name))
+            for name in os.listdir(directory)
+            if name.endswith(".jsonl")
+        )
+
+    def append(self, key: str, message: Dict[str, Any]) -> bool:
+        """
+        Queue a message for a destination.
+
+        Args:
+            key: The name of the destination
+            message: The formatted message
+
+        Returns:
+            bool: Whether the message was queued, False once the queue is full
+        """
+        line = codec.dumps({"destination": key, "spilled_at": time.time(), "message": message}) + b"\n"
+
+        with self._lock:
+            if self._size + len(line) > self.max_bytes:
+                self.overflows += 1
+                logger.warning("Spill queue is full, message not queued", extra={
+                    "action": "spill_queue",
+                    "destination": key,
+                    "size": self._size,
+                })
+                return False
+
+            with open(self._path(key), "ab") as f:
+                f.write(line)
+            self._size += len(line)
+            self.spilled += 1
+
+        return True
+
+    def drain(self, key: str) -> List[Dict[str, Any]]:
+        """
+        Remove and return the messages queued for a destination, oldest first.
+        """
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, "rb") as f:
+                    lines = f.read().splitlines()
+                os.remove(path)
+            except FileNotFoundError:
+                return []
+
+            self._size -= sum(len(line) + 1 for line in lines)
+            self.replayed += len(lines)
+
+        return [codec.loads(line)["message"] for line in lines if line]
+
+    def pending(self, key: str) -> bool:
+        """Return whether messages are queued for a destination."""
+        return os.path.exists(self._path(key))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the number of messages queued, replayed and refused, and the
+        size of the queue in bytes.
+        """
+        with self._lock:
+            return {
+                "spilled": self.spilled,
+                "replayed": self.replayed,
+                "overflows": self.overflows,
+                "bytes": self._size,
+            }
+
+    def _path(self, key: str) -> str:
+        # Destination names are free form, so the file is named after a digest
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{digest}.jsonl")
+
+
+_spill_queue: Optional[SpillQueue] = None
+_spill_queue_lock = threading.Lock()
+
+
+def get_spill_queue() -> Optional[SpillQueue]:
+    """
+    Return the container scoped spill queue, creating it on first use.
+    Spilling is disabled unless SPILL_DIRECTORY is set.
+
+    Environment Variables:
+        SPILL_DIRECTORY: The directory the messages of open circuits are queued
+            in, such as /tmp/notifications-spill
+        SPILL_MAX_BYTES: The upper bound of the size of the queue
+
+    Returns:
+        Optional[SpillQueue]: The shared spill queue, or None when disabled
+    """
+    global _spill_queue
+
+    directory = os.environ.get("SPILL_DIRECTORY", "")
+    if not directory:
+        return None
+
+    with _spill_queue_lock:
+        if _spill_queue is None:
+            _spill_queue = SpillQueue(
+                directory,
+                max_bytes=int(os.environ.get("SPILL_MAX_BYTES", str(50 * 1024 * 1024))),
+            )
+
+        return _spill_queue
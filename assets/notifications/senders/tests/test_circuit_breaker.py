@@ -0,0 +1,133 @@
+from pytest_httpserver import HTTPServer
+from werkzeug.wrappers import Response
+from notifications.senders.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, is_failure
+from notifications.senders.connection_pool import ConnectionPool
+from notifications.senders.retry import RetryPolicy
+from notifications.senders.slack_sender import SlackSender
+from notifications.senders.spill_queue import SpillQueue
+
+WEBHOOK_URL = "https://hooks.slack.com/services/T000/B000/XXXX"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    def test_circuit_opens_once_the_failure_rate_is_reached(self):
+        """Test that a host is refused once enough of its recent attempts failed"""
+        breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, window=10, clock=FakeClock())
+
+        for success in [True, False, True]:
+            breaker.record(WEBHOOK_URL, success)
+        assert breaker.state(WEBHOOK_URL) == CLOSED
+
+        breaker.record(WEBHOOK_URL, False)
+
+        assert breaker.state(WEBHOOK_URL) == OPEN
+        assert breaker.allow(WEBHOOK_URL) is False
+        assert breaker.stats() == {"rejected": 1, "opened": 1, "circuits": {"hooks.slack.com": OPEN}}
+
+    def test_circuits_are_kept_per_host(self):
+        """Test that the circuit of a failing host does not refuse sends to other hosts"""
+        breaker = CircuitBreaker(failure_rate=0.5, min_calls=1, clock=FakeClock())
+
+        breaker.record(WEBHOOK_URL, False)
+
+        assert breaker.allow("https://hooks.slack.com/services/T000/B000/YYYY") is False
+        assert breaker.allow("https://example.webhook.office.com/webhookb2/1") is True
+
+    def test_half_open_probe_closes_or_reopens_the_circuit(self):
+        """Test that a single probe is let through after the cooldown, deciding the state"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_rate=0.5, min_calls=1, cooldown=30, clock=clock)
+        breaker.record(WEBHOOK_URL, False)
+
+        clock.now = 30
+        assert breaker.allow(WEBHOOK_URL) is True
+        assert breaker.state(WEBHOOK_URL) == HALF_OPEN
+        assert breaker.allow(WEBHOOK_URL) is False
+
+        breaker.record(WEBHOOK_URL, False)
+        assert breaker.state(WEBHOOK_URL) == OPEN
+        assert breaker.allow(WEBHOOK_URL) is False
+
+        clock.now = 60
+        assert breaker.allow(WEBHOOK_URL) is True
+        breaker.record(WEBHOOK_URL, True)
+        assert breaker.state(WEBHOOK_URL) == CLOSED
+        assert breaker.allow(WEBHOOK_URL) is True
+
+    def test_only_unavailability_counts_as_failure(self):
+        """Test that rate limited and rejected requests, answered by a live endpoint, are not failures"""
+        assert is_failure(None) is True
+        assert is_failure(503) is True
+        assert is_failure(429) is False
+        assert is_failure(404) is False
+        assert is_failure(200) is False
+
+    def test_state_changes_are_logged(self, caplog):
+        """Test that opening a circuit is logged as a structured event"""
+        breaker = CircuitBreaker(failure_rate=0.5, min_calls=2, clock=FakeClock())
+
+        with caplog.at_level("INFO"):
+            breaker.record(WEBHOOK_URL, False)
+            breaker.record(WEBHOOK_URL, False)
+
+        record = next(record for record in caplog.records if getattr(record, "action", None) == "circuit_breaker")
+        assert record.state == OPEN
+        assert record.previous_state == CLOSED
+        assert record.host == "hooks.slack.com"
+        assert record.failure_rate == 1.0
+
+
+def test_sender_fails_fast_while_the_circuit_is_open(httpserver: HTTPServer):
+    """Test that a sender stops retrying, and stops sending, once the circuit of its host opens"""
+    httpserver.expect_request("/", method="POST").respond_with_response(Response(status=503))
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=2, clock=FakeClock())
+    sender = SlackSender(
+        httpserver.url_for("/"),
+        pool=ConnectionPool(),
+        retry_policy=RetryPolicy(max_attempts=5, sleep=lambda seconds: None),
+        circuit_breaker=breaker,
+    )
+
+    first = sender.send({"blocks": []})
+    second = sender.send({"blocks": []})
+
+    assert first.circuit_open is True
+    assert first.attempts == 3
+    assert second.circuit_open is True
+    assert second.attempts == 1
+    assert len(httpserver.log) == 2
+
+
+class TestSpillQueue:
+    def test_messages_are_drained_in_order(self, tmp_path):
+        """Test that the messages of a destination are returned oldest first, and removed"""
+        queue = SpillQueue(str(tmp_path))
+
+        assert queue.append("security", {"text": "first"}) is True
+        assert queue.append("security", {"text": "second"}) is True
+        assert queue.append("platform", {"text": "other"}) is True
+
+        assert queue.pending("security") is True
+        assert queue.drain("security") == [{"text": "first"}, {"text": "second"}]
+        assert queue.pending("security") is False
+        assert queue.drain("security") == []
+        assert queue.stats()["replayed"] == 2
+
+    def test_queue_is_bounded(self, tmp_path):
+        """Test that messages are refused once the queue reaches its size bound"""
+        queue = SpillQueue(str(tmp_path), max_bytes=200)
+
+        assert queue.append("security", {"text": "x" * 50}) is True
+        assert queue.append("security", {"text": "x" * 150}) is False
+        assert queue.stats()["overflows"] == 1
+
+        queue.drain("security")
+        assert queue.stats()["bytes"] == 0
@@ -0,0 +1,93 @@
+import json
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from notifications.senders.connection_pool import ConnectionPool
+from notifications.senders.retry import RetryPolicy
+from notifications.senders.slack_sender import SlackSender
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """A webhook stand-in which keeps connections alive between requests"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path == "/slow":
+            time.sleep(0.3)
+
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+        # Drop the connection without telling the client, as an idle timeout would
+        if self.path == "/drop":
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestConnectionPool:
+    def test_connections_are_reused(self, server):
+        """Test that consecutive requests to the same host reuse the connection"""
+        pool = ConnectionPool()
+
+        for _ in range(5):
+            response = pool.request("POST", f"{server}/", body=b"{}")
+            assert response.status == 200
+            assert response.body == b"ok"
+
+        assert pool.stats() == {"created": 1, "reused": 4, "reconnects": 0}
+
+    def test_stale_connection_is_replaced(self, server):
+        """Test that a connection closed by the remote end while idle is replaced transparently"""
+        pool = ConnectionPool()
+
+        assert pool.request("POST", f"{server}/drop", body=b"{}").status == 200
+        time.sleep(0.1)
+        assert pool.request("POST", f"{server}/", body=b"{}").status == 200
+
+        assert pool.stats() == {"created": 2, "reused": 1, "reconnects": 1}
+
+    def test_read_timeout(self, server):
+        """Test that a slow webhook fails after the read timeout rather than hanging"""
+        pool = ConnectionPool(read_timeout=0.1)
+
+        with pytest.raises(TimeoutError):
+            pool.request("POST", f"{server}/slow", body=b"{}")
+
+    def test_sender_uses_pool(self, server):
+        """Test that the platform senders deliver over the shared pool"""
+        pool = ConnectionPool()
+        sender = SlackSender(f"{server}/", pool=pool)
+
+        assert sender.send_message({"text": "one"})
+        assert sender.send_message({"text": "two"})
+        assert pool.stats()["reused"] == 1
+
+    def test_sender_reports_timeout(self, server):
+        """Test that a timeout is reported as a failed delivery"""
+        sender = SlackSender(
+            f"{server}/slow",
+            pool=ConnectionPool(read_timeout=0.1),
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+
+        result = sender.send({"text": "hello"})
+
+        assert result.success is False
+        assert result.status is None
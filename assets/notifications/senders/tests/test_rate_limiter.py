@@ -0,0 +1,112 @@
+import threading
+import time
+from notifications.senders.rate_limiter import RateLimiter, TokenBucket
+from notifications.state import MemoryStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter:
+    def test_token_bucket(self):
+        """Test that the bucket allows a burst, then refills at the configured rate"""
+        bucket = TokenBucket(rate=2, burst=2, now=0.0)
+
+        assert bucket.try_take(0.0) is True
+        assert bucket.try_take(0.0) is True
+        assert bucket.try_take(0.0) is False
+        assert bucket.wait_time(0.0) == 0.5
+        assert bucket.try_take(0.5) is True
+
+    def test_sends_are_paced(self):
+        """Test that sends to the same webhook are paced at the configured rate"""
+        limiter = RateLimiter(rate=20, burst=1)
+
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire("https://hooks.example.com/a")
+        elapsed = time.monotonic() - start
+
+        assert elapsed >= 0.18
+        assert limiter.stats()["acquired"] == 5
+        assert limiter.stats()["overflows"] == 0
+
+    def test_webhooks_are_limited_separately(self):
+        """Test that each webhook URL has its own bucket"""
+        limiter = RateLimiter(rate=1, burst=1, max_wait=5)
+
+        start = time.monotonic()
+        limiter.acquire("https://hooks.example.com/a")
+        limiter.acquire("https://hooks.example.com/b")
+
+        assert time.monotonic() - start < 0.5
+
+    def test_priority_lane_preempts_queued_sends(self):
+        """Test that a critical send is served before lower severity sends already queued"""
+        limiter = RateLimiter(rate=10, burst=1)
+        limiter.acquire("https://hooks.example.com/a")
+        order = []
+
+        def send(name, priority):
+            limiter.acquire("https://hooks.example.com/a", priority=priority)
+            order.append(name)
+
+        threads = [threading.Thread(target=send, args=(f"normal-{i}", False)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.02)
+        threads.append(threading.Thread(target=send, args=("critical", True)))
+        threads[-1].start()
+        for thread in threads:
+            thread.join()
+
+        assert order[0] == "critical"
+        assert sorted(order[1:]) == ["normal-0", "normal-1", "normal-2"]
+        assert limiter.stats()["priority"] == 1
+
+    def test_wait_is_bounded(self):
+        """Test that a send waiting longer than max_wait proceeds, and is counted"""
+        limiter = RateLimiter(rate=0.1, burst=1, max_wait=0.05)
+        limiter.acquire("https://hooks.example.com/a")
+
+        waited = limiter.acquire("https://hooks.example.com/a")
+
+        assert waited < 1
+        assert limiter.stats()["overflows"] == 1
+
+    def test_limit_is_shared_across_containers(self):
+        """Test that limiters sharing a store wait for a slot in the shared window"""
+        clock = FakeClock()
+        store = MemoryStore(clock=clock)
+        first = RateLimiter(rate=2, burst=2, store=store, wall_clock=clock, sleep=clock.sleep)
+        second = RateLimiter(rate=2, burst=2, store=store, wall_clock=clock, sleep=clock.sleep)
+
+        first.acquire("https://hooks.example.com/a")
+        first.acquire("https://hooks.example.com/a")
+        assert clock.sleeps == []
+
+        second.acquire("https://hooks.example.com/a")
+        assert clock.sleeps == [1.0]
+
+    def test_priority_sends_claim_a_shared_slot_without_waiting(self):
+        """Test that a critical send does not wait for the shared window"""
+        clock = FakeClock()
+        store = MemoryStore(clock=clock)
+        first = RateLimiter(rate=2, burst=2, store=store, wall_clock=clock, sleep=clock.sleep)
+        second = RateLimiter(rate=2, burst=2, store=store, wall_clock=clock, sleep=clock.sleep)
+
+        first.acquire("https://hooks.example.com/a")
+        first.acquire("https://hooks.example.com/a")
+        second.acquire("https://hooks.example.com/a", priority=True)
+
+        assert clock.sleeps == []
@@ -0,0 +1,129 @@
+import pytest
+from datetime import datetime, timezone
+from pytest_httpserver import HTTPServer
+from werkzeug.wrappers import Response
+from notifications.senders.base_sender import DeliveryResult
+from notifications.senders.connection_pool import ConnectionPool
+from notifications.senders.retry import RetryPolicy, parse_retry_after
+from notifications.senders.teams_sender import TeamsSender
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_policy(clock, **kwargs):
+    return RetryPolicy(sleep=clock.sleep, clock=clock, **kwargs)
+
+
+class TestRetryPolicy:
+    def test_parse_retry_after(self):
+        """Test that Retry-After is understood as seconds or as an HTTP date"""
+        now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+        assert parse_retry_after("3", now) == 3.0
+        assert parse_retry_after("Mon, 01 Jan 2024 12:00:05 GMT", now) == 5.0
+        assert parse_retry_after("Mon, 01 Jan 2024 11:00:00 GMT", now) == 0.0
+        assert parse_retry_after(None, now) is None
+        assert parse_retry_after("soon", now) is None
+
+    def test_retries_until_success(self):
+        """Test that transient failures are retried and recoveries are counted"""
+        clock = FakeClock()
+        policy = make_policy(clock, max_attempts=4)
+        results = iter([
+            DeliveryResult(success=False, status=502),
+            DeliveryResult(success=False, error="timed out"),
+            DeliveryResult(success=True, status=200),
+        ])
+
+        result = policy.execute(lambda: next(results))
+
+        assert result.success is True
+        assert result.attempts == 3
+        assert len(clock.sleeps) == 2
+        assert clock.sleeps[0] <= 0.5
+        assert clock.sleeps[1] <= 1.0
+
+        stats = policy.metrics.stats()
+        assert stats["attempts"] == 3
+        assert stats["retries"] == 2
+        assert stats["recovered"] == 1
+
+    def test_honors_retry_after(self):
+        """Test that the delay requested by a rate limited webhook is honored"""
+        clock = FakeClock()
+        policy = make_policy(clock)
+        results = iter([
+            DeliveryResult(success=False, status=429, retry_after=2.0),
+            DeliveryResult(success=True, status=200),
+        ])
+
+        assert policy.execute(lambda: next(results)).success is True
+        assert clock.sleeps == [2.0]
+        assert policy.metrics.stats()["retry_after_honored"] == 1
+
+    def test_non_retryable_errors_are_not_retried(self):
+        """Test that client errors fail immediately"""
+        clock = FakeClock()
+        policy = make_policy(clock)
+
+        result = policy.execute(lambda: DeliveryResult(success=False, status=400))
+
+        assert result.attempts == 1
+        assert clock.sleeps == []
+        assert policy.metrics.stats()["not_retryable"] == 1
+
+    def test_attempts_are_capped(self):
+        """Test that retries stop after the maximum number of attempts"""
+        clock = FakeClock()
+        policy = make_policy(clock, max_attempts=3)
+
+        result = policy.execute(lambda: DeliveryResult(success=False, status=503))
+
+        assert result.success is False
+        assert result.attempts == 3
+        assert policy.metrics.stats()["exhausted"] == 1
+
+    def test_total_budget_is_respected(self):
+        """Test that a Retry-After beyond the remaining budget gives up rather than waiting"""
+        clock = FakeClock()
+        policy = make_policy(clock, max_attempts=5, total_budget=10)
+
+        result = policy.execute(lambda: DeliveryResult(success=False, status=429, retry_after=30))
+
+        assert result.attempts == 1
+        assert clock.sleeps == []
+        assert policy.metrics.stats()["budget_exceeded"] == 1
+
+
+def test_sender_retries_rate_limited_webhook(httpserver: HTTPServer):
+    """Test that a sender retries a 429 from the webhook after the Retry-After delay"""
+    httpserver.expect_ordered_request("/", method="POST").respond_with_response(
+        Response(status=429, headers={"Retry-After": "1"})
+    )
+    httpserver.expect_ordered_request("/", method="POST").respond_with_response(
+        Response(status=200)
+    )
+    clock = FakeClock()
+    sender = TeamsSender(
+        httpserver.url_for("/"),
+        pool=ConnectionPool(),
+        retry_policy=make_policy(clock),
+    )
+
+    result = sender.send({"type": "message"})
+
+    assert result.success is True
+    assert result.attempts == 2
+    assert clock.sleeps == [1.0]
+    assert len(httpserver.log) == 2
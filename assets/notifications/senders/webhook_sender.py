@@ -0,0 +1,120 @@
+import http.client
+from typing import Dict, Any, Optional
+from .base_sender import MessageSender, DeliveryResult
+from .circuit_breaker import CircuitBreaker, get_circuit_breaker, get_host, is_failure
+from .connection_pool import ConnectionPool, get_connection_pool
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .retry import RetryPolicy, get_retry_policy, parse_retry_after
+from notifications.utils import codec
+from notifications.utils.logging import logger
+
+
+class WebhookSender(MessageSender):
+    """Sends messages as JSON to an incoming webhook.
+
+    The shared implementation behind the platform senders, requests are sent
+    over the container scoped keep-alive connection pool and transient failures
+    are retried according to the retry policy. Every attempt is paced by the
+    rate limiter, when rate limiting is enabled, and refused without being
+    made while the circuit of the webhook host is open.
+    """
+
+    # The display name of the platform, used in error messages
+    platform = "webhook"
+
+    def __init__(
+        self,
+        webhook_url: str,
+        pool: Optional[ConnectionPool] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
+        """Initialize the webhook message sender.
+
+        Args:
+            webhook_url (str): The webhook URL to send messages to.
+            pool (Optional[ConnectionPool]): The connection pool to send requests
+                over, defaults to the container scoped pool.
+            retry_policy (Optional[RetryPolicy]): The policy used to retry failed
+                deliveries, defaults to the container scoped policy.
+            rate_limiter (Optional[RateLimiter]): The limiter used to pace sends to
+                the webhook, defaults to the container scoped limiter if enabled.
+            circuit_breaker (Optional[CircuitBreaker]): The breaker refusing sends to
+                a failing webhook host, defaults to the container scoped breaker if enabled.
+        """
+        self.webhook_url = webhook_url
+        self.pool = pool or get_connection_pool()
+        self.retry_policy = retry_policy or get_retry_policy()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker()
+
+    def send(self, message: Dict[str, Any], priority: bool = False) -> DeliveryResult:
+        """Send a formatted message to the webhook.
+
+        Args:
+            message (Dict[str, Any]): The formatted message payload.
+            priority (bool): Whether the message is sent in the priority lane of
+                the rate limiter.
+
+        Returns:
+            DeliveryResult: The outcome of the delivery, including the HTTP status.
+        """
+        data = codec.dumps(message)
+        result = self.retry_policy.execute(lambda: self._post(data, priority), target=self.platform)
+        result.bytes = len(data)
+
+        # Refused sends are diverted by the caller, the breaker logs its state changes
+        if not result.success and not result.circuit_open:
+            logger.error(
+                f"Error sending message to {self.platform}",
+                extra={
+                    "action": "send",
+                    "platform": self.platform,
+                    "status": result.status,
+                    "error": result.error,
+                    "attempts": result.attempts,
+                }
+            )
+
+        return result
+
+    def _post(self, data: bytes, priority: bool = False) -> DeliveryResult:
+        """Make a single delivery attempt."""
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow(self.webhook_url):
+            return DeliveryResult(
+                success=False,
+                error=f"Circuit open for {get_host(self.webhook_url)}",
+                circuit_open=True,
+            )
+
+        result = self._request(data, priority)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(self.webhook_url, not is_failure(result.status))
+
+        return result
+
+    def _request(self, data: bytes, priority: bool = False) -> DeliveryResult:
+        """Post the message to the webhook."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self.webhook_url, priority=priority)
+
+        try:
+            response = self.pool.request(
+                'POST',
+                self.webhook_url,
+                body=data,
+                headers={'Content-Type': 'application/json'},
+            )
+        except (OSError, http.client.HTTPException) as e:
+            return DeliveryResult(success=False, error=str(e) or type(e).__name__)
+
+        if response.status != 200:
+            return DeliveryResult(
+                success=False,
+                status=response.status,
+                error=f"HTTP Error {response.status}",
+                retry_after=parse_retry_after(response.headers.get("retry-after")),
+            )
+
+        return DeliveryResult(success=True, status=response.status)
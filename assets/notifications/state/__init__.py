@@ -0,0 +1,14 @@
+from notifications.utils.imports import lazy_attributes
+
+# Backends are imported on first use, so only the configured one is loaded
+_ATTRIBUTES = {
+    "StateStore": "base",
+    "MemoryStore": "memory",
+    "SQLiteStore": "sqlite",
+    "DynamoDBStore": "dynamodb",
+    "get_state_store": "factory",
+}
+
+__getattr__ = lazy_attributes(__name__, _ATTRIBUTES)
+
+__all__ = ["StateStore", "MemoryStore", "SQLiteStore", "DynamoDBStore", "get_state_store"]
@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+
+class StateStore(ABC):
+    """
+    Base class for the key value stores holding state shared between
+    invocations, such as the fingerprints of delivered events. Values are JSON
+    serializable dictionaries, and every entry expires after its TTL.
+    """
+
+    # Whether every concurrent container sees the same entries
+    shared = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the value stored under a key, or None if it is missing or expired."""
+        pass
+
+    @abstractmethod
+    def put(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        """Store a value under a key for ttl seconds, replacing any existing value."""
+        pass
+
+    @abstractmethod
+    def add(self, key: str, value: Dict[str, Any], ttl: float) -> bool:
+        """
+        Store a value under a key for ttl seconds, only if the key is missing or
+        expired. Returns whether the value was stored.
+        """
+        pass
+
+    @abstractmethod
+    def increment(self, key: str, ttl: float, amount: int = 1) -> int:
+        """
+        Atomically add amount to the counter stored under a key, and return the
+        new count. A missing or expired counter starts from zero and expires
+        after ttl seconds; incrementing does not extend the expiry. The counter
+        is returned by get as {'count': n}.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a key from the store."""
+        pass
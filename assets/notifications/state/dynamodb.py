@@ -0,0 +1,141 @@
+import time
+from typing import Any, Callable, Dict, Optional
+from notifications.utils import codec
+from .base import StateStore
+
+
+def _is_condition_failure(error: Exception) -> bool:
+    """
+    Return whether a client error is a failed condition check. Errors are
+    matched on their code, so botocore is only imported with the client.
+    """
+    response = getattr(error, "response", None)
+    return isinstance(response, dict) and response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+
+
+class DynamoDBStore(StateStore):
+    """
+    Stores state in a DynamoDB table, shared by every concurrent container.
+    The table has a string partition key named 'pk', and should have its TTL
+    attribute set to 'expires_at' so expired entries are removed. Expiry is
+    also checked on read, as DynamoDB deletes expired items lazily.
+
+    Any client implementing the DynamoDB API can be used, such as DynamoDB
+    Local given through endpoint_url.
+    """
+
+    shared = True
+
+    def __init__(
+        self,
+        table_name: str,
+        client: Optional[Any] = None,
+        endpoint_url: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            table_name: The name of the DynamoDB table
+            client: The DynamoDB client to use, created on first use when not given
+            endpoint_url: An alternative endpoint for the client, such as DynamoDB Local
+            clock: The clock used to expire entries
+        """
+        self.table_name = table_name
+        self.endpoint_url = endpoint_url
+        self._client = client
+        self._clock = clock
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            # Deferred until the table is first used, like the secrets client
+            import boto3
+
+            self._client = boto3.client("dynamodb", endpoint_url=self.endpoint_url or None)
+        return self._client
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        response = self.client.get_item(
+            TableName=self.table_name,
+            Key={"pk": {"S": key}},
+            ConsistentRead=True,
+        )
+        item = response.get("Item")
+        if item is None or float(item["expires_at"]["N"]) <= self._clock():
+            return None
+
+        # Counters are held in a numeric attribute, so they can be updated atomically
+        value = codec.loads(item["value"]["S"]) if "value" in item else {}
+        if "count" in item:
+            value["count"] = int(item["count"]["N"])
+
+        return value
+
+    def put(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        self.client.put_item(TableName=self.table_name, Item=self._item(key, value, ttl))
+
+    def add(self, key: str, value: Dict[str, Any], ttl: float) -> bool:
+        try:
+            self.client.put_item(
+                TableName=self.table_name,
+                Item=self._item(key, value, ttl),
+                ConditionExpression="attribute_not_exists(pk) OR expires_at <= :now",
+                ExpressionAttributeValues={":now": {"N": str(self._clock())}},
+            )
+        except Exception as e:
+            if _is_condition_failure(e):
+                return False
+            raise
+
+        return True
+
+    def increment(self, key: str, ttl: float, amount: int = 1) -> int:
+        now = self._clock()
+        try:
+            response = self.client.update_item(
+                TableName=self.table_name,
+                Key={"pk": {"S": key}},
+                UpdateExpression="SET expires_at = if_not_exists(expires_at, :expires) ADD #count :amount",
+                ConditionExpression="attribute_not_exists(pk) OR expires_at > :now",
+                ExpressionAttributeNames={"#count": "count"},
+                ExpressionAttributeValues={
+                    ":amount": {"N": str(amount)},
+                    ":expires": {"N": str(now + ttl)},
+                    ":now": {"N": str(now)},
+                },
+                ReturnValues="UPDATED_NEW",
+            )
+            return int(response["Attributes"]["count"]["N"])
+        except Exception as e:
+            if not _is_condition_failure(e):
+                raise
+
+        # The counter has expired but has not been removed yet, restart it
+        # unless another container has done so first
+        try:
+            self.client.put_item(
+                TableName=self.table_name,
+                Item={
+                    "pk": {"S": key},
+                    "count": {"N": str(amount)},
+                    "expires_at": {"N": str(now + ttl)},
+                },
+                ConditionExpression="expires_at <= :now",
+                ExpressionAttributeValues={":now": {"N": str(now)}},
+            )
+        except Exception as e:
+            if not _is_condition_failure(e):
+                raise
+            return self.increment(key, ttl, amount)
+
+        return amount
+
+    def delete(self, key: str) -> None:
+        self.client.delete_item(TableName=self.table_name, Key={"pk": {"S": key}})
+
+    def _item(self, key: str, value: Dict[str, Any], ttl: float) -> Dict[str, Any]:
+        return {
+            "pk": {"S": key},
+            "value": {"S": codec.dumps_str(value)},
+            "expires_at": {"N": str(self._clock() + ttl)},
+        }
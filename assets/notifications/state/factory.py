@@ -0,0 +1,59 @@
+import os
+import threading
+from typing import Optional
+from .base import StateStore
+
+STATE_BACKENDS = ("memory", "sqlite", "dynamodb")
+
+_state_store: Optional[StateStore] = None
+_state_store_lock = threading.Lock()
+
+
+def get_state_store() -> StateStore:
+    """
+    Return the container scoped state store, creating it on first use.
+
+    Environment Variables:
+        STATE_BACKEND: The backend to use ('memory', 'sqlite' or 'dynamodb')
+        STATE_SQLITE_PATH: The path of the SQLite database file
+        STATE_TABLE_NAME: The name of the DynamoDB table
+        STATE_DYNAMODB_ENDPOINT: An alternative DynamoDB endpoint, such as DynamoDB Local
+
+    Returns:
+        StateStore: The shared state store
+
+    Raises:
+        ValueError: If the backend is unsupported, or the DynamoDB table is missing
+    """
+    global _state_store
+
+    with _state_store_lock:
+        if _state_store is None:
+            backend_name = os.environ.get("STATE_BACKEND", "memory").lower()
+            if backend_name not in STATE_BACKENDS:
+                raise ValueError(f"Unsupported state backend: {backend_name}")
+
+            # Only the configured backend, and its dependencies, are imported
+            if backend_name == "sqlite":
+                from .sqlite import SQLiteStore
+
+                _state_store = SQLiteStore(
+                    path=os.environ.get("STATE_SQLITE_PATH", "/tmp/notifications-state.db"),
+                )
+            elif backend_name == "dynamodb":
+                table_name = os.environ.get("STATE_TABLE_NAME", "")
+                if not table_name:
+                    raise ValueError("Missing STATE_TABLE_NAME environment variable")
+
+                from .dynamodb import DynamoDBStore
+
+                _state_store = DynamoDBStore(
+                    table_name=table_name,
+                    endpoint_url=os.environ.get("STATE_DYNAMODB_ENDPOINT") or None,
+                )
+            else:
+                from .memory import MemoryStore
+
+                _state_store = MemoryStore()
+
+        return _state_store
@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from .base import StateStore
+
+
+class MemoryStore(StateStore):
+    """
+    Stores state in process, for the lifetime of the container. The least
+    recently used entries are evicted once the store holds max_entries.
+    """
+
+    def __init__(self, max_entries: int = 10000, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            max_entries: The maximum number of entries held by the store
+            clock: The clock used to expire entries
+        """
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return dict(entry[1])
+
+    def put(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def add(self, key: str, value: Dict[str, Any], ttl: float) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                return False
+
+            self._set(key, value, ttl)
+            return True
+
+    def increment(self, key: str, ttl: float, amount: int = 1) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                self._set(key, {"count": amount}, ttl)
+                return amount
+
+            count = entry[1].get("count", 0) + amount
+            self._entries[key] = (entry[0], {**entry[1], "count": count})
+            self._entries.move_to_end(key)
+            return count
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        self._entries[key] = (self._clock() + ttl, dict(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,99 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from notifications.utils import codec
+from .base import StateStore
+
+
+class SQLiteStore(StateStore):
+    """
+    Stores state in a local SQLite file. Under Lambda the file should live in
+    /tmp, where it survives for the lifetime of the container; locally it can
+    be shared by several processes.
+    """
+
+    def __init__(self, path: str = "/tmp/notifications-state.db", clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path: The path of the SQLite database file
+            clock: The clock used to expire entries
+        """
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS state "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM state WHERE key = ? AND expires_at > ?",
+                (key, self._clock()),
+            ).fetchone()
+
+        return codec.loads(row[0]) if row else None
+
+    def put(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, codec.dumps_str(value), self._clock() + ttl),
+            )
+
+    def add(self, key: str, value: Dict[str, Any], ttl: float) -> bool:
+        now = self._clock()
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT INTO state (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+                "WHERE state.expires_at <= ?",
+                (key, codec.dumps_str(value), now + ttl, now),
+            )
+
+        return cursor.rowcount > 0
+
+    def increment(self, key: str, ttl: float, amount: int = 1) -> int:
+        now = self._clock()
+        with self._lock:
+            # Take the write lock up front, so processes sharing the file
+            # cannot interleave the read and the write
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    "SELECT value FROM state WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row is None:
+                    count = amount
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, codec.dumps_str({"count": count}), now + ttl),
+                    )
+                else:
+                    value = codec.loads(row[0])
+                    count = value.get("count", 0) + amount
+                    self._connection.execute(
+                        "UPDATE state SET value = ? WHERE key = ?",
+                        (codec.dumps_str({**value, "count": count}), key),
+                    )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+        return count
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM state WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        """
+        Close the connection to the database file.
+        """
+        with self._lock:
+            self._connection.close()
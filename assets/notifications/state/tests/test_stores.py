@@ -0,0 +1,128 @@
+import pytest
+from botocore.exceptions import ClientError
+from notifications.state import DynamoDBStore, MemoryStore, SQLiteStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class LocalDynamoDB:
+    """
+    Minimal in process stand-in for the DynamoDB client calls made by the store.
+    """
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, TableName, Key, ConsistentRead=False):
+        item = self.items.get(Key["pk"]["S"])
+        return {"Item": item} if item is not None else {}
+
+    def put_item(self, TableName, Item, ConditionExpression=None, ExpressionAttributeValues=None):
+        existing = self.items.get(Item["pk"]["S"])
+        if ConditionExpression is not None and existing is not None:
+            # Both the put if absent and the counter restart conditions hold
+            # only once the existing item has expired
+            now = float(ExpressionAttributeValues[":now"]["N"])
+            if float(existing["expires_at"]["N"]) > now:
+                raise ClientError(
+                    {"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem"
+                )
+        self.items[Item["pk"]["S"]] = Item
+
+    def update_item(self, TableName, Key, UpdateExpression, ConditionExpression,
+                    ExpressionAttributeNames, ExpressionAttributeValues, ReturnValues):
+        existing = self.items.get(Key["pk"]["S"])
+        if existing is not None and float(existing["expires_at"]["N"]) <= float(ExpressionAttributeValues[":now"]["N"]):
+            raise ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem")
+        item = existing or {"pk": Key["pk"], "expires_at": ExpressionAttributeValues[":expires"]}
+        count = int(item.get("count", {"N": "0"})["N"]) + int(ExpressionAttributeValues[":amount"]["N"])
+        item["count"] = {"N": str(count)}
+        self.items[Key["pk"]["S"]] = item
+        return {"Attributes": {"count": item["count"]}}
+
+    def delete_item(self, TableName, Key):
+        self.items.pop(Key["pk"]["S"], None)
+
+
+@pytest.fixture(params=["memory", "sqlite", "dynamodb"])
+def store(request, tmp_path):
+    clock = FakeClock()
+    if request.param == "memory":
+        store = MemoryStore(clock=clock)
+    elif request.param == "sqlite":
+        store = SQLiteStore(path=str(tmp_path / "state.db"), clock=clock)
+    else:
+        store = DynamoDBStore("state", client=LocalDynamoDB(), clock=clock)
+    store.clock = clock
+    return store
+
+
+def test_put_and_get(store):
+    """Test that a stored value is returned until it expires"""
+    store.put("key", {"fingerprint": "a"}, ttl=60)
+
+    assert store.get("key") == {"fingerprint": "a"}
+    assert store.get("missing") is None
+
+    store.clock.now += 61
+    assert store.get("key") is None
+
+
+def test_add_only_stores_missing_or_expired_keys(store):
+    """Test that add behaves as a put if absent, treating expired keys as absent"""
+    assert store.add("key", {"value": 1}, ttl=60) is True
+    assert store.add("key", {"value": 2}, ttl=60) is False
+    assert store.get("key") == {"value": 1}
+
+    store.clock.now += 61
+    assert store.add("key", {"value": 3}, ttl=60) is True
+    assert store.get("key") == {"value": 3}
+
+
+def test_increment(store):
+    """Test that counters are incremented atomically, and restart once expired"""
+    assert store.increment("counter", ttl=60) == 1
+    assert store.increment("counter", ttl=60) == 2
+    assert store.increment("counter", ttl=60, amount=3) == 5
+    assert store.get("counter") == {"count": 5}
+
+    store.clock.now += 61
+    assert store.increment("counter", ttl=60) == 1
+
+
+def test_delete(store):
+    """Test that a deleted key is missing"""
+    store.put("key", {"value": 1}, ttl=60)
+    store.delete("key")
+
+    assert store.get("key") is None
+
+
+def test_memory_store_evicts_least_recently_used():
+    """Test that the memory store evicts the least recently used entry when full"""
+    store = MemoryStore(max_entries=2)
+    store.put("a", {}, ttl=60)
+    store.put("b", {}, ttl=60)
+    store.get("a")
+    store.put("c", {}, ttl=60)
+
+    assert store.get("a") == {}
+    assert store.get("b") is None
+    assert store.get("c") == {}
+
+
+def test_sqlite_store_is_shared_between_connections(tmp_path):
+    """Test that two stores on the same file see each other's entries"""
+    path = str(tmp_path / "state.db")
+    first = SQLiteStore(path=path)
+    second = SQLiteStore(path=path)
+
+    assert first.add("key", {"value": 1}, ttl=60) is True
+    assert second.add("key", {"value": 2}, ttl=60) is False
+    assert second.get("key") == {"value": 1}
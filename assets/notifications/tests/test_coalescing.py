@@ -0,0 +1,131 @@
+import pytest
+from datetime import datetime, timezone
+from notifications.coalescing import Coalescer, get_coalescer
+from notifications.events import NormalizedEvent
+from notifications.events.event_type import EventType
+from notifications.state import MemoryStore, SQLiteStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1200.0
+
+    def __call__(self):
+        return self.now
+
+
+def get_transition(name="Alarm", state="ALARM", region="us-east-1"):
+    """Helper to return a CloudWatch alarm transition"""
+    return NormalizedEvent(
+        event_type=EventType.CLOUDWATCH,
+        severity="critical" if state == "ALARM" else "info",
+        region=region,
+        title=name,
+        description="This is a test alarm",
+        timestamp=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+        source="CloudWatch",
+        details={"current_state": state, "account_id": "123456789012"},
+        raw_event={},
+    )
+
+
+def test_flapping_alarm_is_summarized():
+    """Test that only the first transition of a window is delivered, and the rest summarized once it closes"""
+    clock = FakeClock()
+    coalescer = Coalescer(MemoryStore(clock=clock), window=60, clock=clock)
+
+    states = ["ALARM", "OK"] * 7
+    delivered = [coalescer.coalesce([get_transition(state=state)]) for state in states]
+
+    assert len(delivered[0]) == 1
+    assert all(events == [] for events in delivered[1:])
+    assert coalescer.flush() == []
+
+    clock.now += 60
+    summaries = coalescer.flush()
+
+    assert [summary.title for summary in summaries] == ["Alarm flapped 14 times, now OK"]
+    assert summaries[0].severity == "info"
+    assert summaries[0].details["transitions"] == 14
+    assert coalescer.flush() == []
+    assert coalescer.stats() == {"absorbed": 13, "summaries": 1, "released": 0}
+
+
+def test_released_window_is_flushed_again():
+    """Test that the windows of summaries which were not delivered are summarized by the next flush"""
+    clock = FakeClock()
+    coalescer = Coalescer(MemoryStore(clock=clock), window=60, clock=clock)
+    for state in ["ALARM", "OK", "ALARM"]:
+        coalescer.coalesce([get_transition(state=state)])
+
+    clock.now += 60
+    assert [summary.title for summary in coalescer.flush()] == ["Alarm flapped 3 times, now ALARM"]
+    coalescer.release()
+
+    assert [summary.title for summary in coalescer.flush()] == ["Alarm flapped 3 times, now ALARM"]
+    assert coalescer.flush() == []
+    assert coalescer.stats()["released"] == 1
+
+
+def test_alarms_are_coalesced_by_region():
+    """Test that the same alarm in different regions is coalesced separately"""
+    clock = FakeClock()
+    coalescer = Coalescer(MemoryStore(clock=clock), window=60, clock=clock)
+
+    assert len(coalescer.coalesce([get_transition(region="us-east-1")])) == 1
+    assert len(coalescer.coalesce([get_transition(region="eu-west-2")])) == 1
+
+
+def test_other_events_are_not_coalesced():
+    """Test that events other than CloudWatch alarms are always delivered"""
+    clock = FakeClock()
+    coalescer = Coalescer(MemoryStore(clock=clock), window=60, clock=clock)
+    event = get_transition()
+    event.event_type = EventType.GUARDDUTY
+
+    assert coalescer.coalesce([event, event]) == [event, event]
+
+
+def test_burst_of_alarms_is_rolled_up():
+    """Test that alarms beyond the roll-up threshold are absorbed and summarized together"""
+    clock = FakeClock()
+    coalescer = Coalescer(MemoryStore(clock=clock), window=60, rollup_threshold=3, clock=clock)
+
+    delivered = [
+        event
+        for i in range(10)
+        for event in coalescer.coalesce([get_transition(name=f"Alarm {i}")])
+    ]
+
+    assert [event.title for event in delivered] == ["Alarm 0", "Alarm 1", "Alarm 2"]
+
+    clock.now += 60
+    summaries = coalescer.flush()
+
+    assert [summary.title for summary in summaries] == [f"Alarm {i} is now ALARM" for i in range(3, 10)]
+
+
+def test_window_is_flushed_by_a_single_container(tmp_path):
+    """Test that containers sharing a store coalesce together, and only one flushes a window"""
+    clock = FakeClock()
+    path = str(tmp_path / "state.db")
+    first = Coalescer(SQLiteStore(path=path, clock=clock), window=60, clock=clock)
+    second = Coalescer(SQLiteStore(path=path, clock=clock), window=60, clock=clock)
+
+    assert len(first.coalesce([get_transition(state="ALARM")])) == 1
+    assert second.coalesce([get_transition(state="OK")]) == []
+
+    clock.now += 60
+    summaries = first.flush() + second.flush()
+
+    assert [summary.title for summary in summaries] == ["Alarm flapped 2 times, now OK"]
+
+
+def test_coalescing_requires_a_shared_backend(monkeypatch):
+    """Test that coalescing is refused on a backend other containers cannot see"""
+    monkeypatch.setattr("notifications.coalescing._coalescer", None)
+    monkeypatch.setattr("notifications.state.factory._state_store", MemoryStore())
+    monkeypatch.setenv("COALESCE_WINDOW", "60")
+
+    with pytest.raises(ValueError, match="requires a shared state backend"):
+        get_coalescer()
@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+from notifications.dedup import Deduplicator
+from notifications.events import NormalizedEvent
+from notifications.events.event_type import EventType
+from notifications.state import MemoryStore
+
+
+def get_guardduty_finding(severity="high", updated_at=1, count=1):
+    """Helper to return a GuardDuty finding as re-emitted with a new timestamp and count"""
+    return NormalizedEvent(
+        event_type=EventType.GUARDDUTY,
+        severity=severity,
+        region="us-east-1",
+        title="Unusual API call",
+        description="Potential security threat",
+        timestamp=datetime(2024, 1, 1, 12, updated_at, tzinfo=timezone.utc),
+        source="GuardDuty",
+        details={
+            "finding_id": "finding-id-1",
+            "resource_id": "i-1234567890abcdef0",
+            "count": count,
+        },
+        raw_event={},
+    )
+
+
+def test_unchanged_event_is_a_duplicate():
+    """Test that a finding re-emitted with a new timestamp and count is skipped once delivered"""
+    deduplicator = Deduplicator(MemoryStore(), ttl=60)
+    first = get_guardduty_finding()
+
+    assert deduplicator.is_duplicate(first) is False
+    deduplicator.remember(first)
+
+    assert deduplicator.is_duplicate(get_guardduty_finding(updated_at=5, count=7)) is True
+    assert deduplicator.stats() == {"checked": 2, "duplicates": 1, "duplicate_ratio": 0.5}
+
+
+def test_changed_event_is_delivered():
+    """Test that a change of severity delivers the finding again"""
+    deduplicator = Deduplicator(MemoryStore(), ttl=60)
+    deduplicator.remember(get_guardduty_finding())
+
+    assert deduplicator.is_duplicate(get_guardduty_finding(severity="critical")) is False
+
+
+def test_expired_event_is_delivered():
+    """Test that an unchanged finding is delivered again once the TTL has expired"""
+    now = [1000.0]
+    deduplicator = Deduplicator(MemoryStore(clock=lambda: now[0]), ttl=60)
+    deduplicator.remember(get_guardduty_finding())
+
+    now[0] += 61
+    assert deduplicator.is_duplicate(get_guardduty_finding()) is False
+
+
+def test_events_without_finding_id_are_identified_by_title():
+    """Test that events without a finding id are identified by title, region and resources"""
+    deduplicator = Deduplicator(MemoryStore(), ttl=60)
+    event = get_guardduty_finding()
+    event.details.pop("finding_id")
+    other = get_guardduty_finding()
+    other.details.pop("finding_id")
+    other.title = "Another finding"
+
+    assert deduplicator.identity(event) != deduplicator.identity(other)
+    deduplicator.remember(event)
+    assert deduplicator.filter([event, other]) == [other]
+
+
+def get_alarm(account_id):
+    """Helper to return a CloudWatch alarm of an account"""
+    return NormalizedEvent(
+        event_type=EventType.CLOUDWATCH,
+        severity="critical",
+        region="us-east-1",
+        title="HighCPU",
+        description=None,
+        timestamp=datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+        source="CloudWatch",
+        details={"current_state": "ALARM", "account_id": account_id},
+        raw_event={},
+    )
+
+
+def get_key_deletion(key_id):
+    """Helper to return the scheduled deletion of a KMS key"""
+    return NormalizedEvent(
+        event_type=EventType.KMS_DELETION,
+        severity="critical",
+        region="us-east-1",
+        title="KMS CMK Deletion",
+        description="No description provided",
+        timestamp=datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+        source="KMS",
+        details={
+            "key_arn": f"arn:aws:kms:us-east-1:123456789012:key/{key_id}",
+            "key_id": key_id,
+        },
+        raw_event={},
+    )
+
+
+def test_alarms_of_different_accounts_are_not_duplicates():
+    """Test that alarms sharing a name in different accounts are delivered separately"""
+    deduplicator = Deduplicator(MemoryStore(), ttl=60)
+    deduplicator.remember(get_alarm("111111111111"))
+
+    assert deduplicator.is_duplicate(get_alarm("111111111111")) is True
+    assert deduplicator.is_duplicate(get_alarm("222222222222")) is False
+
+
+def test_deletions_of_different_keys_are_not_duplicates():
+    """Test that the deletions of different KMS keys, which share a title, are delivered separately"""
+    deduplicator = Deduplicator(MemoryStore(), ttl=60)
+    deduplicator.remember(get_key_deletion("key-1"))
+
+    assert deduplicator.is_duplicate(get_key_deletion("key-1")) is True
+    assert deduplicator.is_duplicate(get_key_deletion("key-2")) is False
@@ -0,0 +1,170 @@
+import json
+import pytest
+from notifications.events import EventParser
+from notifications.events.event_type import EventType
+from notifications.filtering import EventFilter, get_event_filter
+
+
+def get_record(message):
+    """Helper to wrap a message in an SNS record"""
+    return {"EventSource": "aws:sns", "Sns": {"Message": json.dumps(message)}}
+
+
+def get_guardduty_finding(score, account="123456789012"):
+    """Helper to return a GuardDuty finding with a numeric severity score"""
+    return {
+        "detail-type": "GuardDuty Finding",
+        "source": "aws.guardduty",
+        "account": account,
+        "detail": {
+            "severity": score,
+            "title": "Unusual API call",
+            "region": "us-east-1",
+            "updatedAt": "2024-03-21T12:00:00Z",
+        },
+    }
+
+
+def get_security_hub_event(*labels):
+    """Helper to return a Security Hub event carrying a finding of each severity label"""
+    return {
+        "detail-type": "Security Hub Findings - Imported",
+        "source": "aws.securityhub",
+        "account": "123456789012",
+        "detail": {
+            "findings": [
+                {
+                    "Title": f"Finding {i}",
+                    "Description": "Security issue detected",
+                    "Severity": {"Label": label},
+                    "UpdatedAt": "2024-03-21T12:00:00Z",
+                }
+                for i, label in enumerate(labels)
+            ]
+        },
+    }
+
+
+def check(event_filter, message):
+    """Helper to classify a message and check it against a filter"""
+    envelope, parser = EventParser().classify(get_record(message))
+    return event_filter.check(envelope.message, parser.event_type, parser)
+
+
+@pytest.mark.parametrize(
+    "score, severity",
+    [(2.0, "low"), (5.3, "medium"), (7.8, "high"), (8.0, "critical"), (8.9, "critical")],
+)
+def test_guardduty_scores_are_bucketed(score, severity):
+    """Test that fractional GuardDuty scores are bucketed by range, both before and after parsing"""
+    envelope, parser = EventParser().classify(get_record(get_guardduty_finding(score)))
+
+    assert parser.peek_severity(envelope.message) == severity
+    assert parser.parse(envelope).severity == severity
+
+
+def test_records_below_the_minimum_severity_are_dropped():
+    """Test that records are dropped on the severity peeked before parsing"""
+    event_filter = EventFilter(min_severity={"GUARDDUTY": "high"})
+
+    assert check(event_filter, get_guardduty_finding(5.3)) == "severity"
+    assert check(event_filter, get_guardduty_finding(7.8)) is None
+    assert event_filter.stats() == {
+        "checked": 2,
+        "dropped": 1,
+        "dropped_source": 0,
+        "dropped_account": 0,
+        "dropped_severity": 1,
+    }
+
+
+def test_default_minimum_severity_applies_to_other_types():
+    """Test that '*' applies to the event types without a minimum severity of their own"""
+    event_filter = EventFilter(min_severity={"*": "critical", "SECURITY_HUB": "low"})
+
+    assert event_filter.min_rank(EventType.GUARDDUTY) == event_filter.min_rank("KMS")
+    assert check(event_filter, get_guardduty_finding(7.8)) == "severity"
+    assert check(event_filter, get_security_hub_event("LOW")) is None
+
+
+def test_unknown_minimum_severity_is_rejected():
+    """Test that a misspelt minimum severity fails loudly rather than filtering nothing"""
+    with pytest.raises(ValueError, match="Unknown minimum severity"):
+        EventFilter(min_severity={"GUARDDUTY": "severe"})
+
+
+def test_records_are_filtered_by_source_and_account():
+    """Test the include and exclude lists of sources and accounts"""
+    event_filter = EventFilter(exclude_sources=["aws.guardduty"], include_accounts=["123456789012"])
+
+    assert check(event_filter, get_guardduty_finding(8.0)) == "source"
+    assert check(event_filter, {**get_security_hub_event("HIGH"), "account": "210987654321"}) == "account"
+    assert check(event_filter, get_security_hub_event("HIGH")) is None
+
+
+def test_records_without_source_or_account_are_kept():
+    """Test that an SNS alarm notification, which has neither field, passes the source and account filters"""
+    event_filter = EventFilter(include_sources=["aws.securityhub"], include_accounts=["123456789012"])
+    alarm = {
+        "AlarmName": "High CPU",
+        "NewStateValue": "ALARM",
+        "NewStateReason": "Threshold crossed",
+        "StateChangeTime": "2024-03-21T12:00:00.000+0000",
+        "Region": "us-east-1",
+        "Trigger": {},
+    }
+
+    assert check(event_filter, alarm) is None
+
+
+def test_mixed_security_hub_findings_are_filtered_after_parsing():
+    """
+    Test that a Security Hub event is only dropped when all its findings are
+    below the minimum severity, the low findings of a mixed event are dropped
+    once parsed.
+    """
+    event_filter = EventFilter(min_severity={"SECURITY_HUB": "high"})
+
+    assert check(event_filter, get_security_hub_event("LOW", "MEDIUM")) == "severity"
+
+    mixed = get_security_hub_event("LOW", "CRITICAL", "MEDIUM", "HIGH")
+    assert check(event_filter, mixed) is None
+
+    envelope, parser = EventParser().classify(get_record(mixed))
+    kept = event_filter.filter(parser.parse_all(envelope))
+
+    assert [event.title for event in kept] == ["Finding 1", "Finding 3"]
+    assert event_filter.stats()["dropped_severity"] == 3
+
+
+def test_event_filter_is_read_from_the_environment(monkeypatch):
+    """Test that EVENT_FILTER is parsed once, with Terraform's unset attributes ignored"""
+    monkeypatch.setattr("notifications.filtering._event_filter", None)
+    monkeypatch.setenv(
+        "EVENT_FILTER",
+        json.dumps({"min_severity": {"GUARDDUTY": "medium"}, "include_sources": None, "exclude_accounts": ["1"]}),
+    )
+
+    event_filter = get_event_filter()
+
+    assert event_filter is get_event_filter()
+    assert event_filter.include_sources is None
+    assert event_filter.exclude_accounts == frozenset({"1"})
+    assert event_filter.min_rank(EventType.GUARDDUTY) > 0
+
+
+def test_event_filter_is_disabled_by_default(monkeypatch):
+    """Test that no filter is created unless EVENT_FILTER is set"""
+    monkeypatch.setattr("notifications.filtering._event_filter", None)
+    monkeypatch.delenv("EVENT_FILTER", raising=False)
+
+    assert get_event_filter() is None
+
+
+def test_unknown_event_filter_setting_is_rejected(monkeypatch):
+    """Test that an unknown setting raises a ValueError naming it"""
+    monkeypatch.setattr("notifications.filtering._event_filter", None)
+    monkeypatch.setenv("EVENT_FILTER", json.dumps({"min_severities": {"*": "high"}}))
+
+    with pytest.raises(ValueError, match="Invalid EVENT_FILTER"):
+        get_event_filter()
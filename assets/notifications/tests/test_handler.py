@@ -1,4 +1,5 @@
 import json
+import logging
 import pytest
 import sys
 from pathlib import Path
@@ -13,6 +14,10 @@ if assets_dir not in sys.path:
 
 from notifications.handler import lambda_handler
 from notifications.events import EventParser
+from notifications.utils import secrets as secrets_module
+from notifications.formatters import SlackFormatter
+from notifications.utils.logging import logger
+from unittest.mock import patch
 
 
 class TestLambdaFunction:
@@ -180,7 +185,7 @@ class TestLambdaFunction:
 
         # Verify the response
         assert response["statusCode"] == 200
-        assert response["body"] == '{"message": "Notification sent successfully"}'
+        assert response["body"] == '{"message":"Notification sent successfully"}'
 
         # Verify that the webhook received exactly one request
         assert len(httpserver.log) == 1
@@ -190,3 +195,541 @@ class TestLambdaFunction:
         assert request.headers["Content-Type"] == "application/json"
         payload = json.loads(request.get_data(as_text=True))
         assert payload is not None
+
+    def get_cloudwatch_alarm(self, name):
+        """Helper to return a CloudWatch alarm message"""
+        return {
+            "AlarmName": name,
+            "AlarmDescription": "This is a test alarm",
+            "NewStateValue": "ALARM",
+            "OldStateValue": "OK",
+            "StateChangeTime": "2024-03-21T12:00:00Z",
+            "NewStateReason": "Threshold crossed",
+            "Region": "us-east-1",
+        }
+
+    def test_multiple_records_are_delivered(self, httpserver: HTTPServer):
+        """
+        Test that every record in a batched SNS delivery is sent to the webhook,
+        not only the first one.
+        """
+        test_event = {
+            "Records": [
+                self.get_sns_event(self.get_cloudwatch_alarm(f"Alarm {i}"))["Records"][0]
+                for i in range(5)
+            ]
+        }
+
+        response = lambda_handler(test_event, None)
+
+        assert response["statusCode"] == 200
+        assert len(httpserver.log) == 5
+        assert [result["index"] for result in response["results"]] == list(range(5))
+        assert all(result["success"] for result in response["results"])
+
+        titles = sorted(
+            json.loads(request.get_data(as_text=True))["blocks"][0]["text"]["text"]
+            for request, _ in httpserver.log
+        )
+        assert titles == sorted(f"📊 Alarm {i}" for i in range(5))
+
+    def test_failed_record_is_isolated(self, httpserver: HTTPServer):
+        """
+        Test that a record which cannot be parsed does not prevent the other
+        records from being delivered, and is reported in the result summary.
+        """
+        test_event = {
+            "Records": [
+                self.get_sns_event(self.get_cloudwatch_alarm("Good Alarm"))["Records"][0],
+                self.get_sns_event({"some": "data"})["Records"][0],
+            ]
+        }
+
+        response = lambda_handler(test_event, None)
+
+        assert response["statusCode"] == 500
+        assert len(httpserver.log) == 1
+        assert response["results"][0]["success"] is True
+        assert response["results"][1]["success"] is False
+        assert response["results"][1]["error"] == "Unknown event type"
+
+    def test_webhook_secret_is_cached_and_refreshed_on_rotation(self, httpserver: HTTPServer, monkeypatch):
+        """
+        Test that the webhook secret is cached across invocations, and refreshed
+        when the webhook rejects a message because it has been rotated.
+        """
+        secret_arn = "arn:aws:secretsmanager:us-east-1:123456789012:secret:webhook"
+        state = {"webhook_url": httpserver.url_for("/old"), "old_status": 200}
+
+        def secret_response(request: Request) -> Response:
+            return Response(
+                json.dumps({"SecretString": json.dumps({"webhook_url": state["webhook_url"]})}),
+                status=200,
+                content_type="application/json",
+            )
+
+        httpserver.expect_request("/secretsmanager/get").respond_with_handler(secret_response)
+        httpserver.expect_request("/old", method="POST").respond_with_handler(
+            lambda request: Response(status=state["old_status"])
+        )
+        httpserver.expect_request("/new", method="POST").respond_with_response(Response(status=200))
+
+        monkeypatch.setattr(secrets_module, "_secret_cache", None)
+        os.environ.pop("WEBHOOK_URL")
+        os.environ["WEBHOOK_ARN"] = secret_arn
+        os.environ["SECRETS_BACKEND"] = "extension"
+        os.environ["PARAMETERS_SECRETS_EXTENSION_HTTP_PORT"] = str(httpserver.port)
+
+        test_event = self.get_sns_event(self.get_cloudwatch_alarm("Test Alarm"))
+
+        # The cached webhook works, so the secret is only retrieved once
+        assert lambda_handler(test_event, None)["statusCode"] == 200
+        assert lambda_handler(test_event, None)["statusCode"] == 200
+        assert secrets_module.get_secret_cache().stats() == {"hits": 1, "misses": 1}
+
+        # The webhook is rotated, the stale URL is rejected and the secret refreshed,
+        # the following records of the invocation are sent to the rotated URL
+        state.update(webhook_url=httpserver.url_for("/new"), old_status=404)
+        os.environ["DELIVERY_CONCURRENCY"] = "1"
+        assert lambda_handler({"Records": test_event["Records"] * 2}, None)["statusCode"] == 200
+        assert lambda_handler(test_event, None)["statusCode"] == 200
+        assert secrets_module.get_secret_cache().stats() == {"hits": 3, "misses": 2}
+
+        paths = [request.path for request, _ in httpserver.log if request.method == "POST"]
+        assert paths == ["/old", "/old", "/old", "/new", "/new", "/new"]
+
+    def test_fan_out_to_multiple_destinations(self, httpserver: HTTPServer):
+        """
+        Test that each record is delivered to every destination, and formatted
+        once per platform rather than once per destination.
+        """
+        for path in ["/slack-a", "/slack-b", "/teams"]:
+            httpserver.expect_request(path, method="POST").respond_with_response(Response(status=200))
+
+        os.environ["DESTINATIONS"] = json.dumps([
+            {"name": "security", "platform": "slack", "webhook_url": httpserver.url_for("/slack-a")},
+            {"name": "platform", "platform": "slack", "webhook_url": httpserver.url_for("/slack-b")},
+            {"name": "operations", "platform": "teams", "webhook_url": httpserver.url_for("/teams")},
+        ])
+        test_event = self.get_sns_event(self.get_cloudwatch_alarm("Test Alarm"))
+
+        with patch.object(SlackFormatter, "format", autospec=True, side_effect=SlackFormatter.format) as slack_format:
+            response = lambda_handler(test_event, None)
+
+        assert response["statusCode"] == 200
+        assert response["results"][0]["destinations"] == {
+            "security": True,
+            "platform": True,
+            "operations": True,
+        }
+        assert slack_format.call_count == 1
+
+        requests = {request.path: json.loads(request.get_data(as_text=True)) for request, _ in httpserver.log}
+        assert set(requests) == {"/slack-a", "/slack-b", "/teams"}
+        assert requests["/slack-a"] == requests["/slack-b"]
+        assert requests["/teams"]["type"] == "message"
+        message_bytes = response["results"][0]["message_bytes"]
+        assert message_bytes["security"] == [len(request.get_data()) for request, _ in httpserver.log if request.path == "/slack-a"]
+        assert message_bytes["security"] == message_bytes["platform"]
+
+    def test_events_are_routed_to_their_destinations(self, httpserver: HTTPServer, monkeypatch):
+        """
+        Test that the findings of a record are delivered to the destinations
+        their routing rules select, and that muted findings are dropped.
+        """
+        monkeypatch.setattr("notifications.routing._router", None)
+        for path in ["/security", "/platform"]:
+            httpserver.expect_request(path, method="POST").respond_with_response(Response(status=200))
+
+        os.environ["DESTINATIONS"] = json.dumps([
+            {"name": "security", "platform": "slack", "webhook_url": httpserver.url_for("/security")},
+            {"name": "platform", "platform": "slack", "webhook_url": httpserver.url_for("/platform")},
+        ])
+        os.environ["ROUTING_RULES"] = json.dumps({
+            "rules": [
+                {"name": "critical", "destinations": ["security"], "severities": ["critical"]},
+                {"name": "sandbox", "mute": True, "accounts": ["210987654321"]},
+            ],
+            "default_destinations": ["platform"],
+        })
+        test_event = self.get_sns_event(
+            {
+                "detail-type": "Security Hub Findings - Imported",
+                "detail": {
+                    "findings": [
+                        {
+                            "Title": f"Finding {i}",
+                            "Description": "Security issue detected",
+                            "Severity": {"Label": label},
+                            "AwsAccountId": account,
+                            "UpdatedAt": "2024-03-21T12:00:00Z",
+                        }
+                        for i, (label, account) in enumerate([
+                            ("CRITICAL", "123456789012"),
+                            ("LOW", "123456789012"),
+                            ("CRITICAL", "210987654321"),
+                        ])
+                    ]
+                },
+            }
+        )
+
+        response = lambda_handler(test_event, None)
+
+        assert response["statusCode"] == 200
+        assert response["results"][0]["destinations"] == {"security": True, "platform": True}
+        assert response["results"][0]["muted"] == 1
+
+        requests = {request.path: json.loads(request.get_data(as_text=True)) for request, _ in httpserver.log}
+        assert set(requests) == {"/security", "/platform"}
+        assert "Finding 0" in requests["/security"]["blocks"][0]["text"]["text"]
+        assert "Finding 1" in requests["/platform"]["blocks"][0]["text"]["text"]
+
+    def test_open_circuit_diverts_to_fallback(self, httpserver: HTTPServer, monkeypatch):
+        """
+        Test that messages refused by the open circuit of a destination are
+        delivered to its fallback instead.
+        """
+        monkeypatch.setattr("notifications.senders.circuit_breaker._circuit_breaker", None)
+        os.environ["CIRCUIT_BREAKER_FAILURE_RATE"] = "0.5"
+        os.environ["CIRCUIT_BREAKER_MIN_CALLS"] = "1"
+        httpserver.expect_request("/broken", method="POST").respond_with_response(Response(status=503))
+
+        os.environ["DESTINATIONS"] = json.dumps([
+            {"name": "primary", "platform": "slack", "webhook_url": httpserver.url_for("/broken"), "fallback": "backup"},
+            # A different host, so its circuit is not opened by the primary failing
+            {"name": "backup", "platform": "slack", "webhook_url": httpserver.url_for("/").replace("localhost", "127.0.0.1")},
+        ])
+        test_event = self.get_sns_event(self.get_cloudwatch_alarm("Test Alarm"))
+
+        response = lambda_handler(test_event, None)
+
+        assert response["statusCode"] == 200
+        assert response["results"][0]["destinations"] == {"primary": True, "backup": True}
+        assert response["results"][0]["diverted"] == {"primary": "backup"}
+        assert [request.path for request, _ in httpserver.log].count("/broken") == 1
+
+    def test_open_circuit_spills_and_replays(self, httpserver: HTTPServer, monkeypatch, tmp_path):
+        """
+        Test that messages refused by an open circuit are spilled to disk,
+        reported as failed, and replayed once the destination accepts a message again.
+        """
+        from notifications.senders.circuit_breaker import CircuitBreaker
+
+        now = [0.0]
+        breaker = CircuitBreaker(failure_rate=0.5, min_calls=1, cooldown=30, clock=lambda: now[0])
+        monkeypatch.setattr("notifications.senders.circuit_breaker._circuit_breaker", breaker)
+        monkeypatch.setattr("notifications.senders.spill_queue._spill_queue", None)
+        os.environ["CIRCUIT_BREAKER_FAILURE_RATE"] = "0.5"
+        os.environ["SPILL_DIRECTORY"] = str(tmp_path)
+
+        failing = [True]
+        httpserver.expect_request("/flaky", method="POST").respond_with_handler(
+            lambda request: Response(status=503 if failing[0] else 200)
+        )
+        os.environ["WEBHOOK_URL"] = httpserver.url_for("/flaky")
+
+        first = lambda_handler(self.get_sns_event(self.get_cloudwatch_alarm("First Alarm")), None)
+
+        assert first["statusCode"] == 500
+        assert first["results"][0]["success"] is False
+        assert first["results"][0]["diverted"] == {"default": "spill_queue"}
+
+        # The endpoint recovers, and the cooldown elapses
+        failing[0] = False
+        now[0] += 30
+        second = lambda_handler(self.get_sns_event(self.get_cloudwatch_alarm("Second Alarm")), None)
+
+        assert second["statusCode"] == 200
+        assert "diverted" not in second["results"][0]
+        titles = [
+            json.loads(request.get_data(as_text=True))["blocks"][0]["text"]["text"]
+            for request, response in httpserver.log
+            if response.status_code == 200
+        ]
+        assert titles == ["📊 Second Alarm", "📊 First Alarm"]
+
+    def test_open_circuit_leaves_sqs_messages_to_be_redelivered(self, httpserver: HTTPServer, monkeypatch, tmp_path):
+        """
+        Test that the messages of SQS records refused by an open circuit are
+        reported for redelivery, rather than spilled to disk.
+        """
+        monkeypatch.setattr("notifications.senders.circuit_breaker._circuit_breaker", None)
+        monkeypatch.setattr("notifications.senders.spill_queue._spill_queue", None)
+        os.environ["CIRCUIT_BREAKER_FAILURE_RATE"] = "0.5"
+        os.environ["CIRCUIT_BREAKER_MIN_CALLS"] = "1"
+        os.environ["SPILL_DIRECTORY"] = str(tmp_path)
+        httpserver.expect_request("/broken", method="POST").respond_with_response(Response(status=503))
+        os.environ["WEBHOOK_URL"] = httpserver.url_for("/broken")
+
+        body = json.dumps(self.get_cloudwatch_alarm("Test Alarm"))
+        test_event = {"Records": [{"messageId": "message-0", "eventSource": "aws:sqs", "body": body}]}
+
+        response = lambda_handler(test_event, None)
+
+        assert response["batchItemFailures"] == [{"itemIdentifier": "message-0"}]
+        assert response["results"][0]["event_type"] == "CLOUDWATCH"
+        assert "diverted" not in response["results"][0]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_destination_is_reported(self, httpserver: HTTPServer):
+        """
+        Test that a failing destination does not prevent delivery to the others
+        """
+        httpserver.expect_request("/broken", method="POST").respond_with_response(Response(status=400))
+
+        os.environ["DESTINATIONS"] = json.dumps([
+            {"name": "working", "platform": "slack", "webhook_url": httpserver.url_for("/")},
+            {"name": "broken", "platform": "slack", "webhook_url": httpserver.url_for("/broken")},
+        ])
+        test_event = self.get_sns_event(self.get_cloudwatch_alarm("Test Alarm"))
+
+        response = lambda_handler(test_event, None)
+
+        assert response["statusCode"] == 500
+        assert response["results"][0]["destinations"] == {"working": True, "broken": False}
+        assert response["results"][0]["error"] == "broken: HTTP Error 400"
+
+    def test_sqs_batch_reports_failed_messages(self, httpserver: HTTPServer):
+        """
+        Test that a batch delivered by SQS is processed, and only the failed
+        messages are reported for redelivery
+        """
+        def get_sqs_record(message_id, body):
+            return {"messageId": message_id, "eventSource": "aws:sqs", "body": body}
+
+        test_event = {
+            "Records": [
+                get_sqs_record("message-0", json.dumps({
+                    "Type": "Notification",
+                    "MessageId": "sns-0",
+                    "Message": json.dumps(self.get_cloudwatch_alarm("Alarm 0")),
+                })),
+                get_sqs_record("message-1", "not json"),
+                get_sqs_record("message-2", json.dumps(self.get_cloudwatch_alarm("Alarm 2"))),
+            ]
+        }
+
+        response = lambda_handler(test_event, None)
+
+        assert response["statusCode"] == 500
+        assert response["batchItemFailures"] == [{"itemIdentifier": "message-1"}]
+        assert [result["success"] for result in response["results"]] == [True, False, True]
+        assert len(httpserver.log) == 2
+
+    def test_sns_response_has_no_batch_item_failures(self, httpserver: HTTPServer):
+        """
+        Test that the partial batch response is only returned to SQS
+        """
+        response = lambda_handler(self.get_sns_event(self.get_cloudwatch_alarm("Test Alarm")), None)
+
+        assert "batchItemFailures" not in response
+
+    def test_stage_metrics_are_emitted(self, httpserver: HTTPServer):
+        """
+        Test that every invocation emits a single EMF line timing each stage
+        """
+        lines = []
+        capture = logging.Handler()
+        capture.emit = lambda record: lines.append(record)
+        logger.addHandler(capture)
+        try:
+            response = lambda_handler(self.get_sns_event(self.get_cloudwatch_alarm("Test Alarm")), None)
+        finally:
+            logger.removeHandler(capture)
+
+        assert response["statusCode"] == 200
+        metrics = [record for record in lines if hasattr(record, "_aws")]
+        assert len(metrics) == 1
+        record = metrics[0]
+        assert (record.EventType, record.Platform, record.Outcome) == ("CLOUDWATCH", "slack", "Success")
+        assert record._aws["CloudWatchMetrics"][0]["Dimensions"] == [["EventType", "Platform", "Outcome"]]
+        for metric in ["ConfigLoadTime", "ClassifyTime", "ParseTime", "FormatTime", "SendTime"]:
+            assert getattr(record, metric) > 0
+
+    def test_security_hub_findings_are_delivered_as_digest(self, httpserver: HTTPServer):
+        """
+        Test that all the findings of a Security Hub event are delivered in a
+        single digest message, rather than one message per finding.
+        """
+        test_event = self.get_sns_event(
+            {
+                "detail-type": "Security Hub Findings - Imported",
+                "detail": {
+                    "findings": [
+                        {
+                            "Title": f"Finding {i}",
+                            "Description": "Security issue detected",
+                            "Severity": {"Label": "HIGH"},
+                            "UpdatedAt": "2024-03-21T12:00:00Z",
+                            "Resources": [{"Type": "AwsS3Bucket", "Id": "arn:aws:s3:::bucket"}],
+                        }
+                        for i in range(10)
+                    ]
+                },
+            }
+        )
+
+        response = lambda_handler(test_event, None)
+
+        assert response["statusCode"] == 200
+        assert response["results"][0]["events"] == 10
+        assert len(httpserver.log) == 1
+
+        payload = json.loads(httpserver.log[0][0].get_data(as_text=True))
+        assert payload["blocks"][0]["text"]["text"] == "🔒 Security Alert digest: 10 findings"
+
+    def test_eventbridge_event_is_delivered_directly(self, httpserver: HTTPServer):
+        """
+        Test that an event delivered by an EventBridge rule targeting the
+        function is parsed as if it had been published through SNS
+        """
+        test_event = {
+            "version": "0",
+            "id": "c7f1a1d2-5b2c-4b0e-9d3f-0a1b2c3d4e5f",
+            "detail-type": "Security Hub Findings - Imported",
+            "source": "aws.securityhub",
+            "account": "123456789012",
+            "time": "2024-03-21T12:00:00Z",
+            "region": "us-east-1",
+            "detail": {
+                "findings": [
+                    {
+                        "Title": "S3 bucket is public",
+                        "Description": "Security issue detected",
+                        "Severity": {"Label": "HIGH"},
+                        "UpdatedAt": "2024-03-21T12:00:00Z",
+                        "Resources": [{"Type": "AwsS3Bucket", "Id": "arn:aws:s3:::bucket"}],
+                    }
+                ]
+            },
+        }
+
+        response = lambda_handler(test_event, None)
+
+        assert response["statusCode"] == 200
+        assert response["results"][0]["message_id"] == "c7f1a1d2-5b2c-4b0e-9d3f-0a1b2c3d4e5f"
+        assert response["results"][0]["event_type"] == "SECURITY_HUB"
+        assert "batchItemFailures" not in response
+        assert len(httpserver.log) == 1
+
+    def test_duplicate_events_are_skipped(self, httpserver: HTTPServer, monkeypatch):
+        """
+        Test that an event already delivered unchanged is skipped when
+        deduplication is enabled, and counted in the result summary.
+        """
+        from notifications import dedup as dedup_module
+
+        monkeypatch.setattr(dedup_module, "_deduplicator", None)
+        monkeypatch.setattr("notifications.state.factory._state_store", None)
+        os.environ["DEDUP_TTL"] = "60"
+        os.environ["STATE_BACKEND"] = "memory"
+
+        test_event = self.get_sns_event(self.get_cloudwatch_alarm("Duplicate Alarm"))
+
+        first = lambda_handler(test_event, None)
+        second = lambda_handler(test_event, None)
+
+        assert first["statusCode"] == 200
+        assert second["statusCode"] == 200
+        assert second["results"][0]["duplicates"] == 1
+        assert len(httpserver.log) == 1
+
+    def test_filtered_records_are_not_delivered(self, httpserver: HTTPServer, monkeypatch):
+        """
+        Test that records below the minimum severity are acknowledged without
+        being parsed or sent, while the others are delivered.
+        """
+        monkeypatch.setattr("notifications.filtering._event_filter", None)
+        os.environ["EVENT_FILTER"] = json.dumps({"min_severity": {"CLOUDWATCH": "high"}})
+
+        resolved = self.get_cloudwatch_alarm("Resolved Alarm")
+        resolved["NewStateValue"] = "OK"
+        test_event = {
+            "Records": [
+                self.get_sns_event(resolved)["Records"][0],
+                self.get_sns_event(self.get_cloudwatch_alarm("Firing Alarm"))["Records"][0],
+            ]
+        }
+
+        response = lambda_handler(test_event, None)
+
+        assert response["statusCode"] == 200
+        assert response["results"][0]["success"] is True
+        assert response["results"][0]["filtered"] == "severity"
+        assert "events" not in response["results"][0]
+        assert "filtered" not in response["results"][1]
+        assert len(httpserver.log) == 1
+
+    def test_flapping_alarm_is_coalesced(self, httpserver: HTTPServer, monkeypatch):
+        """
+        Test that the transitions of a flapping alarm are absorbed, and delivered
+        as a single summary once the coalescing window has closed.
+        """
+        from notifications import coalescing as coalescing_module
+        from notifications.coalescing import Coalescer
+        from notifications.state import MemoryStore
+
+        now = [1200.0]
+        coalescer = Coalescer(MemoryStore(clock=lambda: now[0]), window=60, clock=lambda: now[0])
+        monkeypatch.setattr(coalescing_module, "_coalescer", coalescer)
+        os.environ["COALESCE_WINDOW"] = "60"
+
+        for state in ["ALARM", "OK", "ALARM", "OK"]:
+            alarm = self.get_cloudwatch_alarm("Flapping Alarm")
+            alarm["NewStateValue"] = state
+            response = lambda_handler(self.get_sns_event(alarm), None)
+            assert response["statusCode"] == 200
+
+        assert len(httpserver.log) == 1
+
+        # Only the scheduled flush delivers the summaries of closed windows
+        now[0] += 60
+        with patch.object(coalescer, "flush", wraps=coalescer.flush) as flush:
+            lambda_handler(self.get_sns_event(self.get_cloudwatch_alarm("Other Alarm")), None)
+        assert flush.call_count == 0
+
+        response = lambda_handler({"action": "flush"}, None)
+
+        assert response["statusCode"] == 200
+        assert response["results"][0]["summary"] is True
+        assert len(httpserver.log) == 3
+
+        payload = json.loads(httpserver.log[2][0].get_data(as_text=True))
+        assert payload["blocks"][0]["text"]["text"] == "📊 Flapping Alarm flapped 4 times, now OK"
+
+    def test_undelivered_coalesced_summary_is_flushed_again(self, httpserver: HTTPServer, monkeypatch):
+        """
+        Test that the transitions absorbed into a summary which fails to be
+        delivered are summarized again by the next flush, rather than lost.
+        """
+        from notifications import coalescing as coalescing_module
+        from notifications.coalescing import Coalescer
+        from notifications.state import MemoryStore
+
+        now = [1200.0]
+        coalescer = Coalescer(MemoryStore(clock=lambda: now[0]), window=60, clock=lambda: now[0])
+        monkeypatch.setattr(coalescing_module, "_coalescer", coalescer)
+        os.environ["COALESCE_WINDOW"] = "60"
+
+        for state in ["ALARM", "OK"]:
+            alarm = self.get_cloudwatch_alarm("Flapping Alarm")
+            alarm["NewStateValue"] = state
+            assert lambda_handler(self.get_sns_event(alarm), None)["statusCode"] == 200
+
+        now[0] += 60
+        os.environ["WEBHOOK_URL"] = httpserver.url_for("/unavailable")
+        httpserver.expect_request("/unavailable", method="POST").respond_with_response(Response(status=400))
+        response = lambda_handler({"action": "flush"}, None)
+
+        assert response["statusCode"] == 500
+        assert response["results"][0]["summary"] is True
+        assert coalescer.stats()["released"] == 1
+
+        os.environ["WEBHOOK_URL"] = httpserver.url_for("/")
+        response = lambda_handler({"action": "flush"}, None)
+
+        assert response["statusCode"] == 200
+        assert response["results"][0]["summary"] is True
+        payload = json.loads(httpserver.log[-1][0].get_data(as_text=True))
+        assert payload["blocks"][0]["text"]["text"] == "📊 Flapping Alarm flapped 2 times, now OK"
@@ -0,0 +1,103 @@
+import os
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ASSETS_DIR = str(Path(__file__).parent.parent.parent)
+
+# The cumulative import time of the handler, in milliseconds, allowed on a
+# cold start, such as 150. Importing boto3 alone takes longer than that. Wall
+# clock timings vary on shared runners, so the budget is only checked when set.
+IMPORT_TIME_BUDGET_MS = os.environ.get("IMPORT_TIME_BUDGET_MS")
+
+# Modules which must only be imported on first use
+DEFERRED_MODULES = (
+    "boto3",
+    "botocore",
+    "sqlite3",
+    "notifications.events.parsers.cloudwatch",
+    "notifications.events.parsers.securityhub",
+    "notifications.events.parsers.guardduty",
+    "notifications.events.parsers.kms",
+    "notifications.formatters.slack_formatter",
+    "notifications.formatters.teams_formatter",
+    "notifications.senders.slack_sender",
+    "notifications.senders.teams_sender",
+)
+
+
+def import_times(code: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Run code in a fresh interpreter under -X importtime, returning the self
+    and cumulative import time of each module in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{code}\nimport sys\nprint('\\n'.join(sys.modules))"],
+        env={**os.environ, "PYTHONPATH": ASSETS_DIR},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+
+    # Modules imported by other means than an import statement are not timed
+    for name in result.stdout.splitlines():
+        times.setdefault(name, (0, 0))
+
+    return times
+
+
+def report(times: Dict[str, Tuple[int, int]], count: int = 15) -> List[str]:
+    """
+    Return the modules taking the longest to import, by self time.
+    """
+    slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:count]
+    return [f"{self_us / 1000:8.1f}ms {cumulative_us / 1000:8.1f}ms  {name}" for name, (self_us, cumulative_us) in slowest]
+
+
+def test_handler_import_defers_optional_modules():
+    """Test that importing the handler does not load boto3 or any platform or parser"""
+    times = import_times("import notifications.handler")
+
+    assert "notifications.handler" in times
+    assert [name for name in DEFERRED_MODULES if name in times] == []
+
+
+@pytest.mark.skipif(not IMPORT_TIME_BUDGET_MS, reason="IMPORT_TIME_BUDGET_MS is not set")
+def test_handler_import_time_budget():
+    """Test that the handler imports within the cold start budget, taking the best of a few runs"""
+    budget = float(IMPORT_TIME_BUDGET_MS)
+    runs = [import_times("import notifications.handler") for _ in range(3)]
+    best = min(runs, key=lambda times: times["notifications.handler"][1])
+    elapsed = best["notifications.handler"][1] / 1000
+
+    assert elapsed <= budget, "\n".join(
+        [f"Importing the handler took {elapsed:.1f}ms, over the {budget:.0f}ms budget"]
+        + report(best)
+    )
+
+
+def test_parsers_and_platforms_are_loaded_on_first_use():
+    """Test that only the parser of the event received and the configured platform are imported"""
+    times = import_times(
+        "import json\n"
+        "from notifications.destinations import create_formatter\n"
+        "from notifications.events import EventParser\n"
+        "message = {'detail-type': 'KMS CMK Deletion', 'region': 'us-east-1', 'time': '2024-01-01T00:00:00Z',"
+        " 'resources': ['arn:aws:kms:us-east-1:123456789012:key/key'], 'detail': {'key-id': 'key'}}\n"
+        "event = EventParser().parse_record({'EventSource': 'aws:sns', 'Sns': {'Message': json.dumps(message)}})\n"
+        "create_formatter('teams').format(event)\n"
+    )
+
+    assert "notifications.events.parsers.kms" in times
+    assert "notifications.formatters.teams_formatter" in times
+    assert "notifications.events.parsers.guardduty" not in times
+    assert "notifications.formatters.slack_formatter" not in times
@@ -0,0 +1,116 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from notifications.events import NormalizedEvent
+from notifications.events.event_type import EventType
+from notifications.routing import Router, RoutingRule, get_router, load_routing_config
+
+DESTINATIONS = ("security", "platform", "audit")
+
+
+def get_event(
+    event_type=EventType.GUARDDUTY, severity="high", account="123456789012", region="eu-west-2", title="Unusual API call"
+):
+    """Helper to return an event with the routed fields set"""
+    return NormalizedEvent(
+        event_type=event_type,
+        severity=severity,
+        region=region,
+        title=title,
+        description="Potential security threat",
+        timestamp=datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+        source="GuardDuty",
+        details={"account_id": account},
+    )
+
+
+def test_events_are_routed_by_exact_fields():
+    """Test that a rule only matches the events matching every criterion it sets"""
+    router = Router([
+        RoutingRule(name="guardduty", destinations=["security"], event_types=["guardduty"], severities=["HIGH"]),
+        RoutingRule(name="production", destinations=["platform"], accounts=["123456789012"], regions=["eu-west-2"]),
+    ])
+
+    assert router.route(get_event(), DESTINATIONS) == ("security", "platform")
+    assert router.route(get_event(severity="low"), DESTINATIONS) == ("platform",)
+    assert router.route(get_event(region="us-east-1"), DESTINATIONS) == ("security",)
+
+
+def test_unmatched_events_go_to_the_default_destinations():
+    """Test that events no rule matches are delivered everywhere, unless default destinations are given"""
+    rules = [RoutingRule(name="kms", destinations=["security"], event_types=["KMS_DELETION"])]
+
+    assert Router(rules).route(get_event(), DESTINATIONS) == DESTINATIONS
+    assert Router(rules, default_destinations=["audit"]).route(get_event(), DESTINATIONS) == ("audit",)
+
+
+def test_mute_rules_win():
+    """Test that a matching mute rule drops the event, whichever other rules match"""
+    router = Router([
+        RoutingRule(name="everything", destinations=["audit"]),
+        RoutingRule(name="sandbox", mute=True, accounts=["210987654321"]),
+    ])
+
+    assert router.route(get_event(account="210987654321"), DESTINATIONS) == ()
+    assert router.route(get_event(), DESTINATIONS) == ("audit",)
+    assert router.stats() == {"rules": 2, "routed": 1, "muted": 1, "unmatched": 0}
+
+
+def test_title_patterns_are_searched():
+    """Test the title patterns, including one that cannot be part of the combined prefilter"""
+    router = Router([
+        RoutingRule(name="root", destinations=["security"], title_pattern=r"[Rr]oot (credential|login)"),
+        RoutingRule(name="repeated", destinations=["audit"], title_pattern=r"(\w+) \1"),
+        RoutingRule(name="bucket", destinations=["platform"], title_pattern="S3", event_types=["SECURITY_HUB"]),
+    ])
+
+    assert router.route(get_event(title="Root credential usage"), DESTINATIONS) == ("security",)
+    assert router.route(get_event(title="Port probe probe"), DESTINATIONS) == ("audit",)
+    # The pattern matches, but the event type of the rule does not
+    assert router.route(get_event(title="S3 bucket is public"), DESTINATIONS) == DESTINATIONS
+
+
+def test_many_rules_are_indexed():
+    """Test that routing over thousands of account rules selects the single matching one"""
+    router = Router([
+        RoutingRule(name=f"account-{index}", destinations=[DESTINATIONS[index % 3]], accounts=[f"{index:012d}"])
+        for index in range(2000)
+    ])
+
+    assert router.route(get_event(account=f"{1234:012d}"), DESTINATIONS) == (DESTINATIONS[1234 % 3],)
+    assert router.match(get_event(account=f"{1234:012d}")) == 1 << 1234
+
+
+def test_invalid_rules_are_rejected():
+    """Test that invalid rules and references to unknown destinations fail loudly"""
+    with pytest.raises(ValueError, match="must either mute or have destinations"):
+        RoutingRule(name="empty")
+    with pytest.raises(ValueError, match="invalid title_pattern"):
+        RoutingRule(name="broken", destinations=["audit"], title_pattern="(")
+    with pytest.raises(ValueError, match="Invalid routing rule 0"):
+        load_routing_config([{"destinations": ["audit"], "account": "1"}])
+    with pytest.raises(ValueError, match="unknown destinations: missing"):
+        load_routing_config({"rules": [], "default_destinations": ["missing"]}).validate(DESTINATIONS)
+
+
+def test_routing_rules_are_read_from_a_file(monkeypatch, tmp_path):
+    """Test that ROUTING_RULES_FILE is compiled once, with Terraform's unset attributes ignored"""
+    path = tmp_path / "routing.json"
+    path.write_text(json.dumps([{"name": "all", "destinations": ["audit"], "title_pattern": None}]))
+    monkeypatch.setattr("notifications.routing._router", None)
+    monkeypatch.delenv("ROUTING_RULES", raising=False)
+    monkeypatch.setenv("ROUTING_RULES_FILE", str(path))
+
+    router = get_router()
+
+    assert router is get_router()
+    assert router.route(get_event(), DESTINATIONS) == ("audit",)
+
+
+def test_routing_is_disabled_by_default(monkeypatch):
+    """Test that no router is created unless routing rules are configured"""
+    monkeypatch.setattr("notifications.routing._router", None)
+    monkeypatch.delenv("ROUTING_RULES", raising=False)
+    monkeypatch.delenv("ROUTING_RULES_FILE", raising=False)
+
+    assert get_router() is None
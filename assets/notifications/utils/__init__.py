@@ -1,4 +1,12 @@
-from .strings import format_key_name
-from .secrets import get_secret
+from notifications.utils.imports import lazy_attributes
 
-__all__ = ["format_key_name", "get_secret"]
+_ATTRIBUTES = {
+    "format_key_name": "strings",
+    "get_secret": "secrets",
+    "get_secret_cache": "secrets",
+    "SecretCache": "secrets",
+}
+
+__getattr__ = lazy_attributes(__name__, _ATTRIBUTES)
+
+__all__ = ["format_key_name", "get_secret", "get_secret_cache", "SecretCache"]
@@ -0,0 +1,133 @@
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Type, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# The JSON backend to use, 'auto' selects the fastest one installed
+JSON_CODEC = os.environ.get("JSON_CODEC", "auto").lower()
+
+
+class JSONCodec:
+    """
+    Encode and decode JSON with the standard library. Every codec encodes
+    compactly, without whitespace between separators, and straight to UTF-8
+    bytes, so the output can be used as an HTTP body as is.
+    """
+
+    name = "json"
+
+    def dumps(
+        self, value: Any, default: Optional[Callable[[Any], Any]] = str, sort_keys: bool = False
+    ) -> bytes:
+        """
+        Encode a value as compact JSON.
+
+        Args:
+            value (Any): The value to encode
+            default (Optional[Callable[[Any], Any]]): Called with values which
+                are not natively serializable, defaults to str
+            sort_keys (bool): Whether to sort the keys of dictionaries, so
+                equal values always encode the same, such as for hashing
+
+        Returns:
+            bytes: The UTF-8 encoded JSON
+        """
+        return json.dumps(
+            value, separators=(",", ":"), ensure_ascii=False, default=default, sort_keys=sort_keys
+        ).encode("utf-8")
+
+    def dumps_str(
+        self, value: Any, default: Optional[Callable[[Any], Any]] = str, sort_keys: bool = False
+    ) -> str:
+        """Encode a value as compact JSON text, such as a log line."""
+        return self.dumps(value, default=default, sort_keys=sort_keys).decode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decode JSON text or UTF-8 bytes.
+
+        Raises:
+            json.JSONDecodeError: If the data is not valid JSON
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Encode and decode JSON with orjson, when it is installed. The output
+    matches the standard library codec for the values the notifications
+    produce, values orjson does not support are encoded by the standard
+    library instead.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        # Datetimes and dataclasses are passed to default, as with the
+        # standard library, rather than serialized natively
+        self._options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def dumps(
+        self, value: Any, default: Optional[Callable[[Any], Any]] = str, sort_keys: bool = False
+    ) -> bytes:
+        options = self._options | orjson.OPT_SORT_KEYS if sort_keys else self._options
+        try:
+            return orjson.dumps(value, default=default, option=options)
+        except orjson.JSONEncodeError:
+            # Such as integers wider than 64 bits
+            return super().dumps(value, default=default, sort_keys=sort_keys)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return orjson.loads(data)
+
+
+CODECS: Dict[str, Type[JSONCodec]] = {
+    JSONCodec.name: JSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+_codec: Optional[JSONCodec] = None
+
+
+def get_codec() -> JSONCodec:
+    """
+    Get the codec selected by JSON_CODEC. With 'auto', orjson is used when
+    installed, and the standard library otherwise.
+
+    Returns:
+        JSONCodec: The shared codec
+
+    Raises:
+        ValueError: If JSON_CODEC names an unknown codec
+    """
+    global _codec
+    if _codec is None:
+        if JSON_CODEC == "auto":
+            _codec = OrjsonCodec() if orjson is not None else JSONCodec()
+        elif JSON_CODEC in CODECS:
+            _codec = CODECS[JSON_CODEC]()
+        else:
+            raise ValueError(f"Unknown JSON codec: {JSON_CODEC}")
+    return _codec
+
+
+def dumps(value: Any, default: Optional[Callable[[Any], Any]] = str, sort_keys: bool = False) -> bytes:
+    """Encode a value as compact UTF-8 JSON with the shared codec."""
+    return get_codec().dumps(value, default=default, sort_keys=sort_keys)
+
+
+def dumps_str(value: Any, default: Optional[Callable[[Any], Any]] = str, sort_keys: bool = False) -> str:
+    """Encode a value as compact JSON text with the shared codec."""
+    return get_codec().dumps_str(value, default=default, sort_keys=sort_keys)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON text or UTF-8 bytes with the shared codec."""
+    return get_codec().loads(data)
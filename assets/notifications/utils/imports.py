@@ -0,0 +1,50 @@
+import sys
+from typing import Any, Callable, Dict
+
+
+def _import_module(name: str) -> Any:
+    # __import__ is used over importlib.import_module, as only imports made
+    # through it are reported by python -X importtime
+    return __import__(name, fromlist=["__name__"])
+
+
+def import_string(path: str) -> Any:
+    """
+    Import an attribute given its dotted path, such as
+    'notifications.formatters.slack_formatter.SlackFormatter'.
+
+    Args:
+        path (str): The module path followed by the attribute name
+
+    Returns:
+        Any: The imported attribute
+    """
+    module_name, _, name = path.rpartition(".")
+    return getattr(_import_module(module_name), name)
+
+
+def lazy_attributes(package: str, attributes: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Build a module __getattr__ which imports the exports of a package from
+    their submodule on first access, so importing the package stays cheap.
+
+    Args:
+        package (str): The name of the package, usually __name__
+        attributes (Dict[str, str]): The submodule of each exported name
+
+    Returns:
+        Callable[[str], Any]: The __getattr__ function of the package
+    """
+    module = sys.modules[package]
+
+    def __getattr__(name: str) -> Any:
+        submodule = attributes.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(_import_module(f"{package}.{submodule}"), name)
+        # Later lookups find the attribute without calling __getattr__ again
+        setattr(module, name, value)
+        return value
+
+    return __getattr__
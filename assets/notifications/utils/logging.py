@@ -1,13 +1,86 @@
 import logging
 import os
-import json
-from typing import Any
+import random
+from typing import Any, Callable, Dict, Optional, Union
+from notifications.utils import codec
 
 # Default logger for all log messages in this module, configured to emit JSON-formatted logs to stdout.
 logger = logging.getLogger(__name__)
 # Set the log level from the environment variable (set by Terraform) or default to INFO.
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
 
+# The maximum size in bytes of a payload embedded in a log line, larger payloads are truncated.
+LOG_PAYLOAD_MAX_BYTES = int(os.environ.get("LOG_PAYLOAD_MAX_BYTES", "8192"))
+# The fraction of invocations, between 0 and 1, which log the full incoming event.
+LOG_PAYLOAD_SAMPLE_RATE = float(os.environ.get("LOG_PAYLOAD_SAMPLE_RATE", "1.0"))
+
+
+class LogPayload:
+    """
+    A payload attached to a log record, which is only serialized when the record
+    is formatted, and is embedded in the log line as JSON rather than as an
+    encoded string.
+    """
+
+    __slots__ = ("value", "max_bytes")
+
+    def __init__(self, value: Union[Any, Callable[[], Any]], max_bytes: Optional[int] = None):
+        """
+        Args:
+            value: The payload, or a callable returning it
+            max_bytes: The maximum size of the serialized payload, defaults to LOG_PAYLOAD_MAX_BYTES
+        """
+        self.value = value
+        self.max_bytes = LOG_PAYLOAD_MAX_BYTES if max_bytes is None else max_bytes
+
+    def encode(self) -> tuple[str, Optional[int]]:
+        """
+        Serialize the payload to JSON, truncating it when over the size cap.
+
+        Returns:
+            tuple[str, Optional[int]]: The JSON to embed, and the original size in
+            bytes when the payload was truncated
+        """
+        value = self.value() if callable(self.value) else self.value
+        encoded = codec.dumps(value)
+        if self.max_bytes <= 0 or len(encoded) <= self.max_bytes:
+            return encoded.decode("utf-8"), None
+
+        # The cut may split a multibyte character, which is dropped
+        truncated = encoded[: self.max_bytes].decode("utf-8", errors="ignore")
+        return codec.dumps_str(truncated + "...[truncated]"), len(encoded)
+
+
+def log_payload(
+    level: int,
+    message: str,
+    key: str,
+    payload: Union[Any, Callable[[], Any]],
+    extra: Optional[Dict[str, Any]] = None,
+    sampled: bool = False,
+) -> None:
+    """
+    Log a message with a potentially large payload attached. Nothing is
+    serialized unless the level is enabled.
+
+    Args:
+        level: The log level
+        message: The log message
+        key: The name of the field holding the payload
+        payload: The payload, or a callable returning it
+        extra: Additional fields to log
+        sampled: Whether the payload is only attached for a sample of calls,
+            according to LOG_PAYLOAD_SAMPLE_RATE
+    """
+    if not logger.isEnabledFor(level):
+        return
+
+    fields = dict(extra or {})
+    if not sampled or random.random() < LOG_PAYLOAD_SAMPLE_RATE:
+        fields[key] = LogPayload(payload)
+
+    logger.log(level, message, extra=fields)
+
 
 class _JSONFormatter(logging.Formatter):
     """Emit each log record as a single JSON object."""
@@ -44,15 +117,33 @@ class _JSONFormatter(logging.Formatter):
             "message": record.getMessage(),
         }
 
+        payloads = []
+
         # Include only extra fields (exclude standard logging record attributes)
         for key, value in record.__dict__.items():
             if key not in self._EXCLUDE_FIELDS:
-                log_entry[key] = value
+                if isinstance(value, LogPayload):
+                    payloads.append((key, value))
+                else:
+                    log_entry[key] = value
 
         if record.exc_info and record.exc_info[0] is not None:
             log_entry["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_entry, default=str)
+        encoded = codec.dumps_str(log_entry)
+        if not payloads:
+            return encoded
+
+        # Payloads are serialized once and spliced into the log line as JSON
+        parts = [encoded[:-1]]
+        for key, payload in payloads:
+            value, original_size = payload.encode()
+            parts.append(f",{codec.dumps_str(key)}:{value}")
+            if original_size is not None:
+                parts.append(f",{codec.dumps_str(key + '_truncated_bytes')}:{original_size}")
+        parts.append("}")
+
+        return "".join(parts)
 
 
 _handler = logging.StreamHandler()
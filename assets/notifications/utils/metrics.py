@@ -0,0 +1,131 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from notifications.utils.logging import logger
+
+# The CloudWatch namespace metrics are published under, metrics are not
+# emitted when empty
+METRICS_NAMESPACE = os.environ.get("METRICS_NAMESPACE", "Notifications")
+
+# The metric name of each timed stage, in pipeline order
+STAGE_METRICS: Dict[str, str] = {
+    "config": "ConfigLoadTime",
+    "secret": "SecretFetchTime",
+    "classify": "ClassifyTime",
+    "filter": "FilterTime",
+    "parse": "ParseTime",
+    "format": "FormatTime",
+    "send": "SendTime",
+}
+# The dimensions every metric is published with
+DIMENSIONS = ("EventType", "Platform", "Outcome")
+
+
+class StageTimer:
+    """
+    Accumulate the time spent in each stage of an invocation, and emit it as
+    a single CloudWatch Embedded Metric Format (EMF) log line, from which
+    CloudWatch extracts the metrics without any API call.
+
+    A stage may be timed several times, such as once per record, and from
+    several threads, such as the concurrent sends, its durations are summed.
+    """
+
+    def __init__(self, namespace: Optional[str] = None, clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            namespace: The CloudWatch namespace, defaults to METRICS_NAMESPACE
+            clock: The clock durations are measured with, in seconds
+        """
+        self.namespace = METRICS_NAMESPACE if namespace is None else namespace
+        self._clock = clock
+        self._started = clock()
+        self._durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """
+        Time a block of code, adding its duration to the stage, even if it raises.
+
+        Args:
+            stage: The stage the block belongs to, one of STAGE_METRICS
+        """
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.add(stage, self._clock() - start)
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add a duration in seconds to a stage."""
+        with self._lock:
+            self._durations[stage] = self._durations.get(stage, 0.0) + seconds
+
+    def durations(self) -> Dict[str, float]:
+        """
+        Return the time spent in each stage so far, in milliseconds.
+        """
+        with self._lock:
+            return {stage: seconds * 1000 for stage, seconds in self._durations.items()}
+
+    def to_emf(self, event_type: str, platform: str, outcome: str) -> Dict[str, Any]:
+        """
+        Build the EMF document of the invocation, holding a metric for every
+        stage, timed or not, and for the whole invocation.
+
+        Args:
+            event_type: The EventType dimension
+            platform: The Platform dimension
+            outcome: The Outcome dimension
+
+        Returns:
+            Dict[str, Any]: The EMF document
+        """
+        durations = self.durations()
+        values = {metric: round(durations.get(stage, 0.0), 3) for stage, metric in STAGE_METRICS.items()}
+        values["InvocationTime"] = round((self._clock() - self._started) * 1000, 3)
+
+        return {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": [list(DIMENSIONS)],
+                        "Metrics": [{"Name": metric, "Unit": "Milliseconds"} for metric in values],
+                    }
+                ],
+            },
+            "EventType": event_type,
+            "Platform": platform,
+            "Outcome": outcome,
+            **values,
+        }
+
+    def emit(self, event_type: str, platform: str, outcome: str) -> Optional[Dict[str, Any]]:
+        """
+        Log the EMF document of the invocation. The line is written regardless
+        of the log level, so metrics are kept when logs are quietened.
+
+        Args:
+            event_type: The EventType dimension
+            platform: The Platform dimension
+            outcome: The Outcome dimension
+
+        Returns:
+            Optional[Dict[str, Any]]: The emitted document, or None if metrics are disabled
+        """
+        if not self.namespace:
+            return None
+
+        document = self.to_emf(event_type, platform, outcome)
+        record = logger.makeRecord(
+            logger.name, logging.INFO, __file__, 0, "Invocation metrics", None, None, extra=document
+        )
+        logger.handle(record)
+
+        return document
@@ -1,9 +1,17 @@
 # Retrieves a secret from AWS Secrets Manager using the ARN
-import boto3
 import json
 import base64
+import os
+import threading
+import time
+import urllib.parse
+from typing import Any, Callable, Dict, Optional, Tuple
 
-def get_secret(client: boto3.client, secret_arn: str) -> dict:
+# HTTP status codes returned by a webhook which indicate the URL has been rotated
+# or revoked, and the cached secret should be refreshed
+ROTATION_STATUS_CODES = frozenset({401, 403, 404})
+
+def get_secret(client: Any, secret_arn: str) -> dict:
     """
     Retrieves a secret from AWS Secrets Manager using the ARN
 
@@ -20,10 +28,185 @@ def get_secret(client: boto3.client, secret_arn: str) -> dict:
     except Exception as e:
         raise e
 
+    return _decode_secret(response, secret_arn)
+
+
+def _decode_secret(response: Dict[str, Any], secret_arn: str) -> Any:
+    """
+    Decode a GetSecretValue response, as returned by the API or the extension
+    """
     # Decrypts secret using the associated KMS key
     if 'SecretString' in response:
       return json.loads(response['SecretString'])
     elif 'SecretBinary' in response:
       return base64.b64decode(response['SecretBinary']).decode('utf-8')
     else:
-      raise ValueError(f"Secret {secret_arn} is not a valid secret")
\ No newline at end of file
+      raise ValueError(f"Secret {secret_arn} is not a valid secret")
+
+
+class SecretsManagerBackend:
+    """
+    Retrieves secrets directly from the AWS Secrets Manager API. The boto3
+    client is created on first use and reused for the life of the container.
+    """
+
+    def __init__(self, client: Optional[Any] = None):
+        self._client = client
+
+    def get(self, secret_arn: str) -> Any:
+        if self._client is None:
+            # boto3 adds a few hundred milliseconds to a cold start, so it is
+            # only imported when a secret is first retrieved
+            import boto3
+
+            self._client = boto3.client('secretsmanager')
+        return get_secret(self._client, secret_arn)
+
+
+class ExtensionBackend:
+    """
+    Retrieves secrets from the AWS Parameters and Secrets Lambda Extension,
+    which serves them over HTTP on localhost.
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        token: Optional[str] = None,
+        timeout: float = 2.0,
+    ):
+        """
+        Args:
+            endpoint: The base URL of the extension, defaults to the local port
+                given by PARAMETERS_SECRETS_EXTENSION_HTTP_PORT
+            token: The token used to authenticate with the extension, defaults to
+                AWS_SESSION_TOKEN
+            timeout: The timeout in seconds for a request to the extension
+        """
+        port = os.environ.get("PARAMETERS_SECRETS_EXTENSION_HTTP_PORT", "2773")
+        self.endpoint = (endpoint or f"http://localhost:{port}").rstrip("/")
+        self.token = token if token is not None else os.environ.get("AWS_SESSION_TOKEN", "")
+        self.timeout = timeout
+
+    def get(self, secret_arn: str) -> Any:
+        import urllib.request
+
+        url = f"{self.endpoint}/secretsmanager/get?secretId={urllib.parse.quote(secret_arn, safe='')}"
+        req = urllib.request.Request(
+            url,
+            method='GET',
+            headers={'X-Aws-Parameters-Secrets-Token': self.token},
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            return _decode_secret(json.loads(response.read()), secret_arn)
+
+
+class SecretCache:
+    """
+    Caches secrets for the lifetime of the container, so warm invocations do
+    not pay for a Secrets Manager round trip on every alert.
+
+    Entries expire after the configured TTL, and can be refreshed early when a
+    caller knows the secret has been rotated.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        ttl: float = 300,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            backend: The backend used to retrieve secrets on a cache miss
+            ttl: The number of seconds a secret is cached for
+            clock: The monotonic clock used to expire entries
+        """
+        self.backend = backend or SecretsManagerBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        # Guards the entries, each secret is fetched under a lock of its own
+        # so cold fetches of different secrets are made concurrently
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, secret_arn: str, refresh: bool = False) -> Any:
+        """
+        Retrieve a secret, from the cache when it holds a fresh copy.
+
+        Args:
+            secret_arn: The ARN of the secret to retrieve
+            refresh: Whether to bypass the cache and retrieve the secret again
+
+        Returns:
+            Any: The decoded secret
+        """
+        with self._lock:
+            entry = self._entries.get(secret_arn)
+            if not refresh and entry is not None and entry[0] > self._clock():
+                self.hits += 1
+                return entry[1]
+            key_lock = self._key_locks.setdefault(secret_arn, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # Another caller may have fetched the secret while this one waited
+                fetched = self._entries.get(secret_arn)
+                if fetched is not None and fetched is not entry and fetched[0] > self._clock():
+                    self.hits += 1
+                    return fetched[1]
+                self.misses += 1
+
+            secret = self.backend.get(secret_arn)
+
+            with self._lock:
+                self._entries[secret_arn] = (self._clock() + self.ttl, secret)
+
+            return secret
+
+    def invalidate(self, secret_arn: str) -> None:
+        """
+        Remove a secret from the cache, forcing the next lookup to retrieve it.
+        """
+        with self._lock:
+            self._entries.pop(secret_arn, None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the hit and miss counters for the cache.
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_secret_cache: Optional[SecretCache] = None
+_secret_cache_lock = threading.Lock()
+
+
+def get_secret_cache() -> SecretCache:
+    """
+    Return the container scoped secret cache, creating it on first use.
+
+    Environment Variables:
+        SECRETS_BACKEND: The backend to use ('secretsmanager' or 'extension')
+        SECRET_CACHE_TTL: The number of seconds secrets are cached for
+
+    Returns:
+        SecretCache: The shared secret cache
+    """
+    global _secret_cache
+
+    with _secret_cache_lock:
+        if _secret_cache is None:
+            backend_name = os.environ.get("SECRETS_BACKEND", "secretsmanager").lower()
+            if backend_name not in ["secretsmanager", "extension"]:
+                raise ValueError(f"Unsupported secrets backend: {backend_name}")
+
+            _secret_cache = SecretCache(
+                backend=ExtensionBackend() if backend_name == "extension" else SecretsManagerBackend(),
+                ttl=float(os.environ.get("SECRET_CACHE_TTL", "300")),
+            )
+
+        return _secret_cache
@@ -1,3 +1,8 @@
+from functools import lru_cache
+
+
+# Events carry a few dozen distinct detail keys, so the labels are cached
+@lru_cache(maxsize=1024)
 def format_key_name(key: str) -> str:
     """
     Format a key string by replacing underscores with spaces and titlecasing each word.
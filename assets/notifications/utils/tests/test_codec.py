@@ -0,0 +1,70 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from notifications.utils import codec as codec_module
+from notifications.utils.codec import JSONCodec, OrjsonCodec, get_codec
+
+CODECS = [JSONCodec]
+if codec_module.orjson is not None:
+    CODECS.append(OrjsonCodec)
+
+PAYLOAD = {
+    "text": "🔒 Security Alert",
+    "blocks": [{"type": "section", "fields": [1, 2.5, None, True]}],
+    "timestamp": datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+}
+
+
+@pytest.mark.parametrize("codec_class", CODECS)
+def test_dumps_is_compact_utf8(codec_class):
+    encoded = codec_class().dumps(PAYLOAD)
+
+    assert isinstance(encoded, bytes)
+    assert encoded == json.dumps(
+        PAYLOAD, separators=(",", ":"), ensure_ascii=False, default=str
+    ).encode("utf-8")
+
+
+@pytest.mark.parametrize("codec_class", CODECS)
+def test_round_trip(codec_class):
+    codec = codec_class()
+    value = {"a": [1, "b", {"c": None}], "ü": "ß"}
+
+    assert codec.loads(codec.dumps(value)) == value
+    assert codec.loads(codec.dumps_str(value)) == value
+
+
+@pytest.mark.parametrize("codec_class", CODECS)
+def test_loads_raises_json_decode_error(codec_class):
+    with pytest.raises(json.JSONDecodeError):
+        codec_class().loads("{not json")
+
+
+@pytest.mark.parametrize("codec_class", CODECS)
+def test_dumps_sorts_keys(codec_class):
+    value = {"b": 1, "a": {"d": 2, "c": 3}}
+
+    assert codec_class().dumps(value, sort_keys=True) == b'{"a":{"c":3,"d":2},"b":1}'
+    assert codec_class().dumps(value) == b'{"b":1,"a":{"d":2,"c":3}}'
+
+
+@pytest.mark.skipif(codec_module.orjson is None, reason="orjson is not installed")
+def test_orjson_falls_back_on_unsupported_values():
+    assert OrjsonCodec().dumps({"value": 2**70, 1: "a"}) == b'{"value":1180591620717411303424,"1":"a"}'
+
+
+def test_get_codec_selects_backend(monkeypatch):
+    monkeypatch.setattr(codec_module, "_codec", None)
+    monkeypatch.setattr(codec_module, "JSON_CODEC", "json")
+    assert type(get_codec()) is JSONCodec
+
+    monkeypatch.setattr(codec_module, "_codec", None)
+    monkeypatch.setattr(codec_module, "JSON_CODEC", "auto")
+    expected = OrjsonCodec if codec_module.orjson is not None else JSONCodec
+    assert type(get_codec()) is expected
+    assert get_codec() is get_codec()
+
+    monkeypatch.setattr(codec_module, "_codec", None)
+    monkeypatch.setattr(codec_module, "JSON_CODEC", "yaml")
+    with pytest.raises(ValueError, match="Unknown JSON codec: yaml"):
+        get_codec()
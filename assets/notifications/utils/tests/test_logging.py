@@ -0,0 +1,66 @@
+import json
+import logging
+import pytest
+from notifications.utils import logging as logging_module
+from notifications.utils.logging import LogPayload, log_payload, logger, _JSONFormatter
+
+
+class CaptureHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(_JSONFormatter())
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+@pytest.fixture
+def captured():
+    handler = CaptureHandler()
+    level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    yield handler
+    logger.removeHandler(handler)
+    logger.setLevel(level)
+
+
+def test_payload_is_embedded_as_json(captured):
+    log_payload(logging.INFO, "Processing", "event", {"Records": [{"id": 1}]}, extra={"action": "test"})
+
+    entry = json.loads(captured.lines[0])
+    assert entry["message"] == "Processing"
+    assert entry["action"] == "test"
+    assert entry["event"] == {"Records": [{"id": 1}]}
+
+
+def test_payload_is_not_serialized_when_level_disabled(captured):
+    calls = []
+
+    log_payload(logging.DEBUG, "Normalized", "event", lambda: calls.append(1) or {})
+
+    assert calls == []
+    assert captured.lines == []
+
+
+def test_payload_is_truncated():
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "Processing", None, None)
+    record.event = LogPayload({"data": "x" * 100}, max_bytes=20)
+
+    entry = json.loads(_JSONFormatter().format(record))
+
+    assert entry["event"] == '{"data":"xxxxxxxxxxx...[truncated]'
+    assert entry["event_truncated_bytes"] == len(json.dumps({"data": "x" * 100}, separators=(",", ":")))
+
+
+def test_payload_sampling(captured, monkeypatch):
+    monkeypatch.setattr(logging_module, "LOG_PAYLOAD_SAMPLE_RATE", 0.0)
+
+    log_payload(logging.INFO, "Processing", "event", {"a": 1}, extra={"records": 1}, sampled=True)
+    log_payload(logging.INFO, "Formatted", "formatted_message", {"b": 2})
+
+    sampled, unsampled = [json.loads(line) for line in captured.lines]
+    assert "event" not in sampled
+    assert sampled["records"] == 1
+    assert unsampled["formatted_message"] == {"b": 2}
@@ -0,0 +1,84 @@
+import json
+import logging
+import pytest
+from notifications.utils.logging import logger, _JSONFormatter
+from notifications.utils.metrics import StageTimer, STAGE_METRICS
+
+
+class CaptureHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(_JSONFormatter())
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+@pytest.fixture
+def captured():
+    handler = CaptureHandler()
+    logger.addHandler(handler)
+    yield handler
+    logger.removeHandler(handler)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stage_durations_are_summed():
+    clock = FakeClock()
+    timer = StageTimer(namespace="Test", clock=clock)
+
+    for _ in range(3):
+        with timer.time("parse"):
+            clock.now += 0.002
+    with pytest.raises(RuntimeError):
+        with timer.time("send"):
+            clock.now += 0.1
+            raise RuntimeError("Webhook unavailable")
+
+    assert timer.durations() == pytest.approx({"parse": 6.0, "send": 100.0})
+
+
+def test_emit_writes_emf_line(captured):
+    clock = FakeClock()
+    timer = StageTimer(namespace="Test", clock=clock)
+    with timer.time("format"):
+        clock.now += 0.0125
+
+    document = timer.emit(event_type="CLOUDWATCH", platform="slack", outcome="Success")
+
+    assert len(captured.lines) == 1
+    entry = json.loads(captured.lines[0])
+    assert entry["_aws"] == document["_aws"]
+    metrics = entry["_aws"]["CloudWatchMetrics"][0]
+    assert metrics["Namespace"] == "Test"
+    assert metrics["Dimensions"] == [["EventType", "Platform", "Outcome"]]
+    assert {metric["Name"] for metric in metrics["Metrics"]} == {*STAGE_METRICS.values(), "InvocationTime"}
+    assert all(metric["Unit"] == "Milliseconds" for metric in metrics["Metrics"])
+    assert (entry["EventType"], entry["Platform"], entry["Outcome"]) == ("CLOUDWATCH", "slack", "Success")
+    assert entry["FormatTime"] == 12.5
+    assert entry["SecretFetchTime"] == 0.0
+    assert entry["InvocationTime"] == 12.5
+
+
+def test_emit_ignores_log_level(captured):
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        StageTimer(namespace="Test").emit(event_type="KMS", platform="teams", outcome="Failure")
+    finally:
+        logger.setLevel(level)
+
+    assert len(captured.lines) == 1
+
+
+def test_emit_is_disabled_without_namespace(captured):
+    assert StageTimer(namespace="").emit(event_type="KMS", platform="teams", outcome="Success") is None
+    assert captured.lines == []
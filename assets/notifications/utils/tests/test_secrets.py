@@ -1,8 +1,10 @@
 import pytest
 import json
+import threading
 import boto3
-from notifications.utils.secrets import get_secret
+from notifications.utils.secrets import get_secret, SecretCache, ExtensionBackend
 from unittest.mock import MagicMock
+from pytest_httpserver import HTTPServer
 
 
 def test_get_secret():
@@ -17,4 +19,91 @@ def test_get_secret():
     secret = get_secret(mock_client, secret_arn)
     assert secret == {'test': 'test'}
     assert mock_client.get_secret_value.call_count == 1
-    assert mock_client.get_secret_value.call_args[1]['SecretId'] == secret_arn
\ No newline at end of file
+    assert mock_client.get_secret_value.call_args[1]['SecretId'] == secret_arn
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_secret_cache_hits_and_misses():
+    backend = MagicMock()
+    backend.get.return_value = {'webhook_url': 'https://hooks.slack.com/services/A'}
+    clock = FakeClock()
+    cache = SecretCache(backend=backend, ttl=60, clock=clock)
+
+    for _ in range(3):
+        assert cache.get('arn') == {'webhook_url': 'https://hooks.slack.com/services/A'}
+
+    assert backend.get.call_count == 1
+    assert cache.stats() == {'hits': 2, 'misses': 1}
+
+
+def test_secret_cache_expires_after_ttl():
+    backend = MagicMock()
+    backend.get.side_effect = [{'webhook_url': 'a'}, {'webhook_url': 'b'}]
+    clock = FakeClock()
+    cache = SecretCache(backend=backend, ttl=60, clock=clock)
+
+    assert cache.get('arn') == {'webhook_url': 'a'}
+    clock.now = 59
+    assert cache.get('arn') == {'webhook_url': 'a'}
+    clock.now = 61
+    assert cache.get('arn') == {'webhook_url': 'b'}
+    assert cache.stats() == {'hits': 1, 'misses': 2}
+
+
+def test_secret_cache_refresh_and_invalidate():
+    backend = MagicMock()
+    backend.get.side_effect = [{'webhook_url': 'a'}, {'webhook_url': 'b'}, {'webhook_url': 'c'}]
+    cache = SecretCache(backend=backend, ttl=60, clock=FakeClock())
+
+    assert cache.get('arn') == {'webhook_url': 'a'}
+    assert cache.get('arn', refresh=True) == {'webhook_url': 'b'}
+    cache.invalidate('arn')
+    assert cache.get('arn') == {'webhook_url': 'c'}
+    assert backend.get.call_count == 3
+
+
+def test_secret_cache_fetches_different_secrets_concurrently():
+    release = threading.Event()
+
+    class SlowBackend:
+        def get(self, secret_arn):
+            # The first secret is only returned once the second has been fetched
+            if secret_arn == 'a':
+                assert release.wait(timeout=5)
+            return {'webhook_url': secret_arn}
+
+    cache = SecretCache(backend=SlowBackend(), ttl=60, clock=FakeClock())
+    slow = threading.Thread(target=cache.get, args=('a',))
+    slow.start()
+
+    assert cache.get('b') == {'webhook_url': 'b'}
+    release.set()
+    slow.join()
+    assert cache.get('a') == {'webhook_url': 'a'}
+    assert cache.stats() == {'hits': 1, 'misses': 2}
+
+
+def test_extension_backend(httpserver: HTTPServer):
+    secret_arn = 'arn:aws:secretsmanager:us-east-1:123456789012:secret:test/test'
+    httpserver.expect_request(
+        '/secretsmanager/get',
+        method='GET',
+        query_string={'secretId': secret_arn},
+        headers={'X-Aws-Parameters-Secrets-Token': 'token'},
+    ).respond_with_json({
+        'ARN': secret_arn,
+        'SecretString': json.dumps({'webhook_url': 'https://hooks.slack.com/services/A'}),
+    })
+
+    backend = ExtensionBackend(endpoint=httpserver.url_for('/'), token='token')
+    cache = SecretCache(backend=backend, ttl=60)
+
+    assert cache.get(secret_arn) == {'webhook_url': 'https://hooks.slack.com/services/A'}
+    assert cache.get(secret_arn) == {'webhook_url': 'https://hooks.slack.com/services/A'}
+    assert len(httpserver.log) == 1
@@ -20,3 +20,15 @@ def test_format_key_name():
 
     # Test multiple consecutive underscores
     assert format_key_name("hello__world") == "Hello World"
+
+
+def test_format_key_name_is_cached():
+    """Test that the label of a repeated key is computed once"""
+    format_key_name.cache_clear()
+
+    for _ in range(3):
+        assert format_key_name("finding_id") == "Finding Id"
+
+    info = format_key_name.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
@@ -0,0 +1,42 @@
+"""
+The benchmark corpus, built from the sample payloads of scripts/event_generator.py.
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT / "assets", ROOT / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from event_generator import TestEventGenerator  # noqa: E402
+
+# The generator method producing the message of each benchmarked event, the
+# default case is a payload no registered parser recognizes
+EVENTS = {
+    "security_hub": "get_security_hub_event",
+    "security_hub_resource": "get_security_hub_resource_event",
+    "guardduty": "get_guardduty_event",
+    "cloudwatch": "get_cloudwatch_event",
+    "cloudwatch_eventbridge": "get_cloudwatch_eventbridge_alarm",
+    "kms": "get_kms_deletion_event",
+    "default": "get_budget_event",
+}
+
+
+def get_messages() -> Dict[str, Dict[str, Any]]:
+    """
+    Return the message of each benchmarked event, by name.
+    """
+    generator = TestEventGenerator()
+    return {name: getattr(generator, method)() for name, method in EVENTS.items()}
+
+
+def get_sns_events() -> Dict[str, Dict[str, Any]]:
+    """
+    Return each benchmarked event wrapped in an SNS delivery, by name.
+    """
+    generator = TestEventGenerator()
+    return {name: generator.get_sns_event(message) for name, message in get_messages().items()}
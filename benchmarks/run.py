@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the parse, format and send hot path of the notifications Lambda
+over the sample payloads of scripts/event_generator.py.
+
+Usage:
+    python benchmarks/run.py
+    python benchmarks/run.py --suite parse --suite format -o results.json
+    python benchmarks/run.py --compare baseline.json
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from unittest import mock
+
+from corpus import ROOT, get_messages
+from harness import measure, measure_retained
+
+SUITES = ("parse", "format", "handler", "memory", "codec", "routing")
+# The number of findings in the batched Security Hub event
+DIGEST_FINDINGS = 100
+# The number of rules of each benchmarked routing rule set
+ROUTING_RULE_COUNTS = (10, 100, 1000, 5000)
+
+
+def get_digest_message(message: Dict[str, Any], findings: int = DIGEST_FINDINGS) -> Dict[str, Any]:
+    """
+    Return a Security Hub event carrying many findings, as delivered by EventBridge.
+    """
+    message = copy.deepcopy(message)
+    template = message["detail"]["findings"][0]
+    message["detail"]["findings"] = [
+        {
+            **template,
+            "Id": f"{template['Id']}-{index}",
+            "Title": f"{template['Title']} ({index})",
+            "Severity": {"Label": ("CRITICAL", "HIGH", "MEDIUM", "LOW")[index % 4]},
+            "Resources": [{"Type": "AwsEc2Instance", "Id": f"i-{index % 10:017x}"}],
+        }
+        for index in range(findings)
+    ]
+    return message
+
+
+def get_cases() -> Dict[str, Dict[str, Any]]:
+    """
+    Return the message of each benchmark case, by name.
+    """
+    messages = get_messages()
+    messages["security_hub_digest"] = get_digest_message(messages["security_hub"])
+    return messages
+
+
+def parse_cases(messages: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    from event_generator import TestEventGenerator
+    from notifications.events import EventEnvelope, EventParser
+    from notifications.events.parsers import DefaultParser
+
+    parser = EventParser()
+    generator = TestEventGenerator()
+
+    for name, message in messages.items():
+        event = generator.get_sns_event(message)
+        if name == "default":
+            # No registered parser recognizes the event, so it is parsed directly
+            default_parser = DefaultParser()
+            record = event["Records"][0]
+            yield name, lambda record=record: default_parser.parse(EventEnvelope.from_sns_record(record))
+        else:
+            yield name, lambda event=event: parser.parse_all(event["Records"][0])
+
+
+def format_cases(messages: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    from event_generator import TestEventGenerator
+    from notifications.events import EventParser
+    from notifications.formatters import SlackFormatter, TeamsFormatter
+
+    parser = EventParser()
+    generator = TestEventGenerator()
+
+    for name, message in messages.items():
+        # The default parser leaves the event type unresolved, which the
+        # formatters only receive through a registered parser
+        if name == "default":
+            continue
+        events = parser.parse_all(generator.get_sns_event(message)["Records"][0])
+
+        for formatter in (SlackFormatter(), TeamsFormatter()):
+            platform_name = type(formatter).__name__.replace("Formatter", "").lower()
+            if len(events) == 1:
+                yield f"{name}/{platform_name}", lambda f=formatter, e=events[0]: f.format(e)
+            else:
+                yield f"{name}/{platform_name}", lambda f=formatter, e=events: f.format_digest(e)
+
+
+def handler_cases(messages: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    from event_generator import TestEventGenerator
+    from pytest_httpserver import HTTPServer
+    from notifications.handler import lambda_handler
+
+    # The server logs every request it receives
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = HTTPServer()
+    server.expect_request("/", method="POST").respond_with_data("ok")
+    server.start()
+    generator = TestEventGenerator()
+
+    def invoke(event: Dict[str, Any]) -> None:
+        response = lambda_handler(event, None)
+        if response["statusCode"] != 200:
+            raise RuntimeError(f"Benchmark invocation failed: {response['results']}")
+        # The server records every request, which would otherwise grow for the whole run
+        server.clear_log()
+
+    # The handler is configured for the duration of the suite only
+    environment = {"WEBHOOK_URL": server.url_for("/"), "NOTIFICATION_PLATFORM": "slack"}
+    try:
+        with mock.patch.dict(os.environ, environment):
+            for name, message in messages.items():
+                # Events no registered parser recognizes are rejected by the handler
+                if name == "default":
+                    continue
+                event = generator.get_sns_event(message)
+                yield name, lambda event=event: invoke(event)
+    finally:
+        server.clear()
+        if server.is_running():
+            server.stop()
+
+
+def memory_cases(messages: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    from event_generator import TestEventGenerator
+    from notifications.events import EventParser
+
+    parser = EventParser()
+    generator = TestEventGenerator()
+
+    for name, message in messages.items():
+        if name == "default":
+            continue
+        # Each call decodes its own copy of the record, as each record of a
+        # batch is distinct, so a record is only counted when an event keeps it
+        encoded = json.dumps(generator.get_sns_event(message)["Records"][0])
+        yield name, lambda encoded=encoded: parser.parse_all(json.loads(encoded))
+
+
+def codec_cases(messages: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    from event_generator import TestEventGenerator
+    from notifications.events import EventParser
+    from notifications.formatters import SlackFormatter
+    from notifications.utils.codec import CODECS
+
+    parser = EventParser()
+    generator = TestEventGenerator()
+    formatter = SlackFormatter()
+    # Only the backends installed in this environment are compared
+    codecs = []
+    for codec_class in CODECS.values():
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            continue
+
+    for name, message in messages.items():
+        if name == "default":
+            continue
+        # The SNS message is decoded on receipt, the formatted payload is
+        # encoded to be sent
+        encoded = json.dumps(message)
+        events = parser.parse_all(generator.get_sns_event(message)["Records"][0])
+        payload = formatter.format(events[0]) if len(events) == 1 else formatter.format_digest(events)
+
+        for codec in codecs:
+            yield f"{name}/{codec.name}/loads", lambda c=codec, e=encoded: c.loads(e)
+            yield f"{name}/{codec.name}/dumps", lambda c=codec, p=payload: c.dumps(p)
+
+
+def get_routing_rules(count: int) -> List[Dict[str, Any]]:
+    """
+    Return a rule set of the given size, mostly routing single accounts, as
+    with one rule per team account, with region, severity and title rules.
+    """
+    destinations = ["security", "platform", "audit"]
+    rules = []
+    for index in range(count):
+        kind = index % 10
+        if kind == 0:
+            rule = {"regions": [f"region-{index}"], "severities": ["critical"]}
+        elif kind == 1:
+            rule = {"title_pattern": f"^Finding {index}\\b", "event_types": ["SECURITY_HUB"]}
+        else:
+            rule = {"accounts": [f"{index:012d}"]}
+        rules.append({"name": f"rule-{index}", "destinations": [destinations[index % 3]], **rule})
+    return rules
+
+
+def routing_cases(messages: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    from event_generator import TestEventGenerator
+    from notifications.events import EventParser
+    from notifications.routing import load_routing_config
+
+    parser = EventParser()
+    generator = TestEventGenerator()
+    destinations = ("security", "platform", "audit")
+
+    for name in ("guardduty", "security_hub"):
+        event = parser.parse_all(generator.get_sns_event(messages[name])["Records"][0])[0]
+        for count in ROUTING_RULE_COUNTS:
+            router = load_routing_config(get_routing_rules(count))
+            # Cost should stay flat as the rule count grows
+            yield f"{name}/{count}_rules", lambda r=router, e=event: r.route(e, destinations)
+
+
+CASES = {
+    "parse": parse_cases,
+    "format": format_cases,
+    "handler": handler_cases,
+    "memory": memory_cases,
+    "codec": codec_cases,
+    "routing": routing_cases,
+}
+
+
+def describe(case: str, result: Dict[str, Any]) -> str:
+    """
+    Return a one line summary of the result of a case.
+    """
+    if "bytes_per_object" in result:
+        return (
+            f"{case:<45} {result['bytes_per_object']:>12,} B/event"
+            f"  {result['objects']:>6,} events  retained {result['retained_kib']:>9,.1f}KiB"
+        )
+
+    return (
+        f"{case:<45} {result['ops_per_sec']:>12,.1f} ops/s"
+        f"  p50 {result['p50_us']:>10,.1f}us"
+        f"  p99 {result['p99_us']:>10,.1f}us"
+        f"  peak {result['peak_memory_kib']:>9,.1f}KiB"
+    )
+
+
+def get_metadata() -> Dict[str, Any]:
+    """
+    Return the environment a run was made in, so runs can be compared.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+    }
+
+
+def run(
+    suites: List[str],
+    iterations: int,
+    warmup: int,
+    memory_iterations: int,
+    match: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run the benchmark suites, returning the result of each case by name.
+    """
+    messages = get_cases()
+    results = {}
+
+    for suite in suites:
+        # End to end invocations are much slower than parsing or formatting
+        suite_iterations = max(1, iterations // 10) if suite == "handler" else iterations
+        for name, operation in CASES[suite](messages):
+            case = f"{suite}/{name}"
+            if match and match not in case:
+                continue
+            if suite == "memory":
+                results[case] = measure_retained(operation, count=memory_iterations)
+            else:
+                results[case] = measure(
+                    operation,
+                    iterations=suite_iterations,
+                    warmup=min(warmup, suite_iterations),
+                    memory_iterations=min(memory_iterations, suite_iterations),
+                )
+            print(describe(case, results[case]), file=sys.stderr)
+
+    return {"metadata": get_metadata(), "results": results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Return a line comparing the throughput and p99 latency, or the memory
+    retained per event, of each case present in both runs.
+    """
+    lines = []
+    for case, result in current["results"].items():
+        previous = baseline.get("results", {}).get(case)
+        if previous is None:
+            continue
+        if "bytes_per_object" in result:
+            change = (result["bytes_per_object"] / previous["bytes_per_object"] - 1) * 100 if previous["bytes_per_object"] else 0.0
+            lines.append(f"{case:<45} B/event {change:+7.1f}%")
+            continue
+        throughput = (result["ops_per_sec"] / previous["ops_per_sec"] - 1) * 100
+        latency = (result["p99_us"] / previous["p99_us"] - 1) * 100 if previous["p99_us"] else 0.0
+        lines.append(f"{case:<45} ops/s {throughput:+7.1f}%  p99 {latency:+7.1f}%")
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the notifications hot path")
+    parser.add_argument(
+        "-s", "--suite", action="append", choices=SUITES,
+        help="The suites to run, may be repeated (default: all)",
+    )
+    parser.add_argument("-k", "--match", help="Only run the cases whose name contains this string")
+    parser.add_argument("-n", "--iterations", type=int, default=2000, help="The number of timed calls per case")
+    parser.add_argument("--warmup", type=int, default=100, help="The number of untimed calls per case")
+    parser.add_argument(
+        "--memory-iterations", type=int, default=50,
+        help="The number of calls per case made while tracing memory",
+    )
+    parser.add_argument("-o", "--output", help="Write the results as JSON to this file (default: stdout)")
+    parser.add_argument("--compare", help="A previous JSON result to compare this run against")
+    args = parser.parse_args()
+
+    results = run(
+        args.suite or list(SUITES),
+        iterations=args.iterations,
+        warmup=args.warmup,
+        memory_iterations=args.memory_iterations,
+        match=args.match,
+    )
+
+    encoded = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(encoded + "\n")
+    else:
+        print(encoded)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print("\n".join(compare(results, baseline)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    # Keep the per invocation logs of the handler out of the measurements
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    main()
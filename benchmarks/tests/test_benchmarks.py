@@ -0,0 +1,60 @@
+import os
+from harness import measure, percentile
+from run import compare, run
+
+
+def test_percentile():
+    samples = [float(value) for value in range(1, 101)]
+
+    assert percentile(samples, 0.5) == 50.0
+    assert percentile(samples, 0.99) == 99.0
+    assert percentile([3.0], 0.99) == 3.0
+
+
+def test_measure():
+    calls = []
+    result = measure(lambda: calls.append(None), iterations=20, warmup=5, memory_iterations=5)
+
+    assert len(calls) == 30
+    assert result["iterations"] == 20
+    assert result["ops_per_sec"] > 0
+    assert result["p50_us"] <= result["p99_us"]
+
+
+def test_run_parse_and_format_suites():
+    results = run(["parse", "format"], iterations=2, warmup=1, memory_iterations=1)
+
+    assert "parse/default" in results["results"]
+    assert "parse/security_hub_digest" in results["results"]
+    assert "format/security_hub_digest/slack" in results["results"]
+    assert "format/guardduty/teams" in results["results"]
+    assert results["metadata"]["python"]
+
+    lines = compare(results, results)
+    assert len(lines) == len(results["results"])
+    assert all("+0.0%" in line for line in lines)
+
+
+def test_run_codec_suite():
+    results = run(["codec"], iterations=2, warmup=1, memory_iterations=1, match="guardduty")
+
+    assert "codec/guardduty/json/loads" in results["results"]
+    assert "codec/guardduty/json/dumps" in results["results"]
+
+
+def test_run_routing_suite():
+    results = run(["routing"], iterations=2, warmup=1, memory_iterations=1, match="guardduty")
+
+    assert "routing/guardduty/10_rules" in results["results"]
+    assert "routing/guardduty/5000_rules" in results["results"]
+
+
+def test_run_handler_suite(monkeypatch):
+    monkeypatch.delenv("WEBHOOK_URL", raising=False)
+    monkeypatch.delenv("NOTIFICATION_PLATFORM", raising=False)
+
+    results = run(["handler"], iterations=10, warmup=1, memory_iterations=1, match="guardduty")
+
+    assert "handler/guardduty" in results["results"]
+    assert "WEBHOOK_URL" not in os.environ
+    assert "NOTIFICATION_PLATFORM" not in os.environ
@@ -7,8 +7,43 @@ locals {
   ## Indicates if we are enabling emails notifications
   enable_email = var.email != null ? true : false
 
-  ## Enable the notifications only if slack or teams are enabled
-  enable_notifications = var.slack != null || var.teams != null ? true : false
+  ## Enable the notifications only if slack, teams or other destinations are enabled
+  enable_notifications = var.slack != null || var.teams != null || length(var.destinations) > 0 ? true : false
+
+  ## The destinations the lambda function delivers notifications to
+  destinations = concat(
+    var.slack != null ? [{
+      name        = "slack"
+      platform    = "slack"
+      webhook_url = try(var.slack.webhook_url, null)
+      webhook_arn = try(var.slack.webhook_arn, null)
+    }] : [],
+    var.teams != null ? [{
+      name        = "teams"
+      platform    = "teams"
+      webhook_url = try(var.teams.webhook_url, null)
+      webhook_arn = try(var.teams.webhook_arn, null)
+    }] : [],
+    var.destinations,
+  )
+  ## The layers attached to the lambda function, including the secrets extension when enabled
+  lambda_layers = concat(
+    var.secrets_extension_layer_arn != null ? [var.secrets_extension_layer_arn] : [],
+    var.lambda_layers,
+  )
+  ## Indicates if notifications are buffered in an sqs queue, rather than delivered by sns directly
+  enable_sqs_queue = local.enable_notifications && var.create_sqs_queue
+  ## The ARNs of the secrets holding the destination webhook urls
+  webhook_secret_arns = [for destination in local.destinations : destination.webhook_arn if destination.webhook_arn != null]
+
+  ## Indicates if we are creating the dynamodb table holding the lambda state
+  create_state_table = local.enable_notifications && var.state_backend == "dynamodb" && var.state_table_name == null
+  ## The name of the dynamodb table holding the lambda state
+  state_table_name = var.state_backend != "dynamodb" ? null : (
+    var.state_table_name != null ? var.state_table_name : "${var.function_name}-state"
+  )
+  ## The arn of the dynamodb table holding the lambda state
+  state_table_arn = local.state_table_name != null ? format("arn:aws:dynamodb:%s:%s:table/%s", local.region, local.account_id, local.state_table_name) : null
 
   ## Expected sns topic arn, assuming we are not creating the sns topic
   expected_sns_topic_arn = format("arn:aws:sns:%s:%s:%s", local.region, local.account_id, var.sns_topic_name)
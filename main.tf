@@ -34,9 +34,9 @@ resource "aws_sns_topic_subscription" "subscribers" {
   depends_on = [module.sns]
 }
 
-## Add Lambda subscription to SNS topic
+## Add Lambda subscription to SNS topic, unless notifications are buffered in a queue
 resource "aws_sns_topic_subscription" "lambda" {
-  count     = local.enable_notifications ? 1 : 0
+  count     = local.enable_notifications && !local.enable_sqs_queue ? 1 : 0
   topic_arn = local.sns_topic_arn
   protocol  = "lambda"
   endpoint  = module.lambda_function[0].lambda_function_arn
@@ -46,7 +46,7 @@ resource "aws_sns_topic_subscription" "lambda" {
 
 ## Add permission for SNS to invoke Lambda
 resource "aws_lambda_permission" "sns" {
-  count         = local.enable_notifications ? 1 : 0
+  count         = local.enable_notifications && !local.enable_sqs_queue ? 1 : 0
   statement_id  = "AllowSNSInvoke"
   action        = "lambda:InvokeFunction"
   function_name = module.lambda_function[0].lambda_function_name
@@ -56,6 +56,171 @@ resource "aws_lambda_permission" "sns" {
   depends_on = [module.lambda_function]
 }
 
+## Provision a queue buffering notifications between the SNS topic and the Lambda, if required
+resource "aws_sqs_queue" "dead_letter" {
+  count = local.enable_sqs_queue ? 1 : 0
+
+  name                      = "${var.function_name}-dlq"
+  message_retention_seconds = 1209600
+  sqs_managed_sse_enabled   = true
+  tags                      = var.tags
+}
+
+resource "aws_sqs_queue" "notifications" {
+  count = local.enable_sqs_queue ? 1 : 0
+
+  name                    = var.function_name
+  sqs_managed_sse_enabled = true
+  tags                    = var.tags
+  # AWS recommends six times the function timeout, so a message is not
+  # redelivered while a batch holding it is still being retried
+  visibility_timeout_seconds = var.timeout * 6
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.dead_letter[0].arn
+    maxReceiveCount     = var.sqs_max_receive_count
+  })
+}
+
+data "aws_iam_policy_document" "sqs" {
+  count = local.enable_sqs_queue ? 1 : 0
+
+  statement {
+    sid       = "AllowSNSPublish"
+    actions   = ["sqs:SendMessage"]
+    effect    = "Allow"
+    resources = [aws_sqs_queue.notifications[0].arn]
+
+    principals {
+      type        = "Service"
+      identifiers = ["sns.amazonaws.com"]
+    }
+
+    condition {
+      test     = "ArnEquals"
+      variable = "aws:SourceArn"
+      values   = [local.sns_topic_arn]
+    }
+  }
+}
+
+resource "aws_sqs_queue_policy" "notifications" {
+  count = local.enable_sqs_queue ? 1 : 0
+
+  queue_url = aws_sqs_queue.notifications[0].id
+  policy    = data.aws_iam_policy_document.sqs[0].json
+}
+
+resource "aws_sns_topic_subscription" "sqs" {
+  count = local.enable_sqs_queue ? 1 : 0
+
+  endpoint  = aws_sqs_queue.notifications[0].arn
+  protocol  = "sqs"
+  topic_arn = local.sns_topic_arn
+
+  depends_on = [module.sns, aws_sqs_queue_policy.notifications]
+}
+
+## Process the queued notifications in batches, redelivering only the failed messages
+resource "aws_lambda_event_source_mapping" "sqs" {
+  count = local.enable_sqs_queue ? 1 : 0
+
+  batch_size                         = var.sqs_batch_size
+  event_source_arn                   = aws_sqs_queue.notifications[0].arn
+  function_name                      = module.lambda_function[0].lambda_function_arn
+  function_response_types            = ["ReportBatchItemFailures"]
+  maximum_batching_window_in_seconds = var.sqs_maximum_batching_window
+  tags                               = var.tags
+}
+
+## Provision the EventBridge rules delivering events to the Lambda directly, if required
+resource "aws_cloudwatch_event_rule" "direct" {
+  for_each = local.enable_notifications ? var.eventbridge_rules : {}
+
+  name           = "${var.function_name}-${each.key}"
+  description    = each.value.description != null ? each.value.description : "Delivers matching events to ${var.function_name} directly"
+  event_bus_name = each.value.event_bus_name
+  event_pattern  = each.value.event_pattern
+  tags           = var.tags
+}
+
+resource "aws_cloudwatch_event_target" "direct" {
+  for_each = local.enable_notifications ? var.eventbridge_rules : {}
+
+  arn            = module.lambda_function[0].lambda_function_arn
+  event_bus_name = each.value.event_bus_name
+  rule           = aws_cloudwatch_event_rule.direct[each.key].name
+}
+
+resource "aws_lambda_permission" "direct" {
+  for_each = local.enable_notifications ? var.eventbridge_rules : {}
+
+  statement_id  = "AllowEventBridgeInvoke-${each.key}"
+  action        = "lambda:InvokeFunction"
+  function_name = module.lambda_function[0].lambda_function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.direct[each.key].arn
+}
+
+## Provision a schedule flushing the coalesced alarms of closed windows, if required
+resource "aws_cloudwatch_event_rule" "coalescing_flush" {
+  count = local.enable_notifications && var.coalescing_window > 0 ? 1 : 0
+
+  name                = "${var.function_name}-coalescing-flush"
+  description         = "Delivers the summaries of coalesced CloudWatch alarms once their window has closed"
+  schedule_expression = "rate(1 minute)"
+  tags                = var.tags
+
+  lifecycle {
+    precondition {
+      condition     = var.state_backend == "dynamodb"
+      error_message = "Coalescing requires the dynamodb state backend, as the alarms absorbed by one container are flushed by another"
+    }
+  }
+}
+
+resource "aws_cloudwatch_event_target" "coalescing_flush" {
+  count = local.enable_notifications && var.coalescing_window > 0 ? 1 : 0
+
+  arn   = module.lambda_function[0].lambda_function_arn
+  input = jsonencode({ action = "flush" })
+  rule  = aws_cloudwatch_event_rule.coalescing_flush[0].name
+}
+
+resource "aws_lambda_permission" "coalescing_flush" {
+  count = local.enable_notifications && var.coalescing_window > 0 ? 1 : 0
+
+  statement_id  = "AllowCoalescingFlushInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = module.lambda_function[0].lambda_function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.coalescing_flush[0].arn
+}
+
+## Provision the dynamodb table holding state shared between invocations, if required
+resource "aws_dynamodb_table" "state" {
+  count = local.create_state_table ? 1 : 0
+
+  name         = local.state_table_name
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "pk"
+  tags         = var.tags
+
+  attribute {
+    name = "pk"
+    type = "S"
+  }
+
+  server_side_encryption {
+    enabled = true
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+}
+
 module "lambda_function" {
   count   = local.enable_notifications ? 1 : 0
   source  = "terraform-aws-modules/lambda/aws"
@@ -71,6 +236,7 @@ module "lambda_function" {
   function_name          = var.function_name
   function_tags          = var.tags
   handler                = "notifications.handler.lambda_handler"
+  layers                 = length(local.lambda_layers) > 0 ? local.lambda_layers : null
   memory_size            = var.memory_size
   runtime                = var.lambda_runtime
   timeout                = var.timeout
@@ -116,19 +282,27 @@ module "lambda_function" {
         resources = ["*"]
       }
     },
-    try(var.slack.webhook_arn, null) != null ? {
+    length(local.webhook_secret_arns) > 0 ? {
       secrets_manager = {
-        sid       = "AllowSlackSecretsManagerAccess"
+        sid       = "AllowSecretsManagerAccess"
         actions   = ["secretsmanager:GetSecretValue"]
-        resources = [var.slack.webhook_arn]
+        resources = local.webhook_secret_arns
         effect    = "Allow"
       }
     } : {},
-    try(var.teams.webhook_arn, null) != null ? {
-      secrets_manager = {
-        sid       = "AllowTeamsSecretsManagerAccess"
-        actions   = ["secretsmanager:GetSecretValue"]
-        resources = [var.teams.webhook_arn]
+    local.enable_sqs_queue ? {
+      sqs = {
+        sid       = "AllowSQSConsume"
+        actions   = ["sqs:ReceiveMessage", "sqs:DeleteMessage", "sqs:GetQueueAttributes"]
+        resources = [format("arn:aws:sqs:%s:%s:%s", local.region, local.account_id, var.function_name)]
+        effect    = "Allow"
+      }
+    } : {},
+    local.state_table_arn != null ? {
+      dynamodb = {
+        sid       = "AllowStateTableAccess"
+        actions   = ["dynamodb:GetItem", "dynamodb:PutItem", "dynamodb:DeleteItem", "dynamodb:UpdateItem"]
+        resources = [local.state_table_arn]
         effect    = "Allow"
       }
     } : {},
@@ -150,18 +324,31 @@ module "lambda_function" {
 
   # Environment variables
   environment_variables = merge(
-    var.slack != null ? {
-      NOTIFICATION_PLATFORM = "slack"
-      WEBHOOK_URL           = try(var.slack.webhook_url, null)
-      WEBHOOK_ARN           = try(var.slack.webhook_arn, null)
-    } : {},
-    var.teams != null ? {
-      NOTIFICATION_PLATFORM = "teams"
-      WEBHOOK_URL           = try(var.teams.webhook_url, null)
-      WEBHOOK_ARN           = try(var.teams.webhook_arn, null)
-    } : {},
     {
-      LOG_LEVEL = try(var.lambda_log_level, null)
+      DESTINATIONS = jsonencode(local.destinations)
+    },
+    {
+      CIRCUIT_BREAKER_COOLDOWN     = var.circuit_breaker_cooldown
+      CIRCUIT_BREAKER_FAILURE_RATE = var.circuit_breaker_failure_rate
+      COALESCE_ROLLUP_THRESHOLD    = var.coalescing_rollup_threshold
+      COALESCE_WINDOW              = var.coalescing_window
+      DEDUP_TTL                    = var.deduplication_ttl
+      EVENT_FILTER                 = var.event_filter != null ? jsonencode(var.event_filter) : null
+      LOG_LEVEL                    = try(var.lambda_log_level, null)
+      LOG_PAYLOAD_MAX_BYTES        = var.lambda_log_payload_max_bytes
+      LOG_PAYLOAD_SAMPLE_RATE      = var.lambda_log_payload_sample_rate
+      METRICS_NAMESPACE            = var.metrics_namespace
+      RETAIN_RAW_EVENT             = var.lambda_retain_raw_event
+      ROUTING_RULES                = var.routing_rules != null ? jsonencode(var.routing_rules) : null
+      SECRET_CACHE_TTL             = var.secret_cache_ttl
+      SECRETS_BACKEND              = var.secrets_extension_layer_arn != null ? "extension" : "secretsmanager"
+      SPILL_DIRECTORY              = var.circuit_breaker_spill ? "/tmp/notifications-spill" : null
+      STATE_BACKEND                = var.state_backend
+      STATE_TABLE_NAME             = local.state_table_name
+      WEBHOOK_RATE_BURST           = var.webhook_rate_limit_burst
+      WEBHOOK_RATE_LIMIT           = var.webhook_rate_limit
+      WEBHOOK_RATE_MAX_WAIT        = var.webhook_rate_limit_max_wait
+      WEBHOOK_RATE_SHARED          = var.webhook_rate_limit_shared
     }
   )
 }
@@ -22,3 +22,13 @@ output "lambda_function_role_arn" {
   description = "The ARN of the IAM role created for the Lambda function"
   value       = try(module.lambda_function[0].lambda_role_arn, null)
 }
+
+output "sqs_queue_arn" {
+  description = "The ARN of the SQS queue buffering notifications, when create_sqs_queue is enabled"
+  value       = try(aws_sqs_queue.notifications[0].arn, null)
+}
+
+output "sqs_dead_letter_queue_arn" {
+  description = "The ARN of the dead letter queue of notifications which repeatedly failed, when create_sqs_queue is enabled"
+  value       = try(aws_sqs_queue.dead_letter[0].arn, null)
+}
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Replays an archive of captured events through the notifications pipeline,
+without AWS, to regression test and load test the parsers and formatters.
+
+Each line of an archive is a JSON document holding either a Lambda event
+with SNS records, a single SNS record, or a bare event message, which is
+wrapped in an SNS record. Archives ending in .gz are decompressed on the fly.
+
+Usage:
+    python scripts/replay.py archive.jsonl.gz
+    python scripts/replay.py archive.jsonl --output-dir payloads/
+    python scripts/replay.py archive.jsonl --local-webhook --workers 8
+    python scripts/replay.py archive.jsonl --webhook-url http://localhost:8080/
+"""
+
+import argparse
+import gzip
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+
+PLATFORMS = ("slack", "teams")
+
+# The number of distinct error messages included in the report
+MAX_ERROR_SAMPLES = 20
+
+
+def read_archive(path: str) -> Iterator[str]:
+    """
+    Stream the non-empty lines of a JSONL archive, decompressing gzip archives.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def get_records(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Return the SNS records of an archived document, wrapping a bare message
+    in an SNS record.
+    """
+    if isinstance(document.get("Records"), list):
+        return document["Records"]
+    if "Sns" in document:
+        return [document]
+
+    return [{"EventSource": "aws:sns", "Sns": {"Message": json.dumps(document)}}]
+
+
+class Stats:
+    """
+    The counters of a replay, merged from the results of each chunk.
+    """
+
+    def __init__(self):
+        self.lines = 0
+        self.records = 0
+        self.events: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.messages = 0
+        self.payload_bytes = 0
+        self.samples: Counter = Counter()
+
+    def merge(self, result: Dict[str, Any]) -> None:
+        self.lines += result["lines"]
+        self.records += result["records"]
+        self.events.update(result["events"])
+        self.errors.update(result["errors"])
+        self.messages += result["messages"]
+        self.payload_bytes += result["payload_bytes"]
+        self.samples.update(result["samples"])
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        """
+        Return the throughput and the per event type counts of the replay.
+        """
+        event_types = sorted(set(self.events) | set(self.errors))
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "lines": self.lines,
+            "records": self.records,
+            "events": sum(self.events.values()),
+            "errors": sum(self.errors.values()),
+            "messages": self.messages,
+            "payload_bytes": self.payload_bytes,
+            "records_per_second": round(self.records / elapsed, 1) if elapsed else 0.0,
+            "events_per_second": round(sum(self.events.values()) / elapsed, 1) if elapsed else 0.0,
+            "event_types": {
+                event_type: {"events": self.events[event_type], "errors": self.errors[event_type]}
+                for event_type in event_types
+            },
+            "error_samples": dict(self.samples.most_common(MAX_ERROR_SAMPLES)),
+        }
+
+
+# The state of each worker process, set up once by init_worker
+_worker: Dict[str, Any] = {}
+
+
+def init_worker(platforms: Tuple[str, ...], output_dir: Optional[str], webhook_url: Optional[str]) -> None:
+    """
+    Set up a worker process, creating the parser, formatters and senders once
+    for all the chunks it processes.
+    """
+    if str(ASSETS_DIR) not in sys.path:
+        sys.path.insert(0, str(ASSETS_DIR))
+    # The handler logs every record, which would dominate a replay
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+    from notifications.destinations import create_formatter, create_sender
+    from notifications.events import EventParser
+    from notifications.utils.codec import get_codec
+
+    _worker.clear()
+    _worker["codec"] = get_codec()
+    _worker["parser"] = EventParser()
+    _worker["formatters"] = {platform: create_formatter(platform) for platform in platforms}
+    _worker["senders"] = (
+        {platform: create_sender(platform, webhook_url) for platform in platforms}
+        if webhook_url
+        else {}
+    )
+    _worker["output_dir"] = output_dir
+
+
+def process_chunk(index: int, lines: List[str]) -> Dict[str, Any]:
+    """
+    Parse and format every record of a chunk of archive lines, writing or
+    sending the formatted payloads.
+
+    Args:
+        index: The position of the chunk in the archive, naming its output file
+        lines: The archive lines of the chunk
+
+    Returns:
+        Dict[str, Any]: The counters of the chunk, merged by Stats
+    """
+    codec = _worker["codec"]
+    parser = _worker["parser"]
+    formatters = _worker["formatters"]
+    senders = _worker["senders"]
+    output_dir = _worker["output_dir"]
+
+    result = {
+        "lines": len(lines),
+        "records": 0,
+        "events": Counter(),
+        "errors": Counter(),
+        "messages": 0,
+        "payload_bytes": 0,
+        "samples": Counter(),
+    }
+
+    def fail(event_type: str, stage: str, error: Exception) -> None:
+        result["errors"][event_type] += 1
+        result["samples"][f"{event_type} {stage}: {type(error).__name__}: {error}"[:300]] += 1
+
+    output = open(os.path.join(output_dir, f"{index:06d}.jsonl"), "w") if output_dir else None
+    try:
+        for line in lines:
+            try:
+                records = get_records(codec.loads(line))
+            except (ValueError, AttributeError) as e:
+                fail("INVALID", "decode", e)
+                continue
+
+            for record in records:
+                result["records"] += 1
+                # Errors are counted under the event type of the record, which is
+                # only unknown when the record cannot be classified
+                try:
+                    envelope, record_parser = parser.classify(record)
+                except Exception as e:
+                    fail("UNKNOWN", "classify", e)
+                    continue
+                try:
+                    events = record_parser.parse_all(envelope)
+                except Exception as e:
+                    record_type = record_parser.event_type
+                    fail(getattr(record_type, "name", str(record_type)), "parse", e)
+                    continue
+                if not events:
+                    continue
+
+                event_type = getattr(events[0].event_type, "name", str(events[0].event_type))
+                result["events"][event_type] += len(events)
+
+                for platform, formatter in formatters.items():
+                    try:
+                        pages = (
+                            formatter.format_messages(events[0])
+                            if len(events) == 1
+                            else formatter.format_digest(events)
+                        )
+                    except Exception as e:
+                        fail(event_type, f"format {platform}", e)
+                        continue
+
+                    for page in pages:
+                        encoded = codec.dumps(page)
+                        result["messages"] += 1
+                        result["payload_bytes"] += len(encoded)
+                        if output is not None:
+                            # The payload is embedded as already encoded, rather than encoded twice
+                            output.write(
+                                f'{{"event_type": {json.dumps(event_type)}, "platform": "{platform}", '
+                                f'"payload": {encoded.decode("utf-8")}}}\n'
+                            )
+                        if platform in senders:
+                            delivery = senders[platform].send(page)
+                            if not delivery.success:
+                                fail(event_type, f"send {platform}", RuntimeError(delivery.error or delivery.status))
+    finally:
+        if output is not None:
+            output.close()
+
+    return result
+
+
+def chunked(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def replay(
+    paths: List[str],
+    platforms: Tuple[str, ...] = PLATFORMS,
+    workers: int = 0,
+    chunk_size: int = 500,
+    output_dir: Optional[str] = None,
+    webhook_url: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Replay archives through the parsers and formatters.
+
+    Chunks of lines are processed on a pool of worker processes, with at most
+    two chunks per worker in flight, so archives of any size are streamed.
+
+    Args:
+        paths: The archives to replay
+        platforms: The platforms each event is formatted for
+        workers: The number of worker processes, 0 processes in this process
+        chunk_size: The number of archive lines processed per task
+        output_dir: The directory the formatted payloads are written to
+        webhook_url: The webhook the formatted payloads are sent to
+        limit: The maximum number of archive lines to replay
+
+    Returns:
+        Dict[str, Any]: The replay report
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    lines: Iterable[str] = (line for path in paths for line in read_archive(path))
+    if limit is not None:
+        lines = itertools.islice(lines, limit)
+
+    stats = Stats()
+    start = time.perf_counter()
+    initargs = (tuple(platforms), output_dir, webhook_url)
+
+    if workers <= 0:
+        init_worker(*initargs)
+        for index, chunk in enumerate(chunked(lines, chunk_size)):
+            stats.merge(process_chunk(index, chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=initargs) as pool:
+            pending = set()
+            for index, chunk in enumerate(chunked(lines, chunk_size)):
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stats.merge(future.result())
+                pending.add(pool.submit(process_chunk, index, chunk))
+
+            for future in pending:
+                stats.merge(future.result())
+
+    return stats.report(time.perf_counter() - start)
+
+
+class LocalWebhook:
+    """
+    A stand-in for the Slack and Teams webhooks, accepting every message and
+    counting the requests and bytes received.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.requests = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        webhook = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # The headers and body are written separately, which Nagle would delay
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with webhook._lock:
+                    webhook.requests += 1
+                    webhook.bytes += len(body)
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def __enter__(self) -> "LocalWebhook":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay an archive of captured events through the notifications pipeline",
+    )
+    parser.add_argument("archives", nargs="+", help="JSONL archives of events, optionally gzipped")
+    parser.add_argument(
+        "-p", "--platform", action="append", choices=PLATFORMS,
+        help="The platforms events are formatted for, may be repeated (default: all)",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=os.cpu_count() or 1,
+        help="The number of worker processes, 0 to run in this process (default: CPU count)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=500, help="The number of lines per task")
+    parser.add_argument("-n", "--limit", type=int, help="The maximum number of lines to replay")
+    parser.add_argument("-o", "--output-dir", help="Write the formatted payloads to this directory")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--webhook-url", help="Send the formatted payloads to this webhook")
+    target.add_argument(
+        "--local-webhook", action="store_true",
+        help="Send the formatted payloads to a local stand-in webhook",
+    )
+    parser.add_argument("--report", help="Write the report as JSON to this file (default: stdout)")
+    args = parser.parse_args()
+
+    options = {
+        "platforms": tuple(args.platform or PLATFORMS),
+        "workers": args.workers,
+        "chunk_size": args.chunk_size,
+        "output_dir": args.output_dir,
+        "limit": args.limit,
+    }
+
+    if args.local_webhook:
+        with LocalWebhook() as webhook:
+            report = replay(args.archives, webhook_url=webhook.url, **options)
+        report["webhook"] = {"requests": webhook.requests, "bytes": webhook.bytes}
+    else:
+        report = replay(args.archives, webhook_url=args.webhook_url, **options)
+
+    encoded = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(encoded + "\n")
+    else:
+        print(encoded)
+
+    print(
+        f"Replayed {report['records']} records, {report['events']} events in "
+        f"{report['elapsed_seconds']}s ({report['events_per_second']} events/s), "
+        f"{report['errors']} errors",
+        file=sys.stderr,
+    )
+    sys.exit(1 if report["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import gzip
+import json
+import os
+
+from event_generator import TestEventGenerator
+from replay import LocalWebhook, get_records, replay
+
+
+def write_archive(path, documents):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "wt") as f:
+        for document in documents:
+            f.write(json.dumps(document) + "\n")
+
+
+def test_get_records():
+    generator = TestEventGenerator()
+    message = generator.get_guardduty_event()
+    event = generator.get_sns_event(message)
+
+    assert get_records(event) == event["Records"]
+    assert get_records(event["Records"][0]) == event["Records"]
+    assert json.loads(get_records(message)[0]["Sns"]["Message"]) == message
+
+
+def test_replay_writes_payloads_and_counts_errors(tmp_path):
+    generator = TestEventGenerator()
+    archive = tmp_path / "archive.jsonl.gz"
+    write_archive(archive, [
+        generator.get_sns_event(generator.get_security_hub_event()),
+        generator.get_cloudwatch_event(),
+        generator.get_sns_event(generator.get_budget_event()),
+    ] * 3)
+
+    report = replay([str(archive)], workers=2, chunk_size=2, output_dir=str(tmp_path / "out"))
+
+    assert report["records"] == 9
+    assert report["event_types"] == {
+        "CLOUDWATCH": {"events": 3, "errors": 0},
+        "SECURITY_HUB": {"events": 3, "errors": 0},
+        "UNKNOWN": {"events": 0, "errors": 3},
+    }
+    assert report["error_samples"] == {"UNKNOWN classify: ValueError: Unknown event type": 3}
+    assert report["messages"] == 12
+
+    payloads = [
+        json.loads(line)
+        for name in sorted(os.listdir(tmp_path / "out"))
+        for line in (tmp_path / "out" / name).read_text().splitlines()
+    ]
+    assert len(payloads) == 12
+    assert {(payload["event_type"], payload["platform"]) for payload in payloads} == {
+        ("SECURITY_HUB", "slack"),
+        ("SECURITY_HUB", "teams"),
+        ("CLOUDWATCH", "slack"),
+        ("CLOUDWATCH", "teams"),
+    }
+
+
+def test_replay_counts_parse_errors_by_event_type(tmp_path):
+    archive = tmp_path / "archive.jsonl"
+    # A KMS deletion is classified by its detail-type, but has no resources to parse
+    write_archive(archive, [{"detail-type": "KMS CMK Deletion", "detail": {"key-id": "key"}}])
+
+    report = replay([str(archive)], workers=1, chunk_size=1)
+
+    assert report["event_types"] == {"KMS_DELETION": {"events": 0, "errors": 1}}
+    assert list(report["error_samples"]) == ["KMS_DELETION parse: IndexError: list index out of range"]
+
+
+def test_replay_sends_to_local_webhook(tmp_path):
+    generator = TestEventGenerator()
+    archive = tmp_path / "archive.jsonl"
+    write_archive(archive, [generator.get_guardduty_event()] * 5)
+
+    with LocalWebhook() as webhook:
+        report = replay([str(archive)], platforms=("slack",), webhook_url=webhook.url, limit=4)
+
+    assert report["records"] == 4
+    assert report["errors"] == 0
+    assert webhook.requests == 4
+    assert webhook.bytes == report["payload_bytes"]
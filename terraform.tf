@@ -1,6 +1,6 @@
 
 terraform {
-  required_version = ">= 1.0.7"
+  required_version = ">= 1.2.0"
 
   required_providers {
     aws = {
@@ -24,6 +24,29 @@ variable "allowed_aws_services" {
   }
 }
 
+variable "circuit_breaker_cooldown" {
+  description = "The number of seconds sends to a failing webhook host are refused for, before a single probe is let through"
+  type        = number
+  default     = 30
+}
+
+variable "circuit_breaker_failure_rate" {
+  description = "The share of recent failed sends to a webhook host which opens its circuit, refusing further sends without waiting on the endpoint, such as 0.5, 0 disables the circuit breaker"
+  type        = number
+  default     = 0
+
+  validation {
+    condition     = var.circuit_breaker_failure_rate >= 0 && var.circuit_breaker_failure_rate <= 1
+    error_message = "The circuit breaker failure rate must be between 0 and 1"
+  }
+}
+
+variable "circuit_breaker_spill" {
+  description = "Indicates if messages refused by an open circuit, and without a fallback destination, are queued in the ephemeral storage of the Lambda function and replayed once the webhook recovers. Spilled messages are reported as failed, and are lost if the function is recycled before they are replayed"
+  type        = bool
+  default     = false
+}
+
 variable "cloudwatch_log_group_class" {
   description = "The class of the CloudWatch log group"
   type        = string
@@ -42,12 +65,67 @@ variable "cloudwatch_log_group_retention" {
   default     = 14
 }
 
+variable "coalescing_rollup_threshold" {
+  description = "The number of distinct CloudWatch alarms delivered within a coalescing window before the rest are rolled up into a single summary, 0 disables the roll-up"
+  type        = number
+  default     = 10
+}
+
+variable "coalescing_window" {
+  description = "The length in seconds of the window bursts of CloudWatch alarm transitions are coalesced over, 0 disables coalescing. Requires the dynamodb state_backend"
+  type        = number
+  default     = 0
+}
+
 variable "create_sns_topic" {
   description = "Whether to create an SNS topic for notifications"
   type        = bool
   default     = false
 }
 
+variable "create_sqs_queue" {
+  description = "Whether to buffer notifications in an SQS queue between the SNS topic and the Lambda function, which then processes them in batches"
+  type        = bool
+  default     = false
+}
+
+variable "deduplication_ttl" {
+  description = "The number of seconds an unchanged finding or alarm is suppressed for after delivery, 0 disables deduplication"
+  type        = number
+  default     = 0
+}
+
+variable "destinations" {
+  description = "Optional list of additional destinations notifications are delivered to, alongside the slack and teams configuration"
+  type = list(object({
+    name = string
+    # A unique name for the destination
+    platform = string
+    # The platform of the destination, either slack or teams
+    webhook_url = optional(string)
+    # The webhook URL to deliver notifications to
+    webhook_arn = optional(string)
+    # An optional ARN for a secret in secrets manager containing the webhook url details
+    fallback = optional(string)
+    # The name of a destination on the same platform messages are diverted to while the webhook is failing
+  }))
+  default = []
+
+  validation {
+    condition = alltrue([
+      for d in var.destinations : contains(["slack", "teams"], d.platform)
+    ])
+    error_message = "Destination platform must be either slack or teams"
+  }
+
+  validation {
+    condition = alltrue([
+      for d in var.destinations : d.webhook_url != null || d.webhook_arn != null
+    ])
+    error_message = "Destination must have either a webhook_url or webhook_arn"
+  }
+}
+
 variable "email" {
   description = "The configuration for Email notifications"
   type = object({
@@ -70,18 +148,72 @@ variable "ephemeral_storage_size" {
   default     = 512
 }
 
+variable "event_filter" {
+  description = "Optional filter dropping unwanted events before they are parsed, by minimum severity of each event type ('*' for every other type), EventBridge source and account"
+  type = object({
+    # The minimum severity of each event type, such as { GUARDDUTY = "high", "*" = "medium" }
+    min_severity     = optional(map(string))
+    include_sources  = optional(list(string))
+    exclude_sources  = optional(list(string))
+    include_accounts = optional(list(string))
+    exclude_accounts = optional(list(string))
+  })
+  default = null
+}
+
+variable "eventbridge_rules" {
+  description = "Optional map of EventBridge rules delivering matching events to the Lambda function directly, bypassing the SNS topic"
+  type = map(object({
+    description = optional(string)
+    # The event pattern, as a JSON encoded string
+    event_pattern = string
+    # The event bus the rule is created on
+    event_bus_name = optional(string, "default")
+  }))
+  default = {}
+}
+
 variable "function_name" {
   description = "Name of the Lambda function"
   type        = string
   default     = "lz-notifications"
 }
 
+variable "lambda_layers" {
+  description = "Optional list of additional Lambda layer ARNs, such as a layer providing orjson for faster JSON encoding"
+  type        = list(string)
+  default     = []
+}
+
 variable "lambda_log_level" {
   description = "The log level for the Lambda function"
   type        = string
   default     = "INFO"
 }
 
+variable "lambda_log_payload_max_bytes" {
+  description = "The maximum size in bytes of an event or message payload written to the Lambda logs, larger payloads are truncated"
+  type        = number
+  default     = 8192
+}
+
+variable "lambda_log_payload_sample_rate" {
+  description = "The fraction of invocations, between 0 and 1, which log the full incoming event"
+  type        = number
+  default     = 1
+
+  validation {
+    condition     = var.lambda_log_payload_sample_rate >= 0 && var.lambda_log_payload_sample_rate <= 1
+    error_message = "Sample rate must be between 0 and 1"
+  }
+}
+
+variable "lambda_retain_raw_event" {
+  description = "Whether normalized events keep the raw record they were parsed from, for debugging; increases memory use per event"
+  type        = bool
+  default     = false
+}
+
 variable "lambda_role_description" {
   description = "Description of the IAM role for the Lambda function"
   type        = string
@@ -112,6 +244,44 @@ variable "memory_size" {
   default     = 128
 }
 
+variable "metrics_namespace" {
+  description = "The CloudWatch namespace of the per stage latency metrics, emitted in Embedded Metric Format; set to an empty string to disable them"
+  type        = string
+  default     = "Notifications"
+}
+
+variable "routing_rules" {
+  description = "Optional rules routing events to destinations by account, region, severity, event type and title pattern, or muting them. Events no rule matches go to default_destinations, or every destination when unset"
+  type = object({
+    rules = list(object({
+      name = string
+      # The names of the destinations matching events are delivered to
+      destinations = optional(list(string))
+      # Whether matching events are dropped, whichever other rules match them
+      mute          = optional(bool)
+      accounts      = optional(list(string))
+      regions       = optional(list(string))
+      severities    = optional(list(string))
+      event_types   = optional(list(string))
+      title_pattern = optional(string)
+    }))
+    default_destinations = optional(list(string))
+  })
+  default = null
+}
+
+variable "secret_cache_ttl" {
+  description = "The number of seconds the Lambda caches the webhook secret for, across warm invocations"
+  type        = number
+  default     = 300
+}
+
+variable "secrets_extension_layer_arn" {
+  description = "Optional ARN of the AWS Parameters and Secrets Lambda Extension layer, when set the webhook secret is retrieved via the extension"
+  type        = string
+  default     = null
+}
+
 variable "slack" {
   description = "The configuration for Slack notifications"
   type = object({
@@ -142,6 +312,51 @@ variable "sns_topic_policy" {
   default     = null
 }
 
+variable "sqs_batch_size" {
+  description = "The maximum number of queued notifications processed by a single invocation, when create_sqs_queue is enabled"
+  type        = number
+  default     = 10
+
+  validation {
+    condition     = var.sqs_batch_size >= 1 && var.sqs_batch_size <= 10000
+    error_message = "SQS batch size must be between 1 and 10000"
+  }
+}
+
+variable "sqs_max_receive_count" {
+  description = "The number of times a queued notification is attempted before it is moved to the dead letter queue, when create_sqs_queue is enabled"
+  type        = number
+  default     = 5
+}
+
+variable "sqs_maximum_batching_window" {
+  description = "The maximum number of seconds queued notifications are gathered for before invoking the Lambda function, when create_sqs_queue is enabled; must be at least 1 when sqs_batch_size is over 10"
+  type        = number
+  default     = 0
+
+  validation {
+    condition     = var.sqs_maximum_batching_window >= 0 && var.sqs_maximum_batching_window <= 300
+    error_message = "SQS maximum batching window must be between 0 and 300 seconds"
+  }
+}
+
+variable "state_backend" {
+  description = "The backend holding state shared between invocations, such as delivered event fingerprints, either memory, sqlite or dynamodb"
+  type        = string
+  default     = "memory"
+
+  validation {
+    condition     = contains(["memory", "sqlite", "dynamodb"], var.state_backend)
+    error_message = "State backend must be one of memory, sqlite or dynamodb"
+  }
+}
+
+variable "state_table_name" {
+  description = "The name of an existing DynamoDB table to use when the state backend is dynamodb, else a table is created"
+  type        = string
+  default     = null
+}
+
 variable "subscribers" {
   description = "Optional list of custom subscribers to the SNS topic"
   type = map(object({
@@ -182,3 +397,27 @@ variable "timeout" {
   type        = number
   default     = 30
 }
+
+variable "webhook_rate_limit" {
+  description = "The number of messages per second sent to each webhook, critical events are sent ahead of queued messages, 0 disables rate limiting"
+  type        = number
+  default     = 0
+}
+
+variable "webhook_rate_limit_burst" {
+  description = "The number of messages which may be sent back to back to each webhook, when rate limiting is enabled"
+  type        = number
+  default     = 1
+}
+
+variable "webhook_rate_limit_max_wait" {
+  description = "The upper bound in seconds a message waits for its turn, after which it is sent anyway"
+  type        = number
+  default     = 10
+}
+
+variable "webhook_rate_limit_shared" {
+  description = "Whether the webhook rate limit is shared across concurrent Lambda containers through the state backend"
+  type        = bool
+  default     = false
+}